@@ -1,82 +1,190 @@
 import os
 import json
-from openai import OpenAI
+import asyncio
+import copy
+import time
+import hashlib
+import logging
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Initialize OpenAI client
 api_key = os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-def translate_schema(source_dialect: str, target_dialect: str, input_ddl_json: dict) -> dict:
+# Bump whenever prompt text changes so stale cached responses are not reused
+PROMPT_VERSION = "2"
+LLM_CACHE_DIR = os.getenv("STRATA_LLM_CACHE_DIR", ".strata_llm_cache")
+
+# Without a key every helper answers with canned demo payloads
+_DEMO_MODE = not api_key
+
+# Shared client so the underlying HTTP connection pool stays warm across calls
+_client = None if _DEMO_MODE else AsyncOpenAI(api_key=api_key, timeout=60)
+
+# Read-only demo payloads built once at import; handed out as deep copies so callers
+# can't mutate the shared nested lists, and as dicts since MappingProxyType is not JSON serializable
+_DEMO_TRANSLATE = MappingProxyType({
+    "translated_ddl": {
+        "tables": [
+            {
+                "name": "customers",
+                "ddl": "CREATE TABLE customers (id SERIAL PRIMARY KEY, name VARCHAR(120) NOT NULL, email VARCHAR(255) NOT NULL, city VARCHAR(120) NOT NULL, created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            },
+            {
+                "name": "employees",
+                "ddl": "CREATE TABLE employees (id SERIAL PRIMARY KEY, first_name VARCHAR(80) NOT NULL, last_name VARCHAR(80) NOT NULL, title VARCHAR(120) NOT NULL, hired_on DATE NOT NULL, salary DECIMAL(12,2) NOT NULL)"
+            },
+            {
+                "name": "products",
+                "ddl": "CREATE TABLE products (id SERIAL PRIMARY KEY, sku VARCHAR(64) NOT NULL, name VARCHAR(160) NOT NULL, price DECIMAL(10,2) NOT NULL, in_stock SMALLINT NOT NULL DEFAULT 1)"
+            },
+            {
+                "name": "orders",
+                "ddl": "CREATE TABLE orders (id SERIAL PRIMARY KEY, customer_id INTEGER NOT NULL, order_date TIMESTAMP NOT NULL, status VARCHAR(20) NOT NULL DEFAULT 'PENDING', total DECIMAL(12,2) NOT NULL, FOREIGN KEY (customer_id) REFERENCES customers(id))"
+            },
+            {
+                "name": "order_items",
+                "ddl": "CREATE TABLE order_items (id SERIAL PRIMARY KEY, order_id INTEGER NOT NULL, product_id INTEGER NOT NULL, qty INTEGER NOT NULL, unit_price DECIMAL(10,2) NOT NULL, line_total DECIMAL(12,2) NOT NULL, FOREIGN KEY (order_id) REFERENCES orders(id), FOREIGN KEY (product_id) REFERENCES products(id))"
+            }
+        ]
+    },
+    "notes": "Schema translated successfully (demo mode - no AI key configured). This is a simplified structure for testing purposes."
+})
+
+_DEMO_FIXES = MappingProxyType({
+    "fixes": [{
+        "category": "Error",
+        "issue": "OpenAI API key not configured",
+        "solution": "Please set OPENAI_API_KEY in your environment variables to enable AI features.",
+        "precautions": "None"
+    }]
+})
+
+class _RateLimiter:
+    """Token bucket for requests/minute and tokens/minute, waits before sending instead of after a 429"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.request_capacity = float(rpm)
+        self.token_capacity = float(tpm)
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.request_capacity = min(self.rpm, self.request_capacity + elapsed * self.rpm / 60)
+        self.token_capacity = min(self.tpm, self.token_capacity + elapsed * self.tpm / 60)
+
+    async def acquire(self, est_tokens: int):
+        # A single request can never need more than a full bucket
+        est_tokens = min(est_tokens, self.tpm)
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.request_capacity >= 1 and self.token_capacity >= est_tokens:
+                    self.request_capacity -= 1
+                    self.token_capacity -= est_tokens
+                    return
+                request_wait = (1 - self.request_capacity) * 60 / self.rpm
+                token_wait = (est_tokens - self.token_capacity) * 60 / self.tpm
+                await asyncio.sleep(max(request_wait, token_wait, 0.01))
+
+_limiter = _RateLimiter(
+    rpm=int(os.getenv("OPENAI_RPM", "500")),
+    tpm=int(os.getenv("OPENAI_TPM", "200000"))
+)
+
+# Prompt templates are built once; inputs are embedded as compact JSON since the model
+# does not need pretty-printing and indentation only adds input tokens
+_TRANSLATE_TMPL = """Translate the following database schema from {src} to {tgt}.
+Provide the translated DDL and any notes about compatibility issues or manual adjustments needed.
+
+Input DDL:
+{ddl}
+
+IMPORTANT: Please format your response as JSON with the following structure:
+{{"translated_ddl": {{"tables": [{{"name": "table_name", "ddl": "CREATE TABLE table_name (...)"}}]}}, "notes": "Any compatibility notes or manual adjustments needed"}}"""
+
+_FIXES_TMPL = """Based on the following validation failures, suggest fixes for each issue:
+
+Validation Failures:
+{failures}
+
+For each failure, provide:
+1. A detailed explanation of the issue
+2. Step-by-step instructions to fix it
+3. Any precautions or considerations
+
+IMPORTANT: Please format your response as JSON with the following structure:
+{{"fixes": [{{"category": "Category name", "issue": "Detailed explanation", "solution": "Step-by-step fix", "precautions": "Any precautions"}}]}}"""
+
+def _compact_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+def _cache_key(kind: str, *inputs) -> str:
+    """SHA-256 over the canonicalized inputs, model and prompt version"""
+    payload = json.dumps([kind, MODEL, PROMPT_VERSION, *inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _cache_get(key: str):
+    try:
+        with open(os.path.join(LLM_CACHE_DIR, f"{key}.json"), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _cache_put(key: str, result: dict):
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("LLM cache write failed: %s", e)
+
+def _estimate_tokens(prompt: str) -> int:
+    """Rough prompt size (~4 chars per token) plus headroom for the completion"""
+    return len(prompt) // 4 + 512
+
+async def translate_schema(source_dialect: str, target_dialect: str, input_ddl_json: dict) -> dict:
     """
     Translate schema from source dialect to target dialect using OpenAI
     """
-    # Check if API key is available
-    if not api_key or api_key == "":
+    if _DEMO_MODE:
         # Return a simple translated structure for testing without AI
-        return {
-            "translated_ddl": {
-                "tables": [
-                    {
-                        "name": "customers",
-                        "ddl": f"CREATE TABLE customers (id SERIAL PRIMARY KEY, name VARCHAR(120) NOT NULL, email VARCHAR(255) NOT NULL, city VARCHAR(120) NOT NULL, created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
-                    },
-                    {
-                        "name": "employees",
-                        "ddl": f"CREATE TABLE employees (id SERIAL PRIMARY KEY, first_name VARCHAR(80) NOT NULL, last_name VARCHAR(80) NOT NULL, title VARCHAR(120) NOT NULL, hired_on DATE NOT NULL, salary DECIMAL(12,2) NOT NULL)"
-                    },
-                    {
-                        "name": "products",
-                        "ddl": f"CREATE TABLE products (id SERIAL PRIMARY KEY, sku VARCHAR(64) NOT NULL, name VARCHAR(160) NOT NULL, price DECIMAL(10,2) NOT NULL, in_stock SMALLINT NOT NULL DEFAULT 1)"
-                    },
-                    {
-                        "name": "orders",
-                        "ddl": f"CREATE TABLE orders (id SERIAL PRIMARY KEY, customer_id INTEGER NOT NULL, order_date TIMESTAMP NOT NULL, status VARCHAR(20) NOT NULL DEFAULT 'PENDING', total DECIMAL(12,2) NOT NULL, FOREIGN KEY (customer_id) REFERENCES customers(id))"
-                    },
-                    {
-                        "name": "order_items",
-                        "ddl": f"CREATE TABLE order_items (id SERIAL PRIMARY KEY, order_id INTEGER NOT NULL, product_id INTEGER NOT NULL, qty INTEGER NOT NULL, unit_price DECIMAL(10,2) NOT NULL, line_total DECIMAL(12,2) NOT NULL, FOREIGN KEY (order_id) REFERENCES orders(id), FOREIGN KEY (product_id) REFERENCES products(id))"
-                    }
-                ]
-            },
-            "notes": "Schema translated successfully (demo mode - no AI key configured). This is a simplified structure for testing purposes."
-        }
+        return copy.deepcopy(dict(_DEMO_TRANSLATE))
+    
+    cache_key = _cache_key("translate_schema", source_dialect, target_dialect, input_ddl_json)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+        prompt = _TRANSLATE_TMPL.format(src=source_dialect, tgt=target_dialect, ddl=_compact_json(input_ddl_json))
         
-        prompt = f"""
-        Translate the following database schema from {source_dialect} to {target_dialect}.
-        Provide the translated DDL and any notes about compatibility issues or manual adjustments needed.
-        
-        Input DDL:
-        {json.dumps(input_ddl_json, indent=2)}
-        
-        IMPORTANT: Please format your response as JSON with the following structure:
-        {{
-            "translated_ddl": {{
-                "tables": [
-                    {{
-                        "name": "table_name",
-                        "ddl": "CREATE TABLE table_name (...)"
-                    }}
-                ]
-            }},
-            "notes": "Any compatibility notes or manual adjustments needed"
-        }}
-        """
-        
-        response = client.chat.completions.create(
+        await _limiter.acquire(_estimate_tokens(prompt))
+        response = await _client.chat.completions.create(
             model=MODEL,
             messages=[
                 {"role": "system", "content": "You are a database schema translation expert. Always respond with valid JSON."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.3
+            temperature=0.3,
+            response_format={"type": "json_object"}
         )
         
         # Check if response content exists
@@ -89,28 +197,13 @@ def translate_schema(source_dialect: str, target_dialect: str, input_ddl_json: d
                 "notes": "AI returned empty response"
             }
         
-        # Try to parse as JSON, if that fails return the raw content
+        # JSON mode guarantees a JSON object; keep a fallback for truncated output
         try:
-            # Handle code block wrapper if present
-            cleaned_content = content.strip()
-            if cleaned_content.startswith('```json'):
-                # Extract JSON from code block
-                cleaned_content = cleaned_content[7:]  # Remove ```json
-                if cleaned_content.endswith('```'):
-                    cleaned_content = cleaned_content[:-3]  # Remove ```
-                cleaned_content = cleaned_content.strip()
-            elif cleaned_content.startswith('```'):
-                # Extract content from generic code block
-                cleaned_content = cleaned_content[3:]  # Remove ```
-                if cleaned_content.endswith('```'):
-                    cleaned_content = cleaned_content[:-3]  # Remove ```
-                cleaned_content = cleaned_content.strip()
-            
-            result = json.loads(cleaned_content)
+            result = json.loads(content)
+            _cache_put(cache_key, result)
             return result
         except json.JSONDecodeError as e:
-            print(f"JSON parsing failed: {e}")
-            print(f"Content: {content}")
+            logger.debug("JSON parse failed: %s; head=%r", e, content[:200])
             # If JSON parsing fails, return a fallback structure
             return {
                 "translated_ddl": {
@@ -124,7 +217,7 @@ def translate_schema(source_dialect: str, target_dialect: str, input_ddl_json: d
                 "notes": f"AI translation returned non-JSON response: {content[:200]}..."
             }
     except Exception as e:
-        print(f"AI translation error: {e}")
+        logger.debug("AI translation error: %s", e)
         return {
             "translated_ddl": {
                 "tables": []
@@ -132,90 +225,283 @@ def translate_schema(source_dialect: str, target_dialect: str, input_ddl_json: d
             "notes": f"AI translation failed: {str(e)}"
         }
 
-def suggest_fixes(validation_failures_json: dict) -> dict:
+class _TableStreamParser:
+    """Incrementally pulls complete objects out of the "tables" array of a partially received JSON document"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.in_tables = False
+        self.done = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.start = None
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        self.buffer += text
+        tables = []
+        if self.done:
+            return tables
+        if not self.in_tables:
+            key = self.buffer.find('"tables"')
+            if key == -1:
+                return tables
+            bracket = self.buffer.find("[", key)
+            if bracket == -1:
+                return tables
+            self.in_tables = True
+            self.pos = bracket + 1
+        
+        while self.pos < len(self.buffer):
+            ch = self.buffer[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                if self.depth == 0:
+                    self.start = self.pos
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0 and self.start is not None:
+                    try:
+                        tables.append(json.loads(self.buffer[self.start:self.pos + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self.start = None
+            elif ch == "]" and self.depth == 0:
+                # End of the tables array, the rest is only kept for the final parse
+                self.done = True
+                break
+            self.pos += 1
+        return tables
+
+async def translate_schema_stream(source_dialect: str, target_dialect: str, input_ddl_json: dict) -> AsyncIterator[Dict[str, Any]]:
     """
-    Suggest fixes for validation failures using OpenAI
+    Stream a schema translation, yielding {"type": "table", ...} events as each table arrives and a final {"type": "notes"} event
     """
-    # Check if API key is available
-    if not api_key or api_key == "":
+    if _DEMO_MODE:
+        result = await translate_schema(source_dialect, target_dialect, input_ddl_json)
+        for table in result["translated_ddl"]["tables"]:
+            yield {"type": "table", **table}
+        yield {"type": "notes", "notes": result.get("notes", "")}
+        return
+    
+    cache_key = _cache_key("translate_schema", source_dialect, target_dialect, input_ddl_json)
+    cached = _cache_get(cache_key)
+    if cached is None:
+        try:
+            prompt = _TRANSLATE_TMPL.format(src=source_dialect, tgt=target_dialect, ddl=_compact_json(input_ddl_json))
+            
+            await _limiter.acquire(_estimate_tokens(prompt))
+            stream = await _client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a database schema translation expert. Always respond with valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                response_format={"type": "json_object"},
+                stream=True
+            )
+            
+            parser = _TableStreamParser()
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    for table in parser.feed(delta):
+                        yield {"type": "table", **table}
+            
+            notes = ""
+            try:
+                result = json.loads(parser.buffer)
+                notes = result.get("notes", "")
+                _cache_put(cache_key, result)
+            except json.JSONDecodeError:
+                notes = "AI translation returned incomplete JSON"
+            yield {"type": "notes", "notes": notes}
+        except Exception as e:
+            yield {"type": "error", "error": f"AI translation failed: {str(e)}"}
+        return
+    
+    for table in cached.get("translated_ddl", {}).get("tables", []):
+        yield {"type": "table", **table}
+    yield {"type": "notes", "notes": cached.get("notes", "")}
+
+def _build_fixes_prompt(validation_failures_json: dict) -> str:
+    return _FIXES_TMPL.format(failures=_compact_json(validation_failures_json))
+
+def _fixes_messages(prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": "You are a database migration expert. Always respond with valid JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _parse_fixes_content(content) -> dict:
+    """Turn the raw model output into the fixes structure"""
+    # Check if response content exists
+    if content is None:
         return {
             "fixes": [{
                 "category": "Error",
-                "issue": "OpenAI API key not configured",
-                "solution": "Please set OPENAI_API_KEY in your environment variables to enable AI features.",
+                "issue": "AI returned empty response",
+                "solution": "No suggestions available",
                 "precautions": "None"
             }]
         }
     
+    # Try to parse as JSON, if that fails return the raw content
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+        result = json.loads(content)
+        return result
+    except json.JSONDecodeError:
+        # If JSON parsing fails, return a default structure with the content as an issue
+        return {
+            "fixes": [{
+                "category": "AI Response",
+                "issue": content,
+                "solution": "See issue description",
+                "precautions": "None"
+            }]
+        }
+
+def _fixes_error(e: Exception) -> dict:
+    return {
+        "fixes": [{
+            "category": "Error",
+            "issue": "Failed to generate suggestions",
+            "solution": f"AI suggestion generation failed: {str(e)}",
+            "precautions": "None"
+        }]
+    }
+
+
+async def suggest_fixes(validation_failures_json: dict) -> dict:
+    """
+    Suggest fixes for validation failures using OpenAI
+    """
+    if _DEMO_MODE:
+        return copy.deepcopy(dict(_DEMO_FIXES))
+    
+    cache_key = _cache_key("suggest_fixes", validation_failures_json)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        prompt = _build_fixes_prompt(validation_failures_json)
         
-        prompt = f"""
-        Based on the following validation failures, suggest fixes for each issue:
+        await _limiter.acquire(_estimate_tokens(prompt))
+        response = await _client.chat.completions.create(
+            model=MODEL,
+            messages=_fixes_messages(prompt),
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
         
-        Validation Failures:
-        {json.dumps(validation_failures_json, indent=2)}
+        content = response.choices[0].message.content
+        # Only cache well-formed responses, error placeholders should be retried
+        if content is not None:
+            try:
+                result = json.loads(content)
+                _cache_put(cache_key, result)
+                return result
+            except json.JSONDecodeError:
+                pass
+        return _parse_fixes_content(content)
+    except Exception as e:
+        return _fixes_error(e)
+
+async def translate_schema_batch(source_dialect: str, target_dialect: str, inputs: List[Dict[str, Any]], concurrency: int = 10) -> List[Dict[str, Any]]:
+    """
+    Translate several schemas concurrently, at most `concurrency` requests in flight
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(input_ddl_json):
+        async with sem:
+            return await translate_schema(source_dialect, target_dialect, input_ddl_json)
+
+    return await asyncio.gather(*[one(x) for x in inputs])
+
+async def suggest_fixes_batch(items: List[Dict[str, Any]], concurrency: int = 10) -> List[Dict[str, Any]]:
+    """
+    Suggest fixes for several validation failures concurrently, at most `concurrency` requests in flight
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(validation_failures_json):
+        async with sem:
+            return await suggest_fixes(validation_failures_json)
+
+    return await asyncio.gather(*[one(x) for x in items])
+
+async def suggest_fixes_batch_api(items: List[Dict[str, Any]], poll_interval: float = 5.0, max_poll_interval: float = 60.0) -> List[Dict[str, Any]]:
+    """
+    Suggest fixes through the OpenAI Batch API (cheaper, separate rate-limit pool, results within 24h)
+    """
+    if _DEMO_MODE:
+        return [copy.deepcopy(dict(_DEMO_FIXES)) for _ in items]
+    if not items:
+        return []
+    
+    try:
+        # One JSONL request line per item, custom_id maps results back to their input
+        lines = []
+        for i, item in enumerate(items):
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": MODEL,
+                    "messages": _fixes_messages(_build_fixes_prompt(item)),
+                    "temperature": 0.3,
+                    "response_format": {"type": "json_object"}
+                }
+            }))
         
-        For each failure, provide:
-        1. A detailed explanation of the issue
-        2. Step-by-step instructions to fix it
-        3. Any precautions or considerations
+        batch_file = await _client.files.create(
+            file=("suggest_fixes.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await _client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
         
-        IMPORTANT: Please format your response as JSON with the following structure:
-        {{
-            "fixes": [
-                {{
-                    "category": "Category name",
-                    "issue": "Detailed explanation",
-                    "solution": "Step-by-step fix",
-                    "precautions": "Any precautions"
-                }}
-            ]
-        }}
-        """
+        # Poll with exponential backoff until the batch reaches a terminal state
+        delay = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            batch = await _client.batches.retrieve(batch.id)
         
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": "You are a database migration expert. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3
-        )
+        if batch.status != "completed" or not batch.output_file_id:
+            raise Exception(f"Batch {batch.id} finished with status {batch.status}")
         
-        # Check if response content exists
-        content = response.choices[0].message.content
-        if content is None:
-            return {
-                "fixes": [{
-                    "category": "Error",
-                    "issue": "AI returned empty response",
-                    "solution": "No suggestions available",
-                    "precautions": "None"
-                }]
-            }
+        output = await _client.files.content(batch.output_file_id)
+        results: List[Dict[str, Any]] = [None] * len(items)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            content = choices[0]["message"]["content"] if choices else None
+            results[int(record["custom_id"])] = _parse_fixes_content(content)
         
-        # Try to parse as JSON, if that fails return the raw content
-        try:
-            result = json.loads(content)
-            return result
-        except json.JSONDecodeError:
-            # If JSON parsing fails, return a default structure with the content as an issue
-            return {
-                "fixes": [{
-                    "category": "AI Response",
-                    "issue": content,
-                    "solution": "See issue description",
-                    "precautions": "None"
-                }]
-            }
+        # Requests that errored inside the batch have no output line
+        return [r if r is not None else _fixes_error(Exception("No result returned for this item")) for r in results]
     except Exception as e:
-        return {
-            "fixes": [{
-                "category": "Error",
-                "issue": "Failed to generate suggestions",
-                "solution": f"AI suggestion generation failed: {str(e)}",
-                "precautions": "None"
-            }]
-        }
\ No newline at end of file
+        return [_fixes_error(e) for _ in items]
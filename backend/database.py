@@ -4,43 +4,62 @@ from typing import List, Dict, Any, Optional
 from cryptography.fernet import Fernet
 import base64
 import json
+import threading
 
 # Database setup
 DB_PATH = "strata.db"
 
+# One shared handle per process; the lock serializes access from request threads
+_conn = None
+_db_lock = threading.RLock()
+
+def get_db() -> sqlite3.Connection:
+    """Return the shared SQLite connection, opening it on first use"""
+    global _conn
+    with _db_lock:
+        if _conn is None:
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            # WAL lets readers proceed during writes; NORMAL drops the fsync on every commit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            _conn = conn
+        return _conn
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Create connections table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS connections (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            db_type TEXT NOT NULL,
-            credentials BLOB NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create active session table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS active_session (
-            id INTEGER PRIMARY KEY CHECK (id = 1),
-            source_id INTEGER,
-            target_id INTEGER,
-            FOREIGN KEY (source_id) REFERENCES connections (id),
-            FOREIGN KEY (target_id) REFERENCES connections (id)
-        )
-    ''')
-    
-    # Insert default session row if not exists
-    cursor.execute('''
-        INSERT OR IGNORE INTO active_session (id, source_id, target_id) VALUES (1, NULL, NULL)
-    ''')
-    
-    conn.commit()
-    conn.close()
+    with _db_lock:
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        # Create connections table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS connections (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                db_type TEXT NOT NULL,
+                credentials BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Create active session table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS active_session (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                source_id INTEGER,
+                target_id INTEGER,
+                FOREIGN KEY (source_id) REFERENCES connections (id),
+                FOREIGN KEY (target_id) REFERENCES connections (id)
+            )
+        ''')
+        
+        # Insert default session row if not exists
+        cursor.execute('''
+            INSERT OR IGNORE INTO active_session (id, source_id, target_id) VALUES (1, NULL, NULL)
+        ''')
+        
+        conn.commit()
 
 def get_fernet_key():
     key_file = "fernet.key"
@@ -68,17 +87,17 @@ def decrypt_credentials(encrypted_credentials: bytes) -> Dict[str, Any]:
 def save_connection(name: str, db_type: str, credentials: Dict[str, Any]) -> int:
     encrypted_creds = encrypt_credentials(credentials)
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO connections (name, db_type, credentials)
-        VALUES (?, ?, ?)
-    ''', (name, db_type, encrypted_creds))
-    
-    conn.commit()
-    connection_id = cursor.lastrowid
-    conn.close()
+    with _db_lock:
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO connections (name, db_type, credentials)
+            VALUES (?, ?, ?)
+        ''', (name, db_type, encrypted_creds))
+        
+        conn.commit()
+        connection_id = cursor.lastrowid
     
     return connection_id if connection_id is not None else 0
 
@@ -86,45 +105,41 @@ def update_connection(connection_id: int, name: str, db_type: str, credentials:
     try:
         encrypted_creds = encrypt_credentials(credentials)
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE connections 
-            SET name = ?, db_type = ?, credentials = ?
-            WHERE id = ?
-        ''', (name, db_type, encrypted_creds, connection_id))
-        
-        conn.commit()
-        conn.close()
+        with _db_lock:
+            conn = get_db()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE connections 
+                SET name = ?, db_type = ?, credentials = ?
+                WHERE id = ?
+            ''', (name, db_type, encrypted_creds, connection_id))
+            
+            conn.commit()
         
         return cursor.rowcount > 0
     except Exception:
         return False
 
 def get_all_connections() -> List[Dict[str, Any]]:
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT id, name, db_type FROM connections')
-    rows = cursor.fetchall()
-    
-    conn.close()
+    with _db_lock:
+        cursor = get_db().cursor()
+        
+        cursor.execute('SELECT id, name, db_type FROM connections')
+        rows = cursor.fetchall()
     
     return [{"id": row[0], "name": row[1], "dbType": row[2]} for row in rows]
 
 def get_connection_by_id(connection_id: int) -> Optional[Dict[str, Any]]:
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT id, name, db_type, credentials FROM connections WHERE id = ?', (connection_id,))
-    row = cursor.fetchone()
+    with _db_lock:
+        cursor = get_db().cursor()
+        
+        cursor.execute('SELECT id, name, db_type, credentials FROM connections WHERE id = ?', (connection_id,))
+        row = cursor.fetchone()
     
     if not row:
         return None
     
-    conn.close()
-    
     return {
         "id": row[0],
         "name": row[1],
@@ -135,46 +150,43 @@ def get_connection_by_id(connection_id: int) -> Optional[Dict[str, Any]]:
 def delete_connection_by_id(connection_id: int) -> bool:
     """Delete a connection by ID"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM connections WHERE id = ?", (connection_id,))
-        conn.commit()
-        conn.close()
+        with _db_lock:
+            conn = get_db()
+            
+            conn.execute("DELETE FROM connections WHERE id = ?", (connection_id,))
+            conn.commit()
         
         return True
     except Exception:
         return False
 
 def set_source_target(source_id: int, target_id: int):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE active_session 
-        SET source_id = ?, target_id = ? 
-        WHERE id = 1
-    ''', (source_id, target_id))
-    
-    conn.commit()
-    conn.close()
+    with _db_lock:
+        conn = get_db()
+        
+        conn.execute('''
+            UPDATE active_session 
+            SET source_id = ?, target_id = ? 
+            WHERE id = 1
+        ''', (source_id, target_id))
+        
+        conn.commit()
 
 def get_active_session() -> Dict[str, Any]:
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT s.source_id, s.target_id,
-               c1.id as source_id, c1.name as source_name, c1.db_type as source_db_type,
-               c2.id as target_id, c2.name as target_name, c2.db_type as target_db_type
-        FROM active_session s
-        LEFT JOIN connections c1 ON s.source_id = c1.id
-        LEFT JOIN connections c2 ON s.target_id = c2.id
-        WHERE s.id = 1
-    ''')
-    
-    row = cursor.fetchone()
-    conn.close()
+    with _db_lock:
+        cursor = get_db().cursor()
+        
+        cursor.execute('''
+            SELECT s.source_id, s.target_id,
+                   c1.id as source_id, c1.name as source_name, c1.db_type as source_db_type,
+                   c2.id as target_id, c2.name as target_name, c2.db_type as target_db_type
+            FROM active_session s
+            LEFT JOIN connections c1 ON s.source_id = c1.id
+            LEFT JOIN connections c2 ON s.target_id = c2.id
+            WHERE s.id = 1
+        ''')
+        
+        row = cursor.fetchone()
     
     if not row:
         return {"source": None, "target": None}
@@ -194,14 +206,13 @@ def get_active_session() -> Dict[str, Any]:
     return {"source": source, "target": target}
 
 def reset_session():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE active_session 
-        SET source_id = NULL, target_id = NULL 
-        WHERE id = 1
-    ''')
-    
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    with _db_lock:
+        conn = get_db()
+        
+        conn.execute('''
+            UPDATE active_session 
+            SET source_id = NULL, target_id = NULL 
+            WHERE id = 1
+        ''')
+        
+        conn.commit()
\ No newline at end of file
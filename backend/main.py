@@ -1,8 +1,12 @@
 import os
 import sys
+import asyncio
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 # Add the parent directory to the path so we can import backend modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -14,10 +18,21 @@ from backend.database import init_db
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize the database
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialize the database once per worker at startup instead of at import time
+    await asyncio.to_thread(init_db)
+    # Open the source pool now so the first extraction doesn't pay the TLS handshakes
+    try:
+        await asyncio.to_thread(extract.warm_source_pool)
+    except Exception as e:
+        print(f"Skipping source pool warm-up: {str(e)}")
+    yield
+    # Don't leave cached test connections open on the database servers after shutdown
+    await asyncio.to_thread(connections.close_idle_connections)
 
-app = FastAPI(title="Strata - AI-Powered Database Migration")
+# orjson encodes the large extraction and analysis payloads far faster than the stdlib json encoder
+app = FastAPI(title="Strata - AI-Powered Database Migration", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -28,6 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress the large JSON payloads (analysis results, exports); small responses aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Include routers
 app.include_router(connections.router, prefix="/api/connections", tags=["connections"])
 app.include_router(session.router, prefix="/api/session", tags=["session"])
@@ -6,6 +6,7 @@ import asyncio
 import json
 import os
 import importlib
+import functools
 import xlsxwriter
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
@@ -23,22 +24,23 @@ analysis_status = {
     "error": None
 }
 
+_CONNECTORS = {
+    "PostgreSQL": "psycopg2",
+    "MySQL": "mysql.connector",
+    "Snowflake": "snowflake.connector",
+    "Databricks": "databricks.sql",
+    "Oracle": "oracledb",
+    "SQL Server": "pyodbc",
+    "Teradata": "teradatasql",
+    "Google BigQuery": "google.cloud.bigquery"
+}
+
+@functools.lru_cache(maxsize=None)
 def get_db_connector(db_type: str):
     """Dynamically import and return the appropriate database connector"""
-    connectors = {
-        "PostgreSQL": "psycopg2",
-        "MySQL": "mysql.connector",
-        "Snowflake": "snowflake.connector",
-        "Databricks": "databricks.sql",
-        "Oracle": "oracledb",
-        "SQL Server": "pyodbc",
-        "Teradata": "teradatasql",
-        "Google BigQuery": "google.cloud.bigquery"
-    }
-    
     try:
-        if db_type in connectors:
-            return importlib.import_module(connectors[db_type])
+        if db_type in _CONNECTORS:
+            return importlib.import_module(_CONNECTORS[db_type])
         return None
     except ImportError:
         return None
@@ -1,28 +1,136 @@
 from fastapi import APIRouter, HTTPException
 from backend.models import ConnectionTestRequest, ConnectionTestResponse, ConnectionSaveRequest, ConnectionSaveResponse, ConnectionResponse
-from backend.database import save_connection, get_all_connections, get_connection_by_id, update_connection
+from backend.database import save_connection, get_all_connections, get_connection_by_id, update_connection, delete_connection_by_id
 from typing import List
 import importlib
-import sqlite3
+import functools
+import hashlib
+import asyncio
+import threading
+import time
 
 router = APIRouter()
 
+# Authenticated test connections are kept for a short while so repeated "Test" clicks
+# skip the TCP/TLS/auth handshake
+IDLE_CONNECTION_TTL = 30
+_idle_connections = {}
+_idle_lock = threading.Lock()
+_sweep_timer = None
+
+def _connection_key(db_type: str, credentials: dict):
+    """Pool key per server/user/database, including a password hash so changed credentials are re-tested"""
+    password = str(credentials.get('password') or '')
+    return (
+        db_type,
+        credentials.get('host'),
+        str(credentials.get('port', '')),
+        credentials.get('username'),
+        credentials.get('database'),
+        str(credentials.get('ssl', credentials.get('ssl-mode', ''))),
+        hashlib.sha256(password.encode('utf-8')).hexdigest()
+    )
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+def _pop_expired_locked(now):
+    expired = [k for k, (_, last_used) in _idle_connections.items() if now - last_used > IDLE_CONNECTION_TTL]
+    return [_idle_connections.pop(k)[0] for k in expired]
+
+def _sweep_idle_connections():
+    """Timer callback: close expired idle connections and re-arm while any remain cached"""
+    global _sweep_timer
+    with _idle_lock:
+        stale = _pop_expired_locked(time.monotonic())
+        _sweep_timer = None
+        if _idle_connections:
+            _schedule_sweep_locked()
+    for connection in stale:
+        _close_quietly(connection)
+
+def _schedule_sweep_locked():
+    global _sweep_timer
+    if _sweep_timer is None:
+        _sweep_timer = threading.Timer(IDLE_CONNECTION_TTL, _sweep_idle_connections)
+        _sweep_timer.daemon = True
+        _sweep_timer.start()
+
+def _checkout_connection(key):
+    """Take an idle connection for key out of the cache, closing any that have expired"""
+    with _idle_lock:
+        stale = _pop_expired_locked(time.monotonic())
+        entry = _idle_connections.pop(key, None)
+    for connection in stale:
+        _close_quietly(connection)
+    return entry[0] if entry else None
+
+def _checkin_connection(key, connection):
+    now = time.monotonic()
+    with _idle_lock:
+        stale = _pop_expired_locked(now)
+        previous = _idle_connections.get(key)
+        _idle_connections[key] = (connection, now)
+        _schedule_sweep_locked()
+    if previous is not None and previous[0] is not connection:
+        stale.append(previous[0])
+    for stale_connection in stale:
+        _close_quietly(stale_connection)
+
+def close_idle_connections():
+    """Close every cached test connection, called from the app lifespan at shutdown"""
+    global _sweep_timer
+    with _idle_lock:
+        stale = [connection for connection, _ in _idle_connections.values()]
+        _idle_connections.clear()
+        timer, _sweep_timer = _sweep_timer, None
+    if timer is not None:
+        timer.cancel()
+    for connection in stale:
+        _close_quietly(connection)
+
+def _probe_with_cached_connection(key, connect, probe):
+    """Run probe on a cached connection if one is alive, otherwise on a fresh one"""
+    connection = _checkout_connection(key)
+    if connection is not None:
+        try:
+            result = probe(connection)
+            _checkin_connection(key, connection)
+            return result
+        except Exception:
+            # Server closed the idle socket, fall through to a fresh connection
+            _close_quietly(connection)
+    
+    connection = connect()
+    try:
+        result = probe(connection)
+    except Exception:
+        _close_quietly(connection)
+        raise
+    _checkin_connection(key, connection)
+    return result
+
+
+_CONNECTORS = {
+    "PostgreSQL": "psycopg2",
+    "MySQL": "mysql.connector",
+    "Snowflake": "snowflake.connector",
+    "Databricks": "databricks.sql",
+    "Oracle": "oracledb",
+    "SQL Server": "pyodbc",
+    "Teradata": "teradatasql",
+    "Google BigQuery": "google.cloud.bigquery"
+}
+
+@functools.lru_cache(maxsize=None)
 def get_db_connector(db_type: str):
     """Dynamically import and return the appropriate database connector"""
-    connectors = {
-        "PostgreSQL": "psycopg2",
-        "MySQL": "mysql.connector",
-        "Snowflake": "snowflake.connector",
-        "Databricks": "databricks.sql",
-        "Oracle": "oracledb",
-        "SQL Server": "pyodbc",
-        "Teradata": "teradatasql",
-        "Google BigQuery": "google.cloud.bigquery"
-    }
-    
     try:
-        if db_type in connectors:
-            return importlib.import_module(connectors[db_type])
+        if db_type in _CONNECTORS:
+            return importlib.import_module(_CONNECTORS[db_type])
         return None
     except ImportError:
         return None
@@ -68,14 +176,18 @@ def test_mysql_connection(credentials):
             **ssl_config
         }
         
-        connection = mysql.connector.connect(**connection_params)
+        def probe(connection):
+            # is_connected() pings the server, so a dead cached socket is detected here
+            if not connection.is_connected():
+                raise Exception("Failed to connect")
+            return connection.get_server_info()
         
-        if connection.is_connected():
-            db_info = connection.get_server_info()
-            connection.close()
-            return True, db_info
-        else:
-            return False, "Failed to connect"
+        db_info = _probe_with_cached_connection(
+            _connection_key("MySQL", credentials),
+            lambda: mysql.connector.connect(**connection_params),
+            probe
+        )
+        return True, db_info
     except ImportError:
         return False, "MySQL connector not installed"
     except Exception as e:
@@ -142,17 +254,24 @@ def test_postgresql_connection(credentials):
         # But for most cases, just requiring SSL should work
         connection_params['connect_timeout'] = 10  # 10 second timeout
         
-        connection = psycopg2.connect(**connection_params)
+        def connect():
+            connection = psycopg2.connect(**connection_params)
+            # Avoid leaving the cached connection idle in a transaction
+            connection.autocommit = True
+            return connection
         
-        if connection:
+        def probe(connection):
             # Test the connection
-            cursor = connection.cursor()
-            cursor.execute('SELECT version()')
-            version = cursor.fetchone()[0]
-            connection.close()
-            return True, version[:50]  # Return truncated version
-        else:
-            return False, "Failed to connect"
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT version()')
+                return cursor.fetchone()[0]
+        
+        version = _probe_with_cached_connection(
+            _connection_key("PostgreSQL", credentials),
+            connect,
+            probe
+        )
+        return True, version[:50]  # Return truncated version
             
     except ImportError:
         return False, "PostgreSQL connector not installed"
@@ -176,7 +295,8 @@ def test_postgresql_connection(credentials):
 @router.post("/test", response_model=ConnectionTestResponse)
 async def test_connection(request: ConnectionTestRequest):
     try:
-        success, details = test_connection_by_type(request.dbType, request.credentials)
+        # Driver connects block for the whole handshake, keep them off the event loop
+        success, details = await asyncio.to_thread(test_connection_by_type, request.dbType, request.credentials)
         
         if success:
             return ConnectionTestResponse(
@@ -249,12 +369,8 @@ async def list_connections():
 async def delete_connection(connection_id: int):
     """Delete a connection by ID"""
     try:
-        conn = sqlite3.connect("strata.db")
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM connections WHERE id = ?", (connection_id,))
-        conn.commit()
-        conn.close()
+        if not delete_connection_by_id(connection_id):
+            raise Exception("Failed to delete connection")
         
         return {"ok": True, "message": "Connection deleted successfully"}
     except Exception as e:
@@ -1,90 +1,629 @@
-from fastapi import APIRouter, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from backend.models import CommonResponse, AnalysisStatusResponse
 from backend.database import get_active_session, get_connection_by_id
 import asyncio
-import json
+import copy
+import gzip
 import os
+import orjson
 import importlib
+import io
+import queue
+import functools
+import hashlib
+import threading
+import uuid
+from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, replace
+from itertools import groupby
+from operator import itemgetter
+from types import MappingProxyType
+from xml.sax.saxutils import escape
 import xlsxwriter
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Preformatted, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 
 router = APIRouter()
 
-# Global variable to track extraction status
-extraction_status = {
-    "phase": None,
-    "percent": 0,
-    "done": False,
-    "results_summary": None,
-    "error": None
+# Extraction jobs keyed by job id, so concurrent extractions don't overwrite each other's progress
+extraction_jobs: Dict[str, "ExtractionJob"] = {}
+latest_extraction_job_id: Optional[str] = None
+# Finished jobs kept around for status polling
+MAX_FINISHED_EXTRACTION_JOBS = 20
+_extraction_jobs_lock: Optional[asyncio.Lock] = None
+
+def _get_extraction_jobs_lock() -> asyncio.Lock:
+    # Created lazily so it binds to the running event loop (Python 3.9 binds locks at construction)
+    global _extraction_jobs_lock
+    if _extraction_jobs_lock is None:
+        _extraction_jobs_lock = asyncio.Lock()
+    return _extraction_jobs_lock
+
+@dataclass(frozen=True)
+class ExtractionJob:
+    """Progress of one extraction; updates swap in a new snapshot so readers never see a half-applied one"""
+    __slots__ = ("phase", "percent", "done", "results_summary", "error")
+    phase: str
+    percent: int
+    done: bool
+    results_summary: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+# Long-polling /status requests wait on this until a job changes, up to the timeout
+STATUS_LONG_POLL_TIMEOUT = 25
+_extraction_status_changed: Optional[asyncio.Event] = None
+
+def _get_extraction_status_changed() -> asyncio.Event:
+    global _extraction_status_changed
+    if _extraction_status_changed is None:
+        _extraction_status_changed = asyncio.Event()
+    return _extraction_status_changed
+
+async def update_extraction_job(job_id: str, **fields):
+    async with _get_extraction_jobs_lock():
+        extraction_jobs[job_id] = replace(extraction_jobs[job_id], **fields)
+    # set() wakes everyone already waiting; clear() re-arms the event for the next change
+    changed = _get_extraction_status_changed()
+    changed.set()
+    changed.clear()
+
+async def wait_for_extraction_job(get_job, since: Optional[int]):
+    """Return get_job() once its percent differs from since, it is done, or the long-poll times out"""
+    job = get_job()
+    if since is None:
+        return job
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STATUS_LONG_POLL_TIMEOUT
+    while job is not None and not job.done and job.percent == since:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            await asyncio.wait_for(_get_extraction_status_changed().wait(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+        job = get_job()
+    return job
+
+_CONNECTORS = {
+    "PostgreSQL": "psycopg2",
+    "MySQL": "mysql.connector",
+    "Snowflake": "snowflake.connector",
+    "Databricks": "databricks.sql",
+    "Oracle": "oracledb",
+    "SQL Server": "pyodbc",
+    "Teradata": "teradatasql",
+    "Google BigQuery": "google.cloud.bigquery"
 }
 
+@functools.lru_cache(maxsize=None)
 def get_db_connector(db_type: str):
     """Dynamically import and return the appropriate database connector"""
-    connectors = {
-        "PostgreSQL": "psycopg2",
-        "MySQL": "mysql.connector",
-        "Snowflake": "snowflake.connector",
-        "Databricks": "databricks.sql",
-        "Oracle": "oracledb",
-        "SQL Server": "pyodbc",
-        "Teradata": "teradatasql",
-        "Google BigQuery": "google.cloud.bigquery"
-    }
-    
     try:
-        if db_type in connectors:
-            return importlib.import_module(connectors[db_type])
+        if db_type in _CONNECTORS:
+            return importlib.import_module(_CONNECTORS[db_type])
         return None
     except ImportError:
         return None
 
-def extract_mysql_ddl(connection_info):
-    """Extract comprehensive DDL from MySQL database"""
+# Number of connections used for per-table extraction work
+MYSQL_EXTRACT_WORKERS = int(os.getenv("MYSQL_EXTRACT_WORKERS", "8"))
+
+# SHOW CREATE statements sent per multi-statement round trip
+MYSQL_SHOW_CREATE_BATCH = 200
+
+# Large object types are left out of the COUNT(DISTINCT) profile (distinct_count is None) since it would sort whole values
+MYSQL_LOB_TYPES = {"tinytext", "text", "mediumtext", "longtext", "tinyblob", "blob", "mediumblob", "longblob", "json", "geometry"}
+
+# DDL templates for constraints and indexes rebuilt from information_schema; every name is passed in already quoted by _qi
+_MYSQL_PK_TMPL = "ALTER TABLE {t} ADD CONSTRAINT {n} PRIMARY KEY ({c});"
+_MYSQL_FK_TMPL = "ALTER TABLE {t} ADD CONSTRAINT {n} FOREIGN KEY ({c}) REFERENCES {rt} ({rc}){cs};"
+_MYSQL_UNIQUE_TMPL = "ALTER TABLE {t} ADD CONSTRAINT {n} UNIQUE ({c});"
+_MYSQL_CHECK_TMPL = "ALTER TABLE {t} ADD CONSTRAINT {n} CHECK ({e});"
+_MYSQL_INDEX_TMPL = "CREATE {u}INDEX {n} ON {t} ({c});"
+
+# Constant parts of every MySQL bundle, shared across extractions instead of rebuilt per call
+_MYSQL_TO_PG_TYPES = MappingProxyType({
+    "tinyint": "SMALLINT",
+    "smallint": "SMALLINT",
+    "mediumint": "INTEGER",
+    "int": "INTEGER",
+    "bigint": "BIGINT",
+    "float": "FLOAT",
+    "double": "DOUBLE PRECISION",
+    "decimal": "DECIMAL",
+    "date": "DATE",
+    "datetime": "TIMESTAMP",
+    "timestamp": "TIMESTAMP",
+    "time": "TIME",
+    "year": "SMALLINT",
+    "char": "CHAR",
+    "varchar": "VARCHAR",
+    "text": "TEXT",
+    "mediumtext": "TEXT",
+    "longtext": "TEXT",
+    "binary": "BYTEA",
+    "varbinary": "BYTEA",
+    "blob": "BYTEA",
+    "mediumblob": "BYTEA",
+    "longblob": "BYTEA"
+})
+_MYSQL_CREATION_ORDER = ("types", "domains", "tables", "constraints", "indexes", "computed_columns", "views", "materialized_views", "triggers", "procedures", "functions", "roles", "grants", "security_policies")
+_MYSQL_DELETION_ORDER = ("security_policies", "grants", "roles", "functions", "procedures", "triggers", "materialized_views", "views", "computed_columns", "indexes", "constraints", "tables", "domains", "types")
+
+# Validation script emitted per table in the dependency graph
+_MYSQL_INTEGRITY_TMPL = "SELECT COUNT(*) as row_count FROM {};"
+
+# Catalog queries run once per extraction; built at import instead of per call
+_MYSQL_Q_ROW_ESTIMATES = """
+    SELECT table_name, table_rows
+    FROM information_schema.tables
+    WHERE table_schema = %s
+"""
+_MYSQL_Q_PROCEDURES = """
+    SELECT routine_name, routine_definition, sql_data_access,
+           security_type, created, last_altered
+    FROM information_schema.routines
+    WHERE routine_schema = %s AND routine_type = 'PROCEDURE'
+"""
+_MYSQL_Q_FUNCTIONS = """
+    SELECT routine_name, routine_definition, sql_data_access,
+           security_type, created, last_altered, data_type
+    FROM information_schema.routines
+    WHERE routine_schema = %s AND routine_type = 'FUNCTION'
+"""
+_MYSQL_Q_TRIGGERS = """
+    SELECT trigger_name, event_manipulation, event_object_table,
+           action_statement, action_timing, definer, created,
+           sql_mode, character_set_client, collation_connection
+    FROM information_schema.triggers
+    WHERE trigger_schema = %s
+"""
+_MYSQL_Q_PRIMARY_KEYS = """
+    SELECT kcu.table_name, kcu.column_name, kcu.constraint_name,
+           tc.constraint_type
+    FROM information_schema.key_column_usage kcu
+    JOIN information_schema.table_constraints tc
+      ON kcu.constraint_name = tc.constraint_name
+      AND kcu.table_schema = tc.table_schema
+    WHERE kcu.table_schema = %s AND tc.constraint_type = 'PRIMARY KEY'
+    ORDER BY kcu.table_name, kcu.ordinal_position
+"""
+_MYSQL_Q_FOREIGN_KEYS = """
+    SELECT kcu.table_name, kcu.column_name, kcu.constraint_name,
+           kcu.referenced_table_name, kcu.referenced_column_name,
+           rc.update_rule, rc.delete_rule, rc.match_option
+    FROM information_schema.key_column_usage kcu
+    JOIN information_schema.referential_constraints rc
+      ON kcu.constraint_name = rc.constraint_name
+      AND kcu.table_schema = rc.constraint_schema
+    WHERE kcu.table_schema = %s AND kcu.referenced_table_name IS NOT NULL
+    ORDER BY kcu.table_name, kcu.constraint_name, kcu.ordinal_position
+"""
+# Dependency edges per table, one row per table instead of one per foreign key column;
+# NUL separates names since it is the one character MySQL identifiers cannot contain
+_MYSQL_Q_DEPENDS_ON = """
+    SELECT table_name, GROUP_CONCAT(referenced_table_name ORDER BY constraint_name SEPARATOR '\\0')
+    FROM (
+        SELECT DISTINCT table_name, constraint_name, referenced_table_name
+        FROM information_schema.key_column_usage
+        WHERE table_schema = %s AND referenced_table_name IS NOT NULL
+    ) fk
+    GROUP BY table_name
+"""
+_MYSQL_Q_REFERENCED_BY = """
+    SELECT referenced_table_name, GROUP_CONCAT(table_name ORDER BY table_name, constraint_name SEPARATOR '\\0')
+    FROM (
+        SELECT DISTINCT table_name, constraint_name, referenced_table_name
+        FROM information_schema.key_column_usage
+        WHERE table_schema = %s AND referenced_table_name IS NOT NULL
+    ) fk
+    GROUP BY referenced_table_name
+"""
+_MYSQL_Q_CHECKS = """
+    SELECT tc.table_name, tc.constraint_name, cc.check_clause
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.check_constraints cc
+      ON tc.constraint_name = cc.constraint_name
+      AND tc.constraint_schema = cc.constraint_schema
+    WHERE tc.constraint_schema = %s AND tc.constraint_type = 'CHECK'
+"""
+_MYSQL_Q_UNIQUES = """
+    SELECT kcu.table_name, kcu.column_name, kcu.constraint_name
+    FROM information_schema.key_column_usage kcu
+    JOIN information_schema.table_constraints tc
+      ON kcu.constraint_name = tc.constraint_name
+      AND kcu.table_schema = tc.table_schema
+    WHERE kcu.table_schema = %s AND tc.constraint_type = 'UNIQUE'
+    ORDER BY kcu.table_name, kcu.constraint_name, kcu.ordinal_position
+"""
+_MYSQL_Q_INDEXES = """
+    SELECT table_name, index_name, column_name, non_unique,
+           seq_in_index, collation, cardinality, sub_part,
+           packed, nullable, index_type, comment
+    FROM information_schema.statistics
+    WHERE table_schema = %s
+    ORDER BY table_name, index_name, seq_in_index
+"""
+_MYSQL_Q_SEQUENCES = """
+    SELECT table_name, column_name, extra, column_default
+    FROM information_schema.columns
+    WHERE table_schema = %s AND extra LIKE '%auto_increment%'
+"""
+_MYSQL_Q_PARTITIONS = """
+    SELECT table_name, partition_name, partition_method,
+           partition_expression, partition_description
+    FROM information_schema.partitions
+    WHERE table_schema = %s AND partition_name IS NOT NULL
+"""
+_MYSQL_Q_EVENTS = """
+    SELECT event_name, event_definition, event_type,
+           execute_at, interval_value, interval_field,
+           starts, ends, status, definer
+    FROM information_schema.events
+    WHERE event_schema = %s
+"""
+_MYSQL_Q_COMPUTED = """
+    SELECT table_name, column_name, generation_expression, column_default
+    FROM information_schema.columns
+    WHERE table_schema = %s AND extra LIKE '%%GENERATED%%'
+"""
+_MYSQL_Q_ADVANCED_CHECKS = """
+    SELECT tc.table_name, tc.constraint_name, cc.check_clause, tc.enforced
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.check_constraints cc
+      ON tc.constraint_name = cc.constraint_name
+      AND tc.constraint_schema = cc.constraint_schema
+    WHERE tc.constraint_schema = %s AND tc.constraint_type = 'CHECK'
+"""
+_MYSQL_Q_USERS = """
+    SELECT user, host, account_locked, password_expired
+    FROM mysql.user
+    WHERE user != 'mysql.session' AND user != 'mysql.sys' AND user != 'mysql.infoschema'
+"""
+_MYSQL_Q_ACCOUNTS = "SELECT user, host FROM mysql.user"
+_MYSQL_Q_GRANTS = "SHOW GRANTS FOR CURRENT_USER()"
+_MYSQL_Q_TABLE_STATS = """
+    SELECT table_name, table_rows, avg_row_length,
+           data_length, index_length, create_time, update_time
+    FROM information_schema.tables
+    WHERE table_schema = %s
+"""
+# statistics has one row per index column with cardinality of the key prefix so far;
+# the largest is the whole index, so collapse to one row per index
+_MYSQL_Q_INDEX_STATS = """
+    SELECT table_name, index_name, MAX(cardinality)
+    FROM information_schema.statistics
+    WHERE table_schema = %s
+    GROUP BY table_name, index_name
+"""
+
+def _qi(ident) -> str:
+    """Quote a MySQL identifier, doubling embedded backticks"""
+    return "`" + str(ident).replace("`", "``") + "`"
+
+def _mysql_column_list(columns) -> str:
+    return ", ".join(map(_qi, columns))
+
+def _mysql_column_terms(column_name: str, data_type: str, is_nullable: str):
+    """Null and distinct aggregate terms for a column, None where the count is skipped"""
+    # NOT NULL columns have no nulls to count, and DISTINCT over LOB columns spills to on-disk temp tables
+    null_term = f"SUM({_qi(column_name)} IS NULL)" if is_nullable == "YES" else None
+    distinct_term = None if str(data_type).lower() in MYSQL_LOB_TYPES else f"COUNT(DISTINCT {_qi(column_name)})"
+    return null_term, distinct_term
+
+def _iter_rows(cursor, arraysize: int = 1000):
+    """Stream a result set in fetchmany batches instead of materializing it with fetchall"""
+    cursor.arraysize = arraysize
+    while True:
+        rows = cursor.fetchmany(arraysize)
+        if not rows:
+            return
+        yield from rows
+
+def _mysql_show_create(cursor, kind: str, name: str):
+    """Get the CREATE statement for a table or view"""
     try:
-        # Import mysql.connector inside the function to handle import errors
-        import mysql.connector
-        
-        # Extract credentials
-        credentials = connection_info.get("credentials", {})
-        host = credentials.get('host')
-        port = credentials.get('port', 3306)
-        database = credentials.get('database')
-        username = credentials.get('username')
-        password = credentials.get('password')
-        # Handle both 'ssl' and 'ssl-mode' parameters for compatibility
-        ssl_mode = credentials.get('ssl', credentials.get('ssl-mode', 'require'))
+        cursor.execute(f"SHOW CREATE {kind} {_qi(name)}")
+        create_result = cursor.fetchone()
+        if create_result and len(create_result) > 1 and create_result[1]:
+            return {
+                "name": str(name),
+                "ddl": str(create_result[1]),
+                "type": kind
+            }
+    except Exception:
+        pass
+    return None
+
+def _mysql_profile_table(cursor, prepared_cursor, database: str, profile_target):
+    """Row count plus per-column null and distinct counts for one table"""
+    # estimated_rows is information_schema.tables.table_rows, or None when exact counts were requested
+    table, estimated_rows = profile_target
+    try:
+        # Get column info for null stats; same statement for every table, so it is prepared once per connection
+        prepared_cursor.execute("""
+            SELECT column_name, data_type, is_nullable
+            FROM information_schema.columns 
+            WHERE table_schema = %s AND table_name = %s
+            ORDER BY ordinal_position
+        """, (database, table))
+        columns_result = prepared_cursor.fetchall()
+        
+        # One scan for the row count and the null/distinct counts worth computing
+        column_terms = [_mysql_column_terms(*col_row) for col_row in columns_result]
+        selects = ["COUNT(*)"]
+        for terms in column_terms:
+            selects.extend(term for term in terms if term)
         
-        # Configure SSL settings
-        ssl_config = {}
-        if ssl_mode == 'disable' or ssl_mode == 'false':
-            ssl_config['ssl_disabled'] = True
+        try:
+            cursor.execute(f"SELECT {', '.join(selects)} FROM {_qi(table)}")
+            aggregates = cursor.fetchone()
+        except Exception:
+            # Fall back to per-column queries below so one bad column doesn't lose the whole table
+            aggregates = None
+        
+        if aggregates:
+            # COUNT(*) rides along in the profile scan, so it is exact at no extra cost
+            row_count = aggregates[0] or 0
+        elif estimated_rows is not None:
+            # Avoid a separate full scan just for the count
+            row_count = estimated_rows
         else:
-            # For Azure MySQL, we need to handle SSL properly
-            ssl_config['ssl_disabled'] = False
-            ssl_config['ssl_verify_cert'] = False
-            ssl_config['ssl_verify_identity'] = False
-            # For Azure MySQL specifically
-            if host and 'mysql.database.azure.com' in host:
-                ssl_config['ssl_verify_cert'] = False
-                ssl_config['ssl_verify_identity'] = False
-        
-        # Create connection with SSL configuration
-        connection_params = {
-            'host': host,
-            'port': port,
-            'database': database,
-            'user': username,
-            'password': password,
-            **ssl_config
+            cursor.execute(f"SELECT COUNT(*) FROM {_qi(table)}")
+            count_result = cursor.fetchone()
+            row_count = count_result[0] if count_result else 0
+        
+        column_stats = []
+        aggregate_values = iter(aggregates[1:] if aggregates else ())
+        for col_row, (null_term, distinct_term) in zip(columns_result, column_terms):
+            column_name = col_row[0]
+            try:
+                if aggregates:
+                    values = aggregate_values
+                else:
+                    terms = [term for term in (null_term, distinct_term) if term]
+                    values = iter(())
+                    if terms:
+                        cursor.execute(f"SELECT {', '.join(terms)} FROM {_qi(table)}")
+                        values = iter(cursor.fetchone() or ())
+                
+                # Terms consume values in select order; skipped counts are 0 nulls and unknown distincts
+                null_count = int(next(values, 0) or 0) if null_term else 0
+                distinct_count = int(next(values, 0) or 0) if distinct_term else None
+                
+                column_stats.append({
+                    "name": column_name,
+                    "data_type": col_row[1],
+                    "nullable": col_row[2] == "YES",
+                    "null_count": null_count,
+                    "distinct_count": distinct_count,
+                    # Estimated row counts can be below the real null count
+                    "null_ratio": min(null_count / row_count, 1) if row_count > 0 else 0
+                })
+            except Exception:
+                column_stats.append({
+                    "name": column_name,
+                    "data_type": col_row[1],
+                    "nullable": col_row[2] == "YES",
+                    "null_count": 0,
+                    "distinct_count": 0,
+                    "null_ratio": 0
+                })
+        
+        return {
+            "row_count": row_count,
+            "columns": column_stats
+        }
+    except Exception:
+        return {
+            "row_count": 0,
+            "columns": []
+        }
+
+def _mysql_sample_table(cursor, prepared_cursor, database: str, table: str):
+    """First rows of a table for testing"""
+    try:
+        cursor.execute(f"SELECT * FROM {_qi(table)} LIMIT 10")
+        sample_data = cursor.fetchall()
+        
+        # Column names come back with the result set, no separate DESCRIBE round trip needed
+        column_names = list(cursor.column_names)
+        
+        return {
+            "table": table,
+            "sample_rows": len(sample_data),
+            "columns": column_names,
+            "sample_data": sample_data
         }
+    except Exception:
+        return None
+
+def _mysql_show_create_batch(cursor, kind: str, names):
+    """Get CREATE statements for many tables or views in one multi-statement round trip"""
+    results = [None] * len(names)
+    try:
+        statements = "; ".join(f"SHOW CREATE {kind} {_qi(name)}" for name in names)
+        for position, result in enumerate(cursor.execute(statements, multi=True)):
+            if result.with_rows:
+                rows = result.fetchall()
+                if rows and len(rows[0]) > 1 and rows[0][1]:
+                    results[position] = {
+                        "name": str(names[position]),
+                        "ddl": str(rows[0][1]),
+                        "type": kind
+                    }
+    except Exception:
+        # The server stops at the first failing statement, fetch the rest one by one below
+        pass
+    
+    for position, name in enumerate(names):
+        if results[position] is None:
+            results[position] = _mysql_show_create(cursor, kind, name)
+    return results
+
+def _mysql_query_rows(cursor, prepared_cursor, database: str, query):
+    """All rows of a standalone catalog query, or an empty list if the server refuses it"""
+    statement, params = query
+    try:
+        cursor.execute(statement, params)
+        return cursor.fetchall()
+    except Exception:
+        return []
+
+_MYSQL_TASKS = {
+    "tables": lambda cursor, prepared_cursor, database, names: _mysql_show_create_batch(cursor, "TABLE", names),
+    "views": lambda cursor, prepared_cursor, database, names: _mysql_show_create_batch(cursor, "VIEW", names),
+    "profile": _mysql_profile_table,
+    "sample": _mysql_sample_table,
+    "query": _mysql_query_rows
+}
+
+def _start_mysql_snapshot(cursor):
+    """Read everything from one consistent snapshot instead of a fresh read view per statement"""
+    cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+    cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+
+# One pool per distinct source; the main connection plus every task worker can borrow at once
+MYSQL_POOL_SIZE = min(32, MYSQL_EXTRACT_WORKERS + 1)
+_mysql_pools = {}
+_mysql_pools_lock = threading.Lock()
+
+def _mysql_connection_params(connection_info) -> dict:
+    """Build mysql.connector parameters from a stored connection"""
+    credentials = connection_info.get("credentials", {})
+    host = credentials.get('host')
+    # Handle both 'ssl' and 'ssl-mode' parameters for compatibility
+    ssl_mode = credentials.get('ssl', credentials.get('ssl-mode', 'require'))
+    
+    # Configure SSL settings
+    ssl_config = {}
+    if ssl_mode == 'disable' or ssl_mode == 'false':
+        ssl_config['ssl_disabled'] = True
+    else:
+        # For Azure MySQL, we need to handle SSL properly
+        ssl_config['ssl_disabled'] = False
+        ssl_config['ssl_verify_cert'] = False
+        ssl_config['ssl_verify_identity'] = False
+    
+    return {
+        'host': host,
+        'port': credentials.get('port', 3306),
+        'database': credentials.get('database'),
+        'user': credentials.get('username'),
+        'password': credentials.get('password'),
+        **ssl_config
+    }
+
+def _get_mysql_pool(connection_params: dict):
+    """Return the shared pool for these parameters, opening its connections on first use"""
+    from mysql.connector import pooling
+    
+    key = hashlib.sha256(orjson.dumps(connection_params, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+    with _mysql_pools_lock:
+        pool = _mysql_pools.get(key)
+        if pool is None:
+            pool = pooling.MySQLConnectionPool(
+                pool_name=f"strata_{key[:16]}",
+                pool_size=MYSQL_POOL_SIZE,
+                pool_reset_session=True,
+                **connection_params
+            )
+            _mysql_pools[key] = pool
+        return pool
+
+def _mysql_connect(connection_params: dict):
+    """Borrow a pooled connection, falling back to a direct one when the pool is exhausted"""
+    import mysql.connector
+    from mysql.connector import errors
+    
+    try:
+        # get_connection() checks liveness and reconnects stale connections before handing them out
+        return _get_mysql_pool(connection_params).get_connection()
+    except errors.PoolError:
+        return mysql.connector.connect(**connection_params)
+
+def warm_source_pool():
+    """Open and prime the pool for the active MySQL source ahead of the first extraction"""
+    source_db = get_active_session().get("source")
+    if not source_db or source_db.get("dbType") != "MySQL":
+        return
+    
+    connection_info = get_connection_by_id(source_db["id"])
+    if not connection_info:
+        return
+    
+    pool = _get_mysql_pool(_mysql_connection_params(connection_info))
+    # Hold every connection at once so each one gets primed, then hand them all back
+    connections = []
+    try:
+        for _ in range(pool.pool_size):
+            connections.append(pool.get_connection())
+        for connection in connections:
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+    finally:
+        for connection in connections:
+            connection.close()
+
+def _mysql_task_worker(connection_params: dict, database: str, indexed_tasks):
+    """Run a share of the per-object tasks on one dedicated connection"""
+    connection = _mysql_connect(connection_params)
+    try:
+        cursor = connection.cursor()
+        prepared_cursor = connection.cursor(prepared=True)
+        _start_mysql_snapshot(cursor)
+        results = [(index, _MYSQL_TASKS[kind](cursor, prepared_cursor, database, name)) for index, (kind, name) in indexed_tasks]
+        connection.commit()
+        return results
+    finally:
+        connection.close()
+
+def _run_mysql_tasks(connection_params: dict, database: str, tasks):
+    """Spread (kind, name) tasks across worker connections and return results in task order"""
+    if not tasks:
+        return []
+    
+    workers = max(1, min(MYSQL_EXTRACT_WORKERS, len(tasks)))
+    # Round-robin so heavy tasks (profiles of big tables) are spread over all workers
+    shares = [list(enumerate(tasks))[offset::workers] for offset in range(workers)]
+    
+    results = [None] * len(tasks)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for share_results in executor.map(lambda share: _mysql_task_worker(connection_params, database, share), shares):
+            for index, result in share_results:
+                results[index] = result
+    return results
+
+# Extraction report keys in display order; everything but constraints and relationships counts a ddl_scripts list
+_REPORT_KEYS = ("tables", "views", "procedures", "functions", "triggers", "indexes", "constraints", "relationships", "sequences", "partition_schemes", "grants", "computed_columns", "advanced_constraints", "security_policies", "data_samples")
+
+def _extraction_report(ddl_scripts, constraints=(), relationships=()):
+    """Object counts per report key"""
+    sources = {"constraints": constraints, "relationships": relationships, "data_samples": ddl_scripts["data_sampling"]}
+    return {key: len(sources[key] if key in sources else ddl_scripts[key]) for key in _REPORT_KEYS}
+
+def _no_progress(phase: str, percent: int):
+    pass
+
+def extract_mysql_ddl(connection_info, exact_row_counts: bool = False, progress_cb=None):
+    """Extract comprehensive DDL from MySQL database"""
+    report_progress = progress_cb or _no_progress
+    connection = None
+    try:
+        connection_params = _mysql_connection_params(connection_info)
+        database = connection_params['database']
         
-        connection = mysql.connector.connect(**connection_params)
+        connection = _mysql_connect(connection_params)
         cursor = connection.cursor()
+        _start_mysql_snapshot(cursor)
         
         # Extract DDL scripts
         ddl_scripts = {
@@ -110,120 +649,102 @@ def extract_mysql_ddl(connection_info):
         }
         
         # Get tables DDL with enhanced information
+        report_progress("Generating DDL scripts", 30)
         cursor.execute("SHOW TABLES")
-        tables_result = cursor.fetchall()
-        tables = []
-        if tables_result:
-            for row in tables_result:
-                if row and len(row) > 0:
-                    tables.append(str(row[0]))
-        
-        for table in tables:
-            try:
-                # Get CREATE TABLE statement
-                cursor.execute(f"SHOW CREATE TABLE `{table}`")
-                create_result = cursor.fetchone()
-                if create_result and len(create_result) > 1 and create_result[1]:
-                    ddl_scripts["tables"].append({
-                        "name": str(table),
-                        "ddl": str(create_result[1]),
-                        "type": "TABLE"
-                    })
-            except Exception:
-                pass
+        tables = [str(name) for name, *_ in _iter_rows(cursor)]
         
         # Get views DDL with enhanced information
         cursor.execute("SHOW FULL TABLES WHERE Table_type = 'VIEW'")
-        views_result = cursor.fetchall()
-        views = []
-        if views_result:
-            for row in views_result:
-                if row and len(row) > 0:
-                    views.append(str(row[0]))
-        
-        for view in views:
-            try:
-                # Get CREATE VIEW statement
-                cursor.execute(f"SHOW CREATE VIEW `{view}`")
-                create_result = cursor.fetchone()
-                if create_result and len(create_result) > 1 and create_result[1]:
-                    ddl_scripts["views"].append({
-                        "name": str(view),
-                        "ddl": str(create_result[1]),
-                        "type": "VIEW"
-                    })
-            except Exception:
-                pass
+        views = [str(name) for name, *_ in _iter_rows(cursor)]
+        
+        # Per-object statements (CREATE statements, data profile, samples) are independent,
+        # so they run over a small set of worker connections instead of one serial cursor
+        sample_tables = tables[:5]  # Sample first 5 tables
+        
+        # InnoDB row estimates for all tables in one query, used when a profile can't count exactly for free
+        row_estimates = {}
+        if not exact_row_counts:
+            cursor.execute(_MYSQL_Q_ROW_ESTIMATES, (database,))
+            row_estimates = {str(name): int(rows or 0) for name, rows in _iter_rows(cursor)}
+        table_batches = [tables[i:i + MYSQL_SHOW_CREATE_BATCH] for i in range(0, len(tables), MYSQL_SHOW_CREATE_BATCH)]
+        view_batches = [views[i:i + MYSQL_SHOW_CREATE_BATCH] for i in range(0, len(views), MYSQL_SHOW_CREATE_BATCH)]
+        # Account, grant and statistics queries don't depend on each other either; queued first so
+        # they overlap with the per-table work instead of running back to back at the end
+        catalog_queries = [
+            (_MYSQL_Q_ACCOUNTS, None),
+            (_MYSQL_Q_GRANTS, None),
+            (_MYSQL_Q_TABLE_STATS, (database,)),
+            (_MYSQL_Q_INDEX_STATS, (database,))
+        ]
+        tasks = ([("query", query) for query in catalog_queries] +
+                 [("tables", batch) for batch in table_batches] +
+                 [("views", batch) for batch in view_batches] +
+                 [("profile", (table, None if exact_row_counts else row_estimates.get(table, 0))) for table in tables] +
+                 [("sample", table) for table in sample_tables])
+        task_results = _run_mysql_tasks(connection_params, database, tasks)
+        
+        account_rows, grant_rows, table_stat_rows, index_stat_rows = task_results[:len(catalog_queries)]
+        task_results = task_results[len(catalog_queries):]
+        batch_count = len(table_batches) + len(view_batches)
+        table_results = [result for batch in task_results[:len(table_batches)] for result in batch]
+        view_results = [result for batch in task_results[len(table_batches):batch_count] for result in batch]
+        profile_results = task_results[batch_count:batch_count + len(tables)]
+        sample_results = task_results[batch_count + len(tables):]
+        
+        ddl_scripts["tables"].extend(result for result in table_results if result)
+        ddl_scripts["views"].extend(result for result in view_results if result)
         
         # Get stored procedures with enhanced information
-        cursor.execute("""
-            SELECT routine_name, routine_definition, sql_data_access, 
-                   security_type, created, last_altered
-            FROM information_schema.routines
-            WHERE routine_schema = %s AND routine_type = 'PROCEDURE'
-        """, (database,))
-        procedures_result = cursor.fetchall()
-        
-        for row in procedures_result:
+        cursor.execute(_MYSQL_Q_PROCEDURES, (database,))
+        
+        # Rows have the fixed arity of the SELECT list, so unpack instead of guarding each index
+        for name, definition, data_access, security_type, created, last_altered in _iter_rows(cursor):
             ddl_scripts["procedures"].append({
-                "name": str(row[0]) if row and len(row) > 0 else "",
-                "ddl": str(row[1]) if row and len(row) > 1 and row[1] else "",
+                "name": str(name),
+                "ddl": str(definition) if definition else "",
                 "type": "PROCEDURE",
-                "sql_data_access": str(row[2]) if row and len(row) > 2 else "",
-                "security_type": str(row[3]) if row and len(row) > 3 else "",
-                "created": str(row[4]) if row and len(row) > 4 and row[4] else None,
-                "last_altered": str(row[5]) if row and len(row) > 5 and row[5] else None
+                "sql_data_access": str(data_access),
+                "security_type": str(security_type),
+                "created": str(created) if created else None,
+                "last_altered": str(last_altered) if last_altered else None
             })
         
         # Get functions with enhanced information
-        cursor.execute("""
-            SELECT routine_name, routine_definition, sql_data_access,
-                   security_type, created, last_altered, data_type
-            FROM information_schema.routines
-            WHERE routine_schema = %s AND routine_type = 'FUNCTION'
-        """, (database,))
-        functions_result = cursor.fetchall()
-        
-        for row in functions_result:
+        cursor.execute(_MYSQL_Q_FUNCTIONS, (database,))
+        
+        for name, definition, data_access, security_type, created, last_altered, return_type in _iter_rows(cursor):
             ddl_scripts["functions"].append({
-                "name": str(row[0]) if row and len(row) > 0 else "",
-                "ddl": str(row[1]) if row and len(row) > 1 and row[1] else "",
+                "name": str(name),
+                "ddl": str(definition) if definition else "",
                 "type": "FUNCTION",
-                "sql_data_access": str(row[2]) if row and len(row) > 2 else "",
-                "security_type": str(row[3]) if row and len(row) > 3 else "",
-                "created": str(row[4]) if row and len(row) > 4 and row[4] else None,
-                "last_altered": str(row[5]) if row and len(row) > 5 and row[5] else None,
-                "return_type": str(row[6]) if row and len(row) > 6 else ""
+                "sql_data_access": str(data_access),
+                "security_type": str(security_type),
+                "created": str(created) if created else None,
+                "last_altered": str(last_altered) if last_altered else None,
+                "return_type": str(return_type)
             })
         
         # Get triggers with complete DDL and dialect conversion capabilities
-        cursor.execute("""
-            SELECT trigger_name, event_manipulation, event_object_table, 
-                   action_statement, action_timing, definer, created,
-                   sql_mode, character_set_client, collation_connection
-            FROM information_schema.triggers
-            WHERE trigger_schema = %s
-        """, (database,))
-        triggers_result = cursor.fetchall()
-        
-        for row in triggers_result:
+        cursor.execute(_MYSQL_Q_TRIGGERS, (database,))
+        
+        for name, event, table_name, statement, timing, definer, created, sql_mode, _charset, _collation in _iter_rows(cursor):
             # Generate proper CREATE TRIGGER statement with target dialect conversion placeholder
-            trigger_ddl = f"DELIMITER $$\nCREATE TRIGGER `{str(row[0]) if row and len(row) > 0 else ''}` {str(row[4]) if row and len(row) > 4 else ''} {str(row[1]) if row and len(row) > 1 else ''} ON `{str(row[2]) if row and len(row) > 2 else ''}` FOR EACH ROW\n{str(row[3]) if row and len(row) > 3 else ''}$$\nDELIMITER ;"
+            trigger_ddl = f"DELIMITER $$\nCREATE TRIGGER {_qi(name)} {timing} {event} ON {_qi(table_name)} FOR EACH ROW\n{statement}$$\nDELIMITER ;"
             
             # Add target dialect conversion template
             target_ddl = f"-- TARGET DIALECT CONVERSION TEMPLATE --\n-- Convert the following MySQL trigger to target dialect --\n{trigger_ddl}"
             
             ddl_scripts["triggers"].append({
-                "name": str(row[0]) if row and len(row) > 0 else "",
+                "name": str(name),
                 "ddl": trigger_ddl,
                 "target_ddl_template": target_ddl,
                 "type": "TRIGGER",
-                "event": str(row[1]) if row and len(row) > 1 else "",
-                "table": str(row[2]) if row and len(row) > 2 else "",
-                "timing": str(row[4]) if row and len(row) > 4 else "",
-                "definer": str(row[5]) if row and len(row) > 5 else "",
-                "created": str(row[6]) if row and len(row) > 6 and row[6] else None,
-                "sql_mode": str(row[7]) if row and len(row) > 7 else ""
+                "event": str(event),
+                "table": str(table_name),
+                "timing": str(timing),
+                "definer": str(definer),
+                "created": str(created) if created else None,
+                "sql_mode": str(sql_mode)
             })
         
         # Get constraints with enhanced information
@@ -231,33 +752,22 @@ def extract_mysql_ddl(connection_info):
         relationships = []
         
         # Get primary keys with enhanced information
-        cursor.execute("""
-            SELECT kcu.table_name, kcu.column_name, kcu.constraint_name,
-                   tc.constraint_type
-            FROM information_schema.key_column_usage kcu
-            JOIN information_schema.table_constraints tc 
-              ON kcu.constraint_name = tc.constraint_name 
-              AND kcu.table_schema = tc.table_schema
-            WHERE kcu.table_schema = %s AND tc.constraint_type = 'PRIMARY KEY'
-            ORDER BY kcu.table_name, kcu.ordinal_position
-        """, (database,))
-        pk_result = cursor.fetchall()
-        
-        # Group primary keys by table
+        report_progress("Extracting constraints", 50)
+        cursor.execute(_MYSQL_Q_PRIMARY_KEYS, (database,))
+        
+        # Group primary keys by table; rows arrive ordered so each group is contiguous
         pk_dict = {}
-        for row in pk_result:
-            table_name = row[0]
-            if table_name not in pk_dict:
-                pk_dict[table_name] = {
-                    "table": table_name,
-                    "columns": [],
-                    "constraint_name": row[2],
-                    "constraint_type": row[3]
-                }
-            pk_dict[table_name]["columns"].append(row[1])
+        for table_name, rows in groupby(_iter_rows(cursor), key=itemgetter(0)):
+            rows = list(rows)
+            pk_dict[table_name] = {
+                "table": table_name,
+                "columns": [row[1] for row in rows],
+                "constraint_name": rows[0][2],
+                "constraint_type": rows[0][3]
+            }
         
         for table_name, pk_info in pk_dict.items():
-            constraint_ddl = f"ALTER TABLE `{table_name}` ADD CONSTRAINT `{pk_info['constraint_name']}` PRIMARY KEY ({', '.join([f'`{col}`' for col in pk_info['columns']])});"
+            constraint_ddl = _MYSQL_PK_TMPL.format(t=_qi(table_name), n=_qi(pk_info['constraint_name']), c=_mysql_column_list(pk_info['columns']))
             constraints.append({
                 "type": "PRIMARY KEY",
                 "table": table_name,
@@ -267,40 +777,28 @@ def extract_mysql_ddl(connection_info):
             })
         
         # Get foreign keys with cascade options
-        cursor.execute("""
-            SELECT kcu.table_name, kcu.column_name, kcu.constraint_name, 
-                   kcu.referenced_table_name, kcu.referenced_column_name,
-                   rc.update_rule, rc.delete_rule, rc.match_option
-            FROM information_schema.key_column_usage kcu
-            JOIN information_schema.referential_constraints rc 
-              ON kcu.constraint_name = rc.constraint_name 
-              AND kcu.table_schema = rc.constraint_schema
-            WHERE kcu.table_schema = %s AND kcu.referenced_table_name IS NOT NULL
-        """, (database,))
-        fk_result = cursor.fetchall()
+        cursor.execute(_MYSQL_Q_FOREIGN_KEYS, (database,))
         
         # Group foreign keys by constraint
         fk_dict = {}
-        for row in fk_result:
-            constraint_name = row[2]
-            if constraint_name not in fk_dict:
-                fk_dict[constraint_name] = {
-                    "table": row[0],
-                    "columns": [],
-                    "referenced_table": row[3],
-                    "referenced_columns": [],
-                    "name": constraint_name,
-                    "update_rule": row[5],
-                    "delete_rule": row[6],
-                    "match_option": row[7]
-                }
-            fk_dict[constraint_name]["columns"].append(row[1])
-            fk_dict[constraint_name]["referenced_columns"].append(row[4])
+        for (table_name, constraint_name), rows in groupby(_iter_rows(cursor), key=itemgetter(0, 2)):
+            rows = list(rows)
+            first = rows[0]
+            fk_dict[constraint_name] = {
+                "table": table_name,
+                "columns": [row[1] for row in rows],
+                "referenced_table": first[3],
+                "referenced_columns": [row[4] for row in rows],
+                "name": constraint_name,
+                "update_rule": first[5],
+                "delete_rule": first[6],
+                "match_option": first[7]
+            }
         
         for constraint_name, fk_info in fk_dict.items():
             # Generate FK DDL with cascade options
-            fk_columns = ', '.join([f'`{col}`' for col in fk_info["columns"]])
-            ref_columns = ', '.join([f'`{col}`' for col in fk_info["referenced_columns"]])
+            fk_columns = _mysql_column_list(fk_info["columns"])
+            ref_columns = _mysql_column_list(fk_info["referenced_columns"])
             cascade_options = []
             if fk_info["update_rule"] != "NO ACTION":
                 cascade_options.append(f"ON UPDATE {fk_info['update_rule']}")
@@ -308,7 +806,7 @@ def extract_mysql_ddl(connection_info):
                 cascade_options.append(f"ON DELETE {fk_info['delete_rule']}")
             
             cascade_str = " " + " ".join(cascade_options) if cascade_options else ""
-            constraint_ddl = f"ALTER TABLE `{fk_info['table']}` ADD CONSTRAINT `{fk_info['name']}` FOREIGN KEY ({fk_columns}) REFERENCES `{fk_info['referenced_table']}` ({ref_columns}){cascade_str};"
+            constraint_ddl = _MYSQL_FK_TMPL.format(t=_qi(fk_info['table']), n=_qi(fk_info['name']), c=fk_columns, rt=_qi(fk_info['referenced_table']), rc=ref_columns, cs=cascade_str)
             
             constraints.append({
                 "type": "FOREIGN KEY",
@@ -334,18 +832,10 @@ def extract_mysql_ddl(connection_info):
             })
         
         # Get check constraints
-        cursor.execute("""
-            SELECT tc.table_name, tc.constraint_name, cc.check_clause
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.check_constraints cc
-              ON tc.constraint_name = cc.constraint_name
-              AND tc.constraint_schema = cc.constraint_schema
-            WHERE tc.constraint_schema = %s AND tc.constraint_type = 'CHECK'
-        """, (database,))
-        check_result = cursor.fetchall()
-        
-        for row in check_result:
-            constraint_ddl = f"ALTER TABLE `{row[0]}` ADD CONSTRAINT `{row[1]}` CHECK ({row[2]});"
+        cursor.execute(_MYSQL_Q_CHECKS, (database,))
+        
+        for row in _iter_rows(cursor):
+            constraint_ddl = _MYSQL_CHECK_TMPL.format(t=_qi(row[0]), n=_qi(row[1]), e=row[2])
             constraints.append({
                 "type": "CHECK",
                 "table": row[0],
@@ -355,32 +845,19 @@ def extract_mysql_ddl(connection_info):
             })
         
         # Get unique constraints
-        cursor.execute("""
-            SELECT kcu.table_name, kcu.column_name, kcu.constraint_name
-            FROM information_schema.key_column_usage kcu
-            JOIN information_schema.table_constraints tc 
-              ON kcu.constraint_name = tc.constraint_name 
-              AND kcu.table_schema = tc.table_schema
-            WHERE kcu.table_schema = %s AND tc.constraint_type = 'UNIQUE'
-            ORDER BY kcu.table_name, kcu.ordinal_position
-        """, (database,))
-        unique_result = cursor.fetchall()
-        
-        # Group unique constraints by constraint name
+        cursor.execute(_MYSQL_Q_UNIQUES, (database,))
+        
+        # Group unique constraints by table and constraint name (names are only unique per table)
         unique_dict = {}
-        for row in unique_result:
-            constraint_name = row[2]
-            if constraint_name not in unique_dict:
-                unique_dict[constraint_name] = {
-                    "table": row[0],
-                    "columns": [],
-                    "name": constraint_name
-                }
-            unique_dict[constraint_name]["columns"].append(row[1])
-        
-        for constraint_name, unique_info in unique_dict.items():
-            columns_str = ', '.join([f'`{col}`' for col in unique_info["columns"]])
-            constraint_ddl = f"ALTER TABLE `{unique_info['table']}` ADD CONSTRAINT `{unique_info['name']}` UNIQUE ({columns_str});"
+        for (table_name, constraint_name), rows in groupby(_iter_rows(cursor), key=itemgetter(0, 2)):
+            unique_dict[(table_name, constraint_name)] = {
+                "table": table_name,
+                "columns": [row[1] for row in rows],
+                "name": constraint_name
+            }
+        
+        for unique_info in unique_dict.values():
+            constraint_ddl = _MYSQL_UNIQUE_TMPL.format(t=_qi(unique_info['table']), n=_qi(unique_info['name']), c=_mysql_column_list(unique_info["columns"]))
             constraints.append({
                 "type": "UNIQUE",
                 "table": unique_info["table"],
@@ -390,41 +867,31 @@ def extract_mysql_ddl(connection_info):
             })
         
         # Get indexes with enhanced information
-        cursor.execute("""
-            SELECT table_name, index_name, column_name, non_unique, 
-                   seq_in_index, collation, cardinality, sub_part,
-                   packed, nullable, index_type, comment
-            FROM information_schema.statistics
-            WHERE table_schema = %s
-            ORDER BY table_name, index_name, seq_in_index
-        """, (database,))
-        indexes_result = cursor.fetchall()
+        cursor.execute(_MYSQL_Q_INDEXES, (database,))
         
         # Group indexes by name
         index_dict = {}
-        for row in indexes_result:
-            key = f"{row[0]}.{row[1]}"
-            if key not in index_dict:
-                index_dict[key] = {
-                    "table": row[0],
-                    "name": row[1],
-                    "unique": row[3] == 0,
-                    "columns": [],
-                    "collation": row[5],
-                    "cardinality": row[6],
-                    "sub_part": row[7],
-                    "packed": row[8],
-                    "nullable": row[9],
-                    "index_type": row[10],
-                    "comment": row[11]
-                }
-            index_dict[key]["columns"].append(row[2])
+        for (table_name, index_name), rows in groupby(_iter_rows(cursor), key=itemgetter(0, 1)):
+            rows = list(rows)
+            first = rows[0]
+            index_dict[f"{table_name}.{index_name}"] = {
+                "table": table_name,
+                "name": index_name,
+                "unique": first[3] == 0,
+                "columns": [row[2] for row in rows],
+                "collation": first[5],
+                "cardinality": first[6],
+                "sub_part": first[7],
+                "packed": first[8],
+                "nullable": first[9],
+                "index_type": first[10],
+                "comment": first[11]
+            }
         
         indexes = list(index_dict.values())
         for idx in indexes:
-            columns_str = ', '.join([f'`{col}`' for col in idx["columns"]])
             unique_str = "UNIQUE " if idx["unique"] else ""
-            index_ddl = f"CREATE {unique_str}INDEX `{idx['name']}` ON `{idx['table']}` ({columns_str});"
+            index_ddl = _MYSQL_INDEX_TMPL.format(u=unique_str, n=_qi(idx['name']), t=_qi(idx['table']), c=_mysql_column_list(idx["columns"]))
             ddl_scripts["indexes"].append({
                 "table": idx["table"],
                 "name": idx["name"],
@@ -438,16 +905,11 @@ def extract_mysql_ddl(connection_info):
             })
         
         # Get sequences (auto-increment info) with ALTER SEQUENCE statements
-        cursor.execute("""
-            SELECT table_name, column_name, extra, column_default
-            FROM information_schema.columns
-            WHERE table_schema = %s AND extra LIKE '%auto_increment%'
-        """, (database,))
-        sequences_result = cursor.fetchall()
-        
-        for row in sequences_result:
+        cursor.execute(_MYSQL_Q_SEQUENCES, (database,))
+        
+        for row in _iter_rows(cursor):
             # For MySQL, we create ALTER TABLE statements to set auto_increment
-            sequence_ddl = f"ALTER TABLE `{row[0]}` MODIFY `{row[1]}` {row[1]} AUTO_INCREMENT;"
+            sequence_ddl = f"ALTER TABLE {_qi(row[0])} MODIFY {_qi(row[1])} {row[1]} AUTO_INCREMENT;"
             
             # Add CREATE SEQUENCE template for target dialects that support it
             create_sequence_template = f"CREATE SEQUENCE {row[0]}_{row[1]}_seq START WITH 1 INCREMENT BY 1;"
@@ -465,16 +927,10 @@ def extract_mysql_ddl(connection_info):
         
         # Get partition information
         try:
-            cursor.execute("""
-                SELECT table_name, partition_name, partition_method, 
-                       partition_expression, partition_description
-                FROM information_schema.partitions
-                WHERE table_schema = %s AND partition_name IS NOT NULL
-            """, (database,))
-            partitions_result = cursor.fetchall()
+            cursor.execute(_MYSQL_Q_PARTITIONS, (database,))
             
             partition_dict = {}
-            for row in partitions_result:
+            for row in _iter_rows(cursor):
                 table_name = row[0]
                 if table_name not in partition_dict:
                     partition_dict[table_name] = {
@@ -505,15 +961,8 @@ def extract_mysql_ddl(connection_info):
         # Get jobs/schedulers (MySQL events)
         jobs = []
         try:
-            cursor.execute("""
-                SELECT event_name, event_definition, event_type, 
-                       execute_at, interval_value, interval_field,
-                       starts, ends, status, definer
-                FROM information_schema.events
-                WHERE event_schema = %s
-            """, (database,))
-            events_result = cursor.fetchall()
-            for row in events_result:
+            cursor.execute(_MYSQL_Q_EVENTS, (database,))
+            for row in _iter_rows(cursor):
                 jobs.append({
                     "name": row[0],
                     "definition": row[1],
@@ -530,101 +979,31 @@ def extract_mysql_ddl(connection_info):
             pass
         
         # Get data profile baseline
-        data_profile = {}
-        for table in tables:
-            try:
-                # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
-                count_result = cursor.fetchone()
-                row_count = count_result[0] if count_result else 0
-                
-                # Get column info for null stats
-                cursor.execute(f"""
-                    SELECT column_name, data_type, is_nullable
-                    FROM information_schema.columns 
-                    WHERE table_schema = %s AND table_name = %s
-                """, (database, table))
-                columns_result = cursor.fetchall()
-                
-                column_stats = []
-                for col_row in columns_result:
-                    column_name = col_row[0]
-                    try:
-                        # Get null count
-                        cursor.execute(f"SELECT COUNT(*) FROM `{table}` WHERE `{column_name}` IS NULL")
-                        null_result = cursor.fetchone()
-                        null_count = null_result[0] if null_result else 0
-                        
-                        # Get distinct count
-                        cursor.execute(f"SELECT COUNT(DISTINCT `{column_name}`) FROM `{table}`")
-                        distinct_result = cursor.fetchone()
-                        distinct_count = distinct_result[0] if distinct_result else 0
-                        
-                        column_stats.append({
-                            "name": column_name,
-                            "data_type": col_row[1],
-                            "nullable": col_row[2] == "YES",
-                            "null_count": null_count,
-                            "distinct_count": distinct_count,
-                            "null_ratio": null_count / row_count if row_count > 0 else 0
-                        })
-                    except Exception:
-                        column_stats.append({
-                            "name": column_name,
-                            "data_type": col_row[1],
-                            "nullable": col_row[2] == "YES",
-                            "null_count": 0,
-                            "distinct_count": 0,
-                            "null_ratio": 0
-                        })
-                
-                data_profile[table] = {
-                    "row_count": row_count,
-                    "columns": column_stats
-                }
-            except Exception:
-                data_profile[table] = {
-                    "row_count": 0,
-                    "columns": []
-                }
+        data_profile = dict(zip(tables, profile_results))
         
         # Get computed/generated columns
         try:
-            cursor.execute("""
-                SELECT table_name, column_name, generation_expression, column_default
-                FROM information_schema.columns
-                WHERE table_schema = %s AND extra LIKE '%%GENERATED%%'
-            """, (database,))
-            computed_result = cursor.fetchall()
+            cursor.execute(_MYSQL_Q_COMPUTED, (database,))
             
-            for row in computed_result:
-                if row and len(row) >= 4:
-                    computed_ddl = f"ALTER TABLE `{row[0]}` ADD COLUMN `{row[1]}` GENERATED ALWAYS AS ({row[2]});"
-                    ddl_scripts["computed_columns"].append({
-                        "table": str(row[0]) if row[0] else "",
-                        "column": str(row[1]) if row[1] else "",
-                        "expression": str(row[2]) if row[2] else "",
-                        "ddl": computed_ddl,
-                        "default_value": str(row[3]) if row[3] else ""
-                    })
+            for table_name, column_name, expression, default_value in _iter_rows(cursor):
+                computed_ddl = f"ALTER TABLE {_qi(table_name)} ADD COLUMN {_qi(column_name)} GENERATED ALWAYS AS ({expression});"
+                ddl_scripts["computed_columns"].append({
+                    "table": str(table_name) if table_name else "",
+                    "column": str(column_name) if column_name else "",
+                    "expression": str(expression) if expression else "",
+                    "ddl": computed_ddl,
+                    "default_value": str(default_value) if default_value else ""
+                })
         except Exception as e:
             # Handle older MySQL versions that don't have is_generated column
             print(f"Warning: Could not extract computed columns: {str(e)}")
             pass
         
         # Get advanced constraints (named check constraints with more details)
-        cursor.execute("""
-            SELECT tc.table_name, tc.constraint_name, cc.check_clause, tc.enforced
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.check_constraints cc
-              ON tc.constraint_name = cc.constraint_name
-              AND tc.constraint_schema = cc.constraint_schema
-            WHERE tc.constraint_schema = %s AND tc.constraint_type = 'CHECK'
-        """, (database,))
-        check_result = cursor.fetchall()
-        
-        for row in check_result:
-            constraint_ddl = f"ALTER TABLE `{row[0]}` ADD CONSTRAINT `{row[1]}` CHECK ({row[2]});"
+        cursor.execute(_MYSQL_Q_ADVANCED_CHECKS, (database,))
+        
+        for row in _iter_rows(cursor):
+            constraint_ddl = _MYSQL_CHECK_TMPL.format(t=_qi(row[0]), n=_qi(row[1]), e=row[2])
             ddl_scripts["advanced_constraints"].append({
                 "type": "CHECK",
                 "table": row[0],
@@ -636,14 +1015,9 @@ def extract_mysql_ddl(connection_info):
         
         # Get security policies and row-level security (MySQL doesn't have RLS, but we'll include for completeness)
         try:
-            cursor.execute("""
-                SELECT user, host, account_locked, password_expired
-                FROM mysql.user
-                WHERE user != 'mysql.session' AND user != 'mysql.sys' AND user != 'mysql.infoschema'
-            """)
-            security_result = cursor.fetchall()
+            cursor.execute(_MYSQL_Q_USERS)
             
-            for row in security_result:
+            for row in _iter_rows(cursor):
                 security_ddl = f"CREATE USER '{row[0]}'@'{row[1]}';"
                 ddl_scripts["security_policies"].append({
                     "user": row[0],
@@ -656,189 +1030,88 @@ def extract_mysql_ddl(connection_info):
             pass
         
         # Get data sampling for testing
-        for table in tables[:5]:  # Sample first 5 tables
-            try:
-                cursor.execute(f"SELECT * FROM `{table}` LIMIT 10")
-                sample_data = cursor.fetchall()
-                
-                # Get column names
-                cursor.execute(f"DESCRIBE `{table}`")
-                columns_result = cursor.fetchall()
-                column_names = [col[0] for col in columns_result]
-                
-                ddl_scripts["data_sampling"].append({
-                    "table": table,
-                    "sample_rows": len(sample_data),
-                    "columns": column_names,
-                    "sample_data": sample_data
-                })
-            except Exception:
-                pass
+        ddl_scripts["data_sampling"].extend(result for result in sample_results if result)
         
         # Enhanced dependency graph with proper ordering and validation scripts
+        report_progress("Building dependency graph", 70)
+        integrity_script = _MYSQL_INTEGRITY_TMPL.format
         dependency_graph = {
-            "creation_order": ["types", "domains", "tables", "constraints", "indexes", "computed_columns", "views", "materialized_views", "triggers", "procedures", "functions", "roles", "grants", "security_policies"],
-            "deletion_order": ["security_policies", "grants", "roles", "functions", "procedures", "triggers", "materialized_views", "views", "computed_columns", "indexes", "constraints", "tables", "domains", "types"],
-            "dependencies": {},
+            "creation_order": _MYSQL_CREATION_ORDER,
+            "deletion_order": _MYSQL_DELETION_ORDER,
+            # Keyed by table up front so the foreign key pass below only fills in edges
+            "dependencies": {table: {"depends_on": [], "referenced_by": []} for table in tables},
             "validation_scripts": {
-                "pre_migration": [],
+                "pre_migration": [{
+                    "name": "check_table_counts",
+                    "description": "Verify table counts before migration",
+                    "script": f"SELECT table_name, table_rows FROM information_schema.tables WHERE table_schema = '{database}';"
+                }],
                 "post_migration": [],
-                "data_integrity": []
+                "data_integrity": [{
+                    "name": f"check_{table}_integrity",
+                    "description": f"Check data integrity for {table}",
+                    "script": integrity_script(quoted)
+                } for table, quoted in zip(tables, map(_qi, tables))]
             }
         }
         
-        # Add dependencies for each table
-        for table in tables:
-            dependency_graph["dependencies"][table] = {
-                "depends_on": [],
-                "referenced_by": []
-            }
-        
-        # Populate dependencies based on foreign keys
-        for fk in relationships:
-            source_table = fk["source_table"]
-            target_table = fk["target_table"]
-            if source_table in dependency_graph["dependencies"]:
-                dependency_graph["dependencies"][source_table]["depends_on"].append(target_table)
-            if target_table in dependency_graph["dependencies"]:
-                dependency_graph["dependencies"][target_table]["referenced_by"].append(source_table)
-        
-        # Add validation scripts
-        # Pre-migration validation
-        dependency_graph["validation_scripts"]["pre_migration"].append({
-            "name": "check_table_counts",
-            "description": "Verify table counts before migration",
-            "script": f"SELECT table_name, table_rows FROM information_schema.tables WHERE table_schema = '{database}';"
-        })
-        
-        # Data integrity check scripts
-        for table in tables:
-            dependency_graph["validation_scripts"]["data_integrity"].append({
-                "name": f"check_{table}_integrity",
-                "description": f"Check data integrity for {table}",
-                "script": f"SELECT COUNT(*) as row_count FROM `{table}`;"
-            })
+        # Populate dependencies from foreign keys aggregated server-side
+        dependencies = dependency_graph["dependencies"]
+        # The default 1024 byte limit would silently truncate the lists of heavily referenced tables
+        cursor.execute("SET SESSION group_concat_max_len = 1048576")
+        for query, edge in ((_MYSQL_Q_DEPENDS_ON, "depends_on"), (_MYSQL_Q_REFERENCED_BY, "referenced_by")):
+            cursor.execute(query, (database,))
+            for table_name, related in _iter_rows(cursor):
+                if isinstance(related, (bytes, bytearray)):
+                    related = related.decode()
+                if table_name in dependencies and related:
+                    dependencies[table_name][edge] = related.split("\0")
         
         # Data type conversion map
-        type_mappings = {
-            "tinyint": "SMALLINT",
-            "smallint": "SMALLINT",
-            "mediumint": "INTEGER",
-            "int": "INTEGER",
-            "bigint": "BIGINT",
-            "float": "FLOAT",
-            "double": "DOUBLE PRECISION",
-            "decimal": "DECIMAL",
-            "date": "DATE",
-            "datetime": "TIMESTAMP",
-            "timestamp": "TIMESTAMP",
-            "time": "TIME",
-            "year": "SMALLINT",
-            "char": "CHAR",
-            "varchar": "VARCHAR",
-            "text": "TEXT",
-            "mediumtext": "TEXT",
-            "longtext": "TEXT",
-            "binary": "BYTEA",
-            "varbinary": "BYTEA",
-            "blob": "BYTEA",
-            "mediumblob": "BYTEA",
-            "longblob": "BYTEA"
-        }
+        report_progress("Preparing type mappings", 85)
         
         # Security and roles with GRANT statements
         security = []
-        try:
-            cursor.execute("SELECT user, host FROM mysql.user")
-            users_result = cursor.fetchall()
-            for row in users_result:
-                security.append({
-                    "user": row[0],
-                    "host": row[1],
-                    "type": "USER"
-                })
-        except Exception:
-            pass
+        for row in account_rows:
+            security.append({
+                "user": row[0],
+                "host": row[1],
+                "type": "USER"
+            })
         
         # Get grants for current database
-        try:
-            cursor.execute(f"SHOW GRANTS FOR CURRENT_USER()")
-            grants_result = cursor.fetchall()
-            for row in grants_result:
-                ddl_scripts["grants"].append({
-                    "grantee": "CURRENT_USER",
-                    "privilege": row[0],
-                    "type": "GRANT"
-                })
-        except Exception:
-            pass
+        for row in grant_rows:
+            ddl_scripts["grants"].append({
+                "grantee": "CURRENT_USER",
+                "privilege": row[0],
+                "type": "GRANT"
+            })
         
         # Performance and configuration
         performance = {
-            "table_stats": [],
-            "index_stats": []
+            # Table statistics
+            "table_stats": [{
+                "table": table_name,
+                "rows": table_rows,
+                "avg_row_length": avg_row_length,
+                "data_length": data_length,
+                "index_length": index_length,
+                "create_time": str(create_time) if create_time else None,
+                "update_time": str(update_time) if update_time else None
+            } for table_name, table_rows, avg_row_length, data_length, index_length, create_time, update_time in table_stat_rows],
+            # Index statistics
+            "index_stats": [{
+                "table": table_name,
+                "index": index_name,
+                "cardinality": cardinality
+            } for table_name, index_name, cardinality in index_stat_rows]
         }
         
-        # Get table statistics
-        try:
-            cursor.execute("""
-                SELECT table_name, table_rows, avg_row_length, 
-                       data_length, index_length, create_time, update_time
-                FROM information_schema.tables 
-                WHERE table_schema = %s
-            """, (database,))
-            table_stats_result = cursor.fetchall()
-            for row in table_stats_result:
-                performance["table_stats"].append({
-                    "table": row[0],
-                    "rows": row[1],
-                    "avg_row_length": row[2],
-                    "data_length": row[3],
-                    "index_length": row[4],
-                    "create_time": str(row[5]) if row[5] else None,
-                    "update_time": str(row[6]) if row[6] else None
-                })
-        except Exception:
-            pass
-        
-        # Get index statistics
-        try:
-            cursor.execute("""
-                SELECT table_name, index_name, cardinality
-                FROM information_schema.statistics
-                WHERE table_schema = %s
-                GROUP BY table_name, index_name, cardinality
-            """, (database,))
-            index_stats_result = cursor.fetchall()
-            for row in index_stats_result:
-                performance["index_stats"].append({
-                    "table": row[0],
-                    "index": row[1],
-                    "cardinality": row[2]
-                })
-        except Exception:
-            pass
-        
-        connection.close()
+        # Read-only transaction, commit just releases the snapshot
+        connection.commit()
         
         # Enhanced extraction report
-        extraction_report = {
-            "tables": len(ddl_scripts["tables"]),
-            "views": len(ddl_scripts["views"]),
-            "procedures": len(ddl_scripts["procedures"]),
-            "functions": len(ddl_scripts["functions"]),
-            "triggers": len(ddl_scripts["triggers"]),
-            "indexes": len(ddl_scripts["indexes"]),
-            "constraints": len(constraints),
-            "relationships": len(relationships),
-            "sequences": len(ddl_scripts["sequences"]),
-            "partition_schemes": len(ddl_scripts["partition_schemes"]),
-            "grants": len(ddl_scripts["grants"]),
-            "computed_columns": len(ddl_scripts["computed_columns"]),
-            "advanced_constraints": len(ddl_scripts["advanced_constraints"]),
-            "security_policies": len(ddl_scripts["security_policies"]),
-            "data_samples": len(ddl_scripts["data_sampling"])
-        }
+        extraction_report = _extraction_report(ddl_scripts, constraints, relationships)
         
         return {
             "ddl_scripts": ddl_scripts,
@@ -849,16 +1122,71 @@ def extract_mysql_ddl(connection_info):
             "jobs": jobs,
             "data_profile": data_profile,
             "dependency_graph": dependency_graph,
-            "type_mappings": type_mappings,
+            # Plain dict copy: the shared constant is read-only and orjson only encodes real dicts
+            "type_mappings": dict(_MYSQL_TO_PG_TYPES),
             "security": security,
             "performance": performance,
             "extraction_report": extraction_report
         }
     except Exception as e:
         raise Exception(f"MySQL DDL extraction failed: {str(e)}")
+    finally:
+        # Hand the (pooled) connection back on every path, not just success
+        if connection is not None:
+            connection.close()
+
+# Every catalog listing in one round trip: one (kind, JSON array of row arrays) row per listing,
+# with rows in the same column order the per-kind loops unpack
+_PG_Q_CATALOG = """
+    SELECT 'tables', (
+        SELECT json_agg(json_build_array(schemaname, tablename, tableowner, hasindexes, hasrules, hastriggers)
+                        ORDER BY schemaname, tablename)
+        FROM pg_tables
+        WHERE schemaname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+    )::text
+    UNION ALL
+    SELECT 'views', (
+        SELECT json_agg(json_build_array(schemaname, viewname, definition) ORDER BY schemaname, viewname)
+        FROM pg_views
+        WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
+    )::text
+    UNION ALL
+    SELECT 'functions', (
+        SELECT json_agg(json_build_array(n.nspname, p.proname, pg_get_function_result(p.oid),
+                                         pg_get_functiondef(p.oid), l.lanname))
+        FROM pg_proc p
+        JOIN pg_namespace n ON p.pronamespace = n.oid
+        JOIN pg_language l ON p.prolang = l.oid
+        WHERE n.nspname NOT IN ('information_schema', 'pg_catalog')
+        AND pg_get_function_result(p.oid) IS NOT NULL
+    )::text
+    UNION ALL
+    SELECT 'sequences', (
+        SELECT json_agg(json_build_array(schemaname, sequencename) ORDER BY schemaname, sequencename)
+        FROM pg_sequences
+        WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
+    )::text
+    UNION ALL
+    SELECT 'indexes', (
+        SELECT json_agg(json_build_array(schemaname, tablename, indexname, indexdef)
+                        ORDER BY schemaname, tablename, indexname)
+        FROM pg_indexes
+        WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
+    )::text
+"""
+
+def _pg_fetch_catalog(connection):
+    """Rows of every catalog listing keyed by kind, fetched in a single query"""
+    with connection.cursor() as cursor:
+        cursor.execute(_PG_Q_CATALOG)
+        # Cast to text server-side so orjson parses the arrays instead of psycopg2's json adapter;
+        # json_agg over no rows is NULL
+        return {kind: orjson.loads(rows) if rows else [] for kind, rows in cursor.fetchall()}
 
-def extract_postgresql_ddl(connection_info):
+def extract_postgresql_ddl(connection_info, progress_cb=None):
     """Extract comprehensive DDL from PostgreSQL database"""
+    report_progress = progress_cb or _no_progress
+    connection = None
     try:
         import psycopg2
         
@@ -880,7 +1208,6 @@ def extract_postgresql_ddl(connection_info):
         }
         
         connection = psycopg2.connect(**connection_params)
-        cursor = connection.cursor()
         
         # Extract DDL scripts
         ddl_scripts = {
@@ -905,157 +1232,85 @@ def extract_postgresql_ddl(connection_info):
             "data_sampling": []
         }
         
+        report_progress("Generating DDL scripts", 30)
+        catalog = _pg_fetch_catalog(connection)
+        
         # Get tables DDL
-        cursor.execute("""
-            SELECT
-                schemaname,
-                tablename,
-                tableowner,
-                hasindexes,
-                hasrules,
-                hastriggers
-            FROM pg_tables
-            WHERE schemaname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
-            ORDER BY schemaname, tablename
-        """)
-        tables_result = cursor.fetchall()
+        tables_result = catalog["tables"]
         tables = []
-        if tables_result:
-            for row in tables_result:
-                if row and len(row) > 1:
-                    schema_name = str(row[0])
-                    table_name = str(row[1])
-                    tables.append((schema_name, table_name))
-                    
-                    # Generate CREATE TABLE DDL
-                    table_ddl = f"CREATE TABLE \"{schema_name}\".\"{table_name}\" ();"
-                    ddl_scripts["tables"].append({
-                        "name": table_name,
-                        "schema": schema_name,
-                        "ddl": table_ddl,
-                        "type": "TABLE"
-                    })
+        # Catalog rows have the fixed arity of their SELECT list, so unpack instead of guarding each index
+        for schema_name, table_name, _owner, _has_indexes, _has_rules, _has_triggers in tables_result:
+            schema_name = str(schema_name)
+            table_name = str(table_name)
+            tables.append((schema_name, table_name))
+            
+            # Generate CREATE TABLE DDL
+            table_ddl = f"CREATE TABLE \"{schema_name}\".\"{table_name}\" ();"
+            ddl_scripts["tables"].append({
+                "name": table_name,
+                "schema": schema_name,
+                "ddl": table_ddl,
+                "type": "TABLE"
+            })
         
         # Get views DDL
-        cursor.execute("""
-            SELECT
-                schemaname,
-                viewname,
-                definition
-            FROM pg_views
-            WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-            ORDER BY schemaname, viewname
-        """)
-        views_result = cursor.fetchall()
+        views_result = catalog["views"]
         views = []
-        if views_result:
-            for row in views_result:
-                if row and len(row) > 2:
-                    schema_name = str(row[0])
-                    view_name = str(row[1])
-                    view_def = str(row[2])
-                    views.append((schema_name, view_name))
-                    
-                    view_ddl = f"CREATE OR REPLACE VIEW \"{schema_name}\".\"{view_name}\" AS {view_def};"
-                    ddl_scripts["views"].append({
-                        "name": view_name,
-                        "schema": schema_name,
-                        "ddl": view_ddl,
-                        "type": "VIEW"
-                    })
+        for schema_name, view_name, view_def in views_result:
+            schema_name = str(schema_name)
+            view_name = str(view_name)
+            views.append((schema_name, view_name))
+            
+            view_ddl = f"CREATE OR REPLACE VIEW \"{schema_name}\".\"{view_name}\" AS {view_def};"
+            ddl_scripts["views"].append({
+                "name": view_name,
+                "schema": schema_name,
+                "ddl": view_ddl,
+                "type": "VIEW"
+            })
         
         # Get functions
-        cursor.execute("""
-            SELECT
-                n.nspname as schema,
-                p.proname as name,
-                pg_get_function_result(p.oid) as return_type,
-                pg_get_functiondef(p.oid) as definition,
-                l.lanname as language
-            FROM pg_proc p
-            JOIN pg_namespace n ON p.pronamespace = n.oid
-            JOIN pg_language l ON p.prolang = l.oid
-            WHERE n.nspname NOT IN ('information_schema', 'pg_catalog')
-            AND pg_get_function_result(p.oid) IS NOT NULL
-        """)
-        functions_result = cursor.fetchall()
-        
-        for row in functions_result:
-            if row and len(row) > 4:
-                ddl_scripts["functions"].append({
-                    "name": str(row[1]) if row[1] else "",
-                    "schema": str(row[0]) if row[0] else "",
-                    "ddl": str(row[3]) if row[3] else "",
-                    "type": "FUNCTION",
-                    "return_type": str(row[2]) if row[2] else "",
-                    "language": str(row[4]) if row[4] else ""
-                })
+        report_progress("Extracting functions and sequences", 50)
+        functions_result = catalog["functions"]
+        
+        for schema_name, name, return_type, definition, language in functions_result:
+            ddl_scripts["functions"].append({
+                "name": str(name) if name else "",
+                "schema": str(schema_name) if schema_name else "",
+                "ddl": str(definition) if definition else "",
+                "type": "FUNCTION",
+                "return_type": str(return_type) if return_type else "",
+                "language": str(language) if language else ""
+            })
         
         # Get sequences
-        cursor.execute("""
-            SELECT
-                schemaname,
-                sequencename
-            FROM pg_sequences
-            WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-            ORDER BY schemaname, sequencename
-        """)
-        sequences_result = cursor.fetchall()
-        
-        for row in sequences_result:
-            if row and len(row) > 1:
-                sequence_ddl = f"CREATE SEQUENCE \"{str(row[0])}\".\"{str(row[1])}\";"
-                ddl_scripts["sequences"].append({
-                    "name": str(row[1]) if row[1] else "",
-                    "schema": str(row[0]) if row[0] else "",
-                    "ddl": sequence_ddl,
-                    "type": "SEQUENCE"
-                })
+        sequences_result = catalog["sequences"]
+        
+        for schema_name, sequence_name in sequences_result:
+            sequence_ddl = f"CREATE SEQUENCE \"{schema_name}\".\"{sequence_name}\";"
+            ddl_scripts["sequences"].append({
+                "name": str(sequence_name) if sequence_name else "",
+                "schema": str(schema_name) if schema_name else "",
+                "ddl": sequence_ddl,
+                "type": "SEQUENCE"
+            })
         
         # Get indexes
-        cursor.execute("""
-            SELECT
-                schemaname,
-                tablename,
-                indexname,
-                indexdef
-            FROM pg_indexes
-            WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-            ORDER BY schemaname, tablename, indexname
-        """)
-        indexes_result = cursor.fetchall()
-        
-        for row in indexes_result:
-            if row and len(row) > 3:
-                ddl_scripts["indexes"].append({
-                    "schema": str(row[0]) if row[0] else "",
-                    "table": str(row[1]) if row[1] else "",
-                    "name": str(row[2]) if row[2] else "",
-                    "ddl": str(row[3]) if row[3] else "",
-                    "unique": "UNIQUE" in str(row[3]),
-                    "index_type": "BTREE"
-                })
+        report_progress("Extracting indexes", 70)
+        indexes_result = catalog["indexes"]
         
-        connection.close()
+        for schema_name, table_name, index_name, index_def in indexes_result:
+            ddl_scripts["indexes"].append({
+                "schema": str(schema_name) if schema_name else "",
+                "table": str(table_name) if table_name else "",
+                "name": str(index_name) if index_name else "",
+                "ddl": str(index_def) if index_def else "",
+                "unique": "UNIQUE" in str(index_def),
+                "index_type": "BTREE"
+            })
         
         # Create basic extraction report
-        extraction_report = {
-            "tables": len(ddl_scripts["tables"]),
-            "views": len(ddl_scripts["views"]),
-            "procedures": 0,
-            "functions": len(ddl_scripts["functions"]),
-            "triggers": 0,
-            "indexes": len(ddl_scripts["indexes"]),
-            "constraints": 0,
-            "relationships": 0,
-            "sequences": len(ddl_scripts["sequences"]),
-            "partition_schemes": 0,
-            "grants": 0,
-            "computed_columns": 0,
-            "advanced_constraints": 0,
-            "security_policies": 0,
-            "data_samples": 0
-        }
+        extraction_report = _extraction_report(ddl_scripts)
         
         return {
             "ddl_scripts": ddl_scripts,
@@ -1080,203 +1335,341 @@ def extract_postgresql_ddl(connection_info):
         }
     except Exception as e:
         raise Exception(f"PostgreSQL DDL extraction failed: {str(e)}")
+    finally:
+        if connection is not None:
+            connection.close()
 
-def extract_database_ddl(connection_info):
+# Bundle returned for database types without an extractor; copied per call so callers can fill it in
+_UNSUPPORTED_BUNDLE_TEMPLATE = {
+    "ddl_scripts": {
+        "tables": [],
+        "views": [],
+        "indexes": [],
+        "constraints": [],
+        "sequences": [],
+        "triggers": [],
+        "procedures": [],
+        "functions": [],
+        "materialized_views": [],
+        "types": [],
+        "domains": [],
+        "roles": [],
+        "grants": [],
+        "partition_schemes": [],
+        "storage_configs": []
+    },
+    "constraints": [],
+    "relationships": [],
+    "indexes": [],
+    "synonyms": [],
+    "jobs": [],
+    "data_profile": {},
+    "dependency_graph": {
+        "creation_order": [],
+        "deletion_order": [],
+        "dependencies": {}
+    },
+    "type_mappings": {},
+    "security": [],
+    "performance": {
+        "table_stats": [],
+        "index_stats": []
+    },
+    "extraction_report": {
+        "tables": 0,
+        "views": 0,
+        "procedures": 0,
+        "functions": 0,
+        "triggers": 0,
+        "indexes": 0,
+        "constraints": 0,
+        "relationships": 0,
+        "sequences": 0,
+        "partition_schemes": 0,
+        "grants": 0
+    }
+}
+
+_EXTRACTORS = {
+    "MySQL": extract_mysql_ddl,
+    "PostgreSQL": lambda connection_info, exact_row_counts, progress_cb: extract_postgresql_ddl(connection_info, progress_cb=progress_cb)
+}
+
+def extract_database_ddl(connection_info, exact_row_counts: bool = False, progress_cb=None):
     """Extract database DDL based on database type - FIXED VERSION"""
     db_type = connection_info.get("dbType", "Unknown")
     
-    if db_type == "MySQL":
-        return extract_mysql_ddl(connection_info)
-    elif db_type == "PostgreSQL":
-        return extract_postgresql_ddl(connection_info)
-    else:
-        # For other database types, return helpful error
-        return {
-            "ddl_scripts": {
-                "tables": [],
-                "views": [],
-                "indexes": [],
-                "constraints": [],
-                "sequences": [],
-                "triggers": [],
-                "procedures": [],
-                "functions": [],
-                "materialized_views": [],
-                "types": [],
-                "domains": [],
-                "roles": [],
-                "grants": [],
-                "partition_schemes": [],
-                "storage_configs": []
-            },
-            "constraints": [],
-            "relationships": [],
-            "indexes": [],
-            "synonyms": [],
-            "jobs": [],
-            "data_profile": {},
-            "dependency_graph": {
-                "creation_order": [],
-                "deletion_order": [],
-                "dependencies": {}
-            },
-            "type_mappings": {},
-            "security": [],
-            "performance": {
-                "table_stats": [],
-                "index_stats": []
-            },
-            "extraction_report": {
-                "tables": 0,
-                "views": 0,
-                "procedures": 0,
-                "functions": 0,
-                "triggers": 0,
-                "indexes": 0,
-                "constraints": 0,
-                "relationships": 0,
-                "sequences": 0,
-                "partition_schemes": 0,
-                "grants": 0
-            },
-            "error": f"Database type '{db_type}' is not supported. Currently supported: MySQL, PostgreSQL."
-        }
+    extractor = _EXTRACTORS.get(db_type)
+    if extractor is not None:
+        return extractor(connection_info, exact_row_counts=exact_row_counts, progress_cb=progress_cb)
+    
+    # For other database types, return helpful error
+    bundle = copy.deepcopy(_UNSUPPORTED_BUNDLE_TEMPLATE)
+    bundle["error"] = f"Database type '{db_type}' is not supported. Currently supported: {', '.join(_EXTRACTORS)}."
+    return bundle
 
-def export_extraction_json():
-    """Export extraction bundle as JSON"""
-    if not os.path.exists("artifacts/extraction_bundle.json"):
+# Where the latest extraction is saved and served from
+EXTRACTION_BUNDLE_PATH = os.getenv("EXTRACTION_BUNDLE_PATH", "artifacts/extraction_bundle.json")
+# Rendered reports live next to the bundle they are built from
+EXTRACTION_ARTIFACTS_DIR = os.path.dirname(EXTRACTION_BUNDLE_PATH) or "."
+EXTRACTION_XLSX_PATH = os.path.join(EXTRACTION_ARTIFACTS_DIR, "extraction_report.xlsx")
+EXTRACTION_PDF_PATH = os.path.join(EXTRACTION_ARTIFACTS_DIR, "extraction_report.pdf")
+
+class _BundleEntry:
+    """One read of the saved bundle; every derived form is computed from this entry's own bytes"""
+    __slots__ = ("key", "raw", "data", "digest", "msgpack", "gzip")
+
+    def __init__(self, key, raw: bytes):
+        self.key = key
+        self.raw = raw
+        # Filled lazily; /data serves the bytes without ever decoding them
+        self.data = None
+        self.digest = None
+        self.msgpack = None
+        self.gzip = None
+
+# Latest bundle read, shared by /data and the exporters and keyed by (mtime_ns, size) so a rewrite
+# within the filesystem's timestamp granularity is still noticed. A reload swaps in a whole new
+# entry, so a worker thread still holding the old one can never store its results under the new key
+_bundle_entry: Optional[_BundleEntry] = None
+
+def _bundle_stat_key():
+    try:
+        st = os.stat(EXTRACTION_BUNDLE_PATH)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _current_bundle() -> Optional[_BundleEntry]:
+    """Return the cache entry for the saved extraction bundle, or None if no extraction has been saved"""
+    global _bundle_entry
+    # A cache hit costs one stat; a miss opens the file and keys it by fstat, so the key always
+    # describes the bytes actually read even if the bundle is replaced in between
+    key = _bundle_stat_key()
+    if key is None:
         return None
     
-    with open("artifacts/extraction_bundle.json", "r") as f:
-        data = json.load(f)
-    
-    return data
+    entry = _bundle_entry
+    if entry is None or entry.key != key:
+        try:
+            with open(EXTRACTION_BUNDLE_PATH, "rb") as f:
+                st = os.fstat(f.fileno())
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        entry = _BundleEntry((st.st_mtime_ns, st.st_size), raw)
+        _bundle_entry = entry
+    return entry
 
-def export_extraction_xlsx():
-    """Export extraction bundle as Excel"""
-    if not os.path.exists("artifacts/extraction_bundle.json"):
+def _bundle_data(entry: _BundleEntry):
+    if entry.data is None:
+        entry.data = orjson.loads(entry.raw)
+    return entry.data
+
+def _bundle_entry_digest(entry: _BundleEntry) -> str:
+    if entry.digest is None:
+        entry.digest = hashlib.blake2b(entry.raw, digest_size=16).hexdigest()
+    return entry.digest
+
+def _bundle_digest():
+    """Return a content hash of the saved bundle, or None if no extraction has been saved"""
+    entry = _current_bundle()
+    return None if entry is None else _bundle_entry_digest(entry)
+
+@functools.lru_cache(maxsize=None)
+def _get_msgpack():
+    """Return the optional ormsgpack module, or None if it isn't installed"""
+    try:
+        return importlib.import_module("ormsgpack")
+    except ImportError:
+        return None
+
+def _bundle_msgpack(entry: _BundleEntry, packer) -> bytes:
+    """Return the bundle encoded as MessagePack, packing it once per entry"""
+    if entry.msgpack is None:
+        entry.msgpack = packer.packb(_bundle_data(entry), option=packer.OPT_NON_STR_KEYS)
+    return entry.msgpack
+
+def _bundle_gzip(entry: _BundleEntry) -> bytes:
+    """Return the bundle JSON gzip-compressed, compressing it once per entry"""
+    if entry.gzip is None:
+        entry.gzip = gzip.compress(entry.raw, compresslevel=6)
+    return entry.gzip
+
+def _bundle_snapshot():
+    """Return the saved bundle's cache entry with its digest computed, or None if no extraction has been saved"""
+    entry = _current_bundle()
+    if entry is None:
+        return None
+    _bundle_entry_digest(entry)
+    return entry
+
+# Bundle digest each export artifact was last rendered from, so repeat downloads reuse the file
+_export_digests: Dict[str, str] = {}
+
+def _export_is_current(filename: str, digest: str) -> bool:
+    return _export_digests.get(filename) == digest and os.path.exists(filename)
+
+def export_extraction_json():
+    """Export extraction bundle as JSON"""
+    # The saved bundle is already the JSON report, so it is served as-is
+    if _bundle_stat_key() is None:
         return None
     
-    with open("artifacts/extraction_bundle.json", "r") as f:
-        data = json.load(f)
+    return EXTRACTION_BUNDLE_PATH
+
+# Detail sheets of the extraction workbook: (sheet name, path into the bundle, ((header, field, max length), ...))
+_XLSX_SHEETS = (
+    ("Tables", ("ddl_scripts", "tables"), (
+        ("Table Name", "name", None), ("DDL", "ddl", 1000))),
+    ("Constraints", ("constraints",), (
+        ("Type", "type", None), ("Table", "table", None), ("Columns", "columns", None), ("DDL", "ddl", 500))),
+    ("Triggers", ("ddl_scripts", "triggers"), (
+        ("Trigger Name", "name", None), ("Table", "table", None), ("Event", "event", None), ("Timing", "timing", None),
+        ("DDL", "ddl", 1000), ("Target DDL Template", "target_ddl_template", 1000))),
+    ("Sequences", ("ddl_scripts", "sequences"), (
+        ("Table", "table", None), ("Column", "column", None), ("DDL", "ddl", None),
+        ("Create Sequence Template", "create_sequence_template", None), ("Alter Sequence Template", "alter_sequence_template", None))),
+    ("Computed Columns", ("ddl_scripts", "computed_columns"), (
+        ("Table", "table", None), ("Column", "column", None), ("Expression", "expression", None), ("DDL", "ddl", None))),
+    ("Advanced Constraints", ("ddl_scripts", "advanced_constraints"), (
+        ("Table", "table", None), ("Name", "name", None), ("Type", "type", None), ("Check Clause", "check_clause", None), ("DDL", "ddl", None)))
+)
+
+def _write_sheet(workbook, sheet_name: str, items, columns):
+    """Write a header row and one row per item, joining list fields and truncating long text"""
+    sheet = workbook.add_worksheet(sheet_name)
+    sheet.write_row(0, 0, [header for header, _, _ in columns])
     
-    # Create Excel file
-    excel_filename = "artifacts/extraction_report.xlsx"
-    workbook = xlsxwriter.Workbook(excel_filename)
+    for i, item in enumerate(items, start=1):
+        row = []
+        for _, field, limit in columns:
+            value = item.get(field, "")
+            if isinstance(value, list):
+                value = ", ".join(value)
+            if limit and isinstance(value, str):
+                value = value[:limit]  # Limit length
+            row.append(value)
+        sheet.write_row(i, 0, row)
+
+class _ExportTee(io.RawIOBase):
+    """Write-only stream that saves an export to disk while handing its bytes to a streaming response.
+    It can't tell() or seek(), so zipfile writes the workbook strictly front to back."""
     
-    # Summary sheet
-    summary_sheet = workbook.add_worksheet("Summary")
-    summary_sheet.write(0, 0, "Database Extraction Report - Summary")
-    summary_sheet.write(2, 0, "Objects Extracted")
+    def __init__(self):
+        self.chunks = queue.Queue(maxsize=16)
+        self.abandoned = False
+        self._file = None
+        self._pending = bytearray()
     
-    report = data.get("extraction_report", {})
-    row = 3
-    for key, value in report.items():
-        summary_sheet.write(row, 0, key.replace("_", " ").title())
-        summary_sheet.write(row, 1, value)
-        row += 1
+    def attach(self, f):
+        self._file = f
     
-    # Tables sheet
-    if "ddl_scripts" in data and "tables" in data["ddl_scripts"]:
-        tables_sheet = workbook.add_worksheet("Tables")
-        tables_sheet.write(0, 0, "Table Name")
-        tables_sheet.write(0, 1, "DDL")
-        
-        for i, table in enumerate(data["ddl_scripts"]["tables"], start=1):
-            tables_sheet.write(i, 0, table.get("name", ""))
-            tables_sheet.write(i, 1, table.get("ddl", "")[:1000])  # Limit length
+    def writable(self) -> bool:
+        return True
     
-    # Constraints sheet
-    if "constraints" in data:
-        constraints_sheet = workbook.add_worksheet("Constraints")
-        constraints_sheet.write(0, 0, "Type")
-        constraints_sheet.write(0, 1, "Table")
-        constraints_sheet.write(0, 2, "Columns")
-        constraints_sheet.write(0, 3, "DDL")
-        
-        for i, constraint in enumerate(data["constraints"], start=1):
-            constraints_sheet.write(i, 0, constraint.get("type", ""))
-            constraints_sheet.write(i, 1, constraint.get("table", ""))
-            constraints_sheet.write(i, 2, ", ".join(constraint.get("columns", [])))
-            constraints_sheet.write(i, 3, constraint.get("ddl", "")[:500])  # Limit length
+    def write(self, b) -> int:
+        self._file.write(b)
+        self._pending += b
+        if len(self._pending) >= EXPORT_CHUNK_SIZE:
+            self._emit(bytes(self._pending))
+            self._pending.clear()
+        return len(b)
     
-    # Triggers sheet
-    if "ddl_scripts" in data and "triggers" in data["ddl_scripts"]:
-        triggers_sheet = workbook.add_worksheet("Triggers")
-        triggers_sheet.write(0, 0, "Trigger Name")
-        triggers_sheet.write(0, 1, "Table")
-        triggers_sheet.write(0, 2, "Event")
-        triggers_sheet.write(0, 3, "Timing")
-        triggers_sheet.write(0, 4, "DDL")
-        triggers_sheet.write(0, 5, "Target DDL Template")
-        
-        for i, trigger in enumerate(data["ddl_scripts"]["triggers"], start=1):
-            triggers_sheet.write(i, 0, trigger.get("name", ""))
-            triggers_sheet.write(i, 1, trigger.get("table", ""))
-            triggers_sheet.write(i, 2, trigger.get("event", ""))
-            triggers_sheet.write(i, 3, trigger.get("timing", ""))
-            triggers_sheet.write(i, 4, trigger.get("ddl", "")[:1000])  # Limit length
-            triggers_sheet.write(i, 5, trigger.get("target_ddl_template", "")[:1000])  # Limit length
+    def _emit(self, item):
+        # Once the client goes away, keep rendering to disk but stop queueing
+        while not self.abandoned:
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
     
-    # Sequences sheet
-    if "ddl_scripts" in data and "sequences" in data["ddl_scripts"]:
-        sequences_sheet = workbook.add_worksheet("Sequences")
-        sequences_sheet.write(0, 0, "Table")
-        sequences_sheet.write(0, 1, "Column")
-        sequences_sheet.write(0, 2, "DDL")
-        sequences_sheet.write(0, 3, "Create Sequence Template")
-        sequences_sheet.write(0, 4, "Alter Sequence Template")
-        
-        for i, sequence in enumerate(data["ddl_scripts"]["sequences"], start=1):
-            sequences_sheet.write(i, 0, sequence.get("table", ""))
-            sequences_sheet.write(i, 1, sequence.get("column", ""))
-            sequences_sheet.write(i, 2, sequence.get("ddl", ""))
-            sequences_sheet.write(i, 3, sequence.get("create_sequence_template", ""))
-            sequences_sheet.write(i, 4, sequence.get("alter_sequence_template", ""))
+    def finish(self, error: Optional[BaseException] = None):
+        if self._pending:
+            self._emit(bytes(self._pending))
+            self._pending.clear()
+        self._emit(error)
     
-    # Computed Columns sheet
-    if "ddl_scripts" in data and "computed_columns" in data["ddl_scripts"]:
-        computed_sheet = workbook.add_worksheet("Computed Columns")
-        computed_sheet.write(0, 0, "Table")
-        computed_sheet.write(0, 1, "Column")
-        computed_sheet.write(0, 2, "Expression")
-        computed_sheet.write(0, 3, "DDL")
-        
-        for i, computed in enumerate(data["ddl_scripts"]["computed_columns"], start=1):
-            computed_sheet.write(i, 0, computed.get("table", ""))
-            computed_sheet.write(i, 1, computed.get("column", ""))
-            computed_sheet.write(i, 2, computed.get("expression", ""))
-            computed_sheet.write(i, 3, computed.get("ddl", ""))
+    def stream(self):
+        """Yield queued chunks until the writer finishes, re-raising its error if it failed"""
+        try:
+            while (item := self.chunks.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.abandoned = True
+
+def export_extraction_xlsx(tee: Optional[_ExportTee] = None):
+    """Export extraction bundle as Excel, also streaming it through tee when one is given"""
+    # Digest and data come from one entry, so the artifact is never tagged with a newer bundle's digest
+    entry = _current_bundle()
+    if entry is None:
+        return None
+    digest = _bundle_entry_digest(entry)
     
-    # Advanced Constraints sheet
-    if "ddl_scripts" in data and "advanced_constraints" in data["ddl_scripts"]:
-        adv_constraints_sheet = workbook.add_worksheet("Advanced Constraints")
-        adv_constraints_sheet.write(0, 0, "Table")
-        adv_constraints_sheet.write(0, 1, "Name")
-        adv_constraints_sheet.write(0, 2, "Type")
-        adv_constraints_sheet.write(0, 3, "Check Clause")
-        adv_constraints_sheet.write(0, 4, "DDL")
-        
-        for i, constraint in enumerate(data["ddl_scripts"]["advanced_constraints"], start=1):
-            adv_constraints_sheet.write(i, 0, constraint.get("table", ""))
-            adv_constraints_sheet.write(i, 1, constraint.get("name", ""))
-            adv_constraints_sheet.write(i, 2, constraint.get("type", ""))
-            adv_constraints_sheet.write(i, 3, constraint.get("check_clause", ""))
-            adv_constraints_sheet.write(i, 4, constraint.get("ddl", ""))
+    excel_filename = EXTRACTION_XLSX_PATH
+    if tee is None and _export_is_current(excel_filename, digest):
+        return excel_filename
+    data = _bundle_data(entry)
+    os.makedirs(EXTRACTION_ARTIFACTS_DIR, exist_ok=True)
     
-    workbook.close()
+    # Create Excel file
+    # Written to a temporary name so a download of the previous report never reads a half-built one
+    with open(excel_filename + ".tmp", "wb") as f:
+        if tee is not None:
+            tee.attach(f)
+        # Rows are written strictly in order, so each one can be flushed to disk as soon as the next starts;
+        # DDL text is never a link, so skip the per-string URL scan
+        workbook = xlsxwriter.Workbook(f if tee is None else tee, {"constant_memory": True, "use_zip64": True, "strings_to_urls": False})
+        
+        # Summary sheet
+        summary_sheet = workbook.add_worksheet("Summary")
+        summary_sheet.write(0, 0, "Database Extraction Report - Summary")
+        summary_sheet.write(2, 0, "Objects Extracted")
+        
+        report = data.get("extraction_report", {})
+        for row, (key, value) in enumerate(report.items(), start=3):
+            summary_sheet.write_row(row, 0, (key.replace("_", " ").title(), value))
+        
+        # Detail sheets
+        for sheet_name, path, columns in _XLSX_SHEETS:
+            items = data
+            for key in path:
+                items = items.get(key) if isinstance(items, dict) else None
+            if items is not None:
+                _write_sheet(workbook, sheet_name, items, columns)
+        
+        workbook.close()
+    os.replace(excel_filename + ".tmp", excel_filename)
+    _export_digests[excel_filename] = digest
     return excel_filename
 
+# Characters per line of Code-style text that fit the letter page body
+PDF_CODE_LINE_LENGTH = 95
+
+def _preview(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+def _pdf_code(text: str, styles):
+    """DDL block taken verbatim; unlike Paragraph it skips the markup parser, so <, > and & are safe"""
+    return Preformatted(str(text), styles["Code"], maxLineLength=PDF_CODE_LINE_LENGTH)
+
 def export_extraction_pdf():
     """Export extraction bundle as PDF"""
-    if not os.path.exists("artifacts/extraction_bundle.json"):
+    entry = _current_bundle()
+    if entry is None:
         return None
+    digest = _bundle_entry_digest(entry)
     
-    with open("artifacts/extraction_bundle.json", "r") as f:
-        data = json.load(f)
+    pdf_filename = EXTRACTION_PDF_PATH
+    if _export_is_current(pdf_filename, digest):
+        return pdf_filename
+    data = _bundle_data(entry)
+    os.makedirs(EXTRACTION_ARTIFACTS_DIR, exist_ok=True)
     
     # Create PDF file
-    pdf_filename = "artifacts/extraction_report.pdf"
     doc = SimpleDocTemplate(pdf_filename, pagesize=letter)
     styles = getSampleStyleSheet()
     story = []
@@ -1308,75 +1701,74 @@ def export_extraction_pdf():
     
     # Tables section
     if "ddl_scripts" in data and "tables" in data["ddl_scripts"]:
-        tables_header = Paragraph("<b>Tables</b>", styles["Heading2"])
-        story.append(tables_header)
+        story.append(Paragraph("<b>Tables</b>", styles["Heading2"]))
         
         for table in data["ddl_scripts"]["tables"][:5]:  # Limit to first 5 tables
-            table_name = Paragraph(f"<b>{table.get('name', '')}</b>", styles["Heading3"])
-            story.append(table_name)
-            
-            # Add a preview of the DDL
-            ddl_preview = table.get("ddl", "")[:200] + "..." if len(table.get("ddl", "")) > 200 else table.get("ddl", "")
-            table_ddl = Paragraph(f"<pre>{ddl_preview}</pre>", styles["Normal"])
-            story.append(table_ddl)
-            story.append(Spacer(1, 6))
+            story.extend([
+                Paragraph(f"<b>{escape(str(table.get('name', '')))}</b>", styles["Heading3"]),
+                # Add a preview of the DDL
+                _pdf_code(_preview(table.get("ddl", ""), 200), styles),
+                Spacer(1, 6)
+            ])
     
     # Triggers section
     if "ddl_scripts" in data and "triggers" in data["ddl_scripts"]:
-        triggers_header = Paragraph("<b>Triggers</b>", styles["Heading2"])
-        story.append(triggers_header)
+        story.append(Paragraph("<b>Triggers</b>", styles["Heading2"]))
         
         for trigger in data["ddl_scripts"]["triggers"][:3]:  # Limit to first 3 triggers
-            trigger_name = Paragraph(f"<b>{trigger.get('name', '')}</b> on {trigger.get('table', '')}", styles["Heading3"])
-            story.append(trigger_name)
-            
-            # Add trigger DDL
-            ddl_preview = trigger.get("ddl", "")[:300] + "..." if len(trigger.get("ddl", "")) > 300 else trigger.get("ddl", "")
-            trigger_ddl = Paragraph(f"<pre>{ddl_preview}</pre>", styles["Normal"])
-            story.append(trigger_ddl)
-            
-            # Add target DDL template
-            target_ddl_preview = trigger.get("target_ddl_template", "")[:300] + "..." if len(trigger.get("target_ddl_template", "")) > 300 else trigger.get("target_ddl_template", "")
-            target_ddl = Paragraph(f"<i>Target DDL Template:</i><br/><pre>{target_ddl_preview}</pre>", styles["Normal"])
-            story.append(target_ddl)
-            story.append(Spacer(1, 6))
+            story.extend([
+                Paragraph(f"<b>{escape(str(trigger.get('name', '')))}</b> on {escape(str(trigger.get('table', '')))}", styles["Heading3"]),
+                # Add trigger DDL
+                _pdf_code(_preview(trigger.get("ddl", ""), 300), styles),
+                # Add target DDL template
+                Paragraph("<i>Target DDL Template:</i>", styles["Normal"]),
+                _pdf_code(_preview(trigger.get("target_ddl_template", ""), 300), styles),
+                Spacer(1, 6)
+            ])
     
     # Sequences section
     if "ddl_scripts" in data and "sequences" in data["ddl_scripts"]:
-        sequences_header = Paragraph("<b>Sequences</b>", styles["Heading2"])
-        story.append(sequences_header)
+        story.append(Paragraph("<b>Sequences</b>", styles["Heading2"]))
         
         for sequence in data["ddl_scripts"]["sequences"][:3]:  # Limit to first 3 sequences
-            sequence_name = Paragraph(f"<b>{sequence.get('table', '')}.{sequence.get('column', '')}</b>", styles["Heading3"])
-            story.append(sequence_name)
-            
-            # Add sequence DDL
-            sequence_ddl = Paragraph(f"<pre>{sequence.get('ddl', '')}</pre>", styles["Normal"])
-            story.append(sequence_ddl)
-            
-            # Add templates
-            templates = Paragraph(f"<i>Create Template:</i><br/><pre>{sequence.get('create_sequence_template', '')}</pre><br/>" +
-                                f"<i>Alter Template:</i><br/><pre>{sequence.get('alter_sequence_template', '')}</pre>", styles["Normal"])
-            story.append(templates)
-            story.append(Spacer(1, 6))
+            story.extend([
+                Paragraph(f"<b>{escape(str(sequence.get('table', '')))}.{escape(str(sequence.get('column', '')))}</b>", styles["Heading3"]),
+                # Add sequence DDL
+                _pdf_code(sequence.get("ddl", ""), styles),
+                # Add templates
+                Paragraph("<i>Create Template:</i>", styles["Normal"]),
+                _pdf_code(sequence.get("create_sequence_template", ""), styles),
+                Paragraph("<i>Alter Template:</i>", styles["Normal"]),
+                _pdf_code(sequence.get("alter_sequence_template", ""), styles),
+                Spacer(1, 6)
+            ])
     
     # Build PDF
     doc.build(story)
+    _export_digests[pdf_filename] = digest
     return pdf_filename
 
-async def run_extraction_task():
+def save_extraction_bundle(extraction_bundle):
+    """Write the extraction bundle to EXTRACTION_BUNDLE_PATH"""
+    global _bundle_entry
+    os.makedirs(os.path.dirname(EXTRACTION_BUNDLE_PATH) or ".", exist_ok=True)
+    # orjson handles dates natively and only falls back to str() for Decimal, bytes and the like
+    with open(EXTRACTION_BUNDLE_PATH + ".tmp", "wb") as f:
+        f.write(orjson.dumps(extraction_bundle, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+        f.flush()
+        os.fsync(f.fileno())
+    # Readers see either the previous bundle or the complete new one, never a partial write
+    os.replace(EXTRACTION_BUNDLE_PATH + ".tmp", EXTRACTION_BUNDLE_PATH)
+    # Coarse filesystem timestamps could leave the new file with the old mtime
+    _bundle_entry = None
+
+# Whole extractions run on their own executor so long jobs don't starve the default
+# thread pool that to_thread and sync routes share
+MAX_CONCURRENT_EXTRACTIONS = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "4"))
+_extraction_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EXTRACTIONS, thread_name_prefix="extraction")
+
+async def run_extraction_task(job_id: str):
     """Background task to run the extraction"""
-    global extraction_status
-    
-    # Reset status
-    extraction_status = {
-        "phase": "Initializing",
-        "percent": 0,
-        "done": False,
-        "results_summary": None,
-        "error": None
-    }
-    
     try:
         # Get session info
         session = get_active_session()
@@ -1392,120 +1784,208 @@ async def run_extraction_task():
         if not connection_info:
             raise Exception("Source database connection not found")
         
-        # Extraction phases
-        phases = [
-            ("Loading analysis results", 10),
-            ("Generating DDL scripts", 30),
-            ("Extracting constraints", 50),
-            ("Building dependency graph", 70),
-            ("Preparing type mappings", 85),
-            ("Finalizing extraction", 100)
-        ]
+        await update_extraction_job(job_id, phase="Loading analysis results", percent=10)
+        loop = asyncio.get_running_loop()
         
-        for phase, percent in phases[:-1]:  # All phases except the last one
-            extraction_status["phase"] = phase
-            extraction_status["percent"] = percent
-            await asyncio.sleep(0.5)  # Simulate work
+        def report_progress(phase: str, percent: int):
+            # Called from the extraction thread at real checkpoints; the job update runs on the loop
+            asyncio.run_coroutine_threadsafe(update_extraction_job(job_id, phase=phase, percent=percent), loop)
         
         # Perform actual DDL extraction
-        extraction_status["phase"] = "Generating DDL scripts"
-        extraction_status["percent"] = 60
-        extraction_bundle = extract_database_ddl(connection_info)
+        # Extraction fans out over worker threads; keep it off the event loop
+        extraction_bundle = await loop.run_in_executor(
+            _extraction_executor,
+            functools.partial(extract_database_ddl, connection_info, progress_cb=report_progress)
+        )
         
         # Final phase
-        extraction_status["phase"] = "Finalizing extraction"
-        extraction_status["percent"] = 100
+        await update_extraction_job(job_id, phase="Finalizing extraction", percent=100)
         
-        # Save to artifacts directory
-        os.makedirs("artifacts", exist_ok=True)
-        with open("artifacts/extraction_bundle.json", "w") as f:
-            json.dump(extraction_bundle, f, indent=2, default=str)
+        # Save to artifacts directory; encoding and writing a large bundle would stall the event loop
+        await asyncio.to_thread(save_extraction_bundle, extraction_bundle)
         
         # Update status
-        extraction_status["done"] = True
-        extraction_status["results_summary"] = {
+        await update_extraction_job(job_id, done=True, results_summary={
             "objects_extracted": sum(extraction_bundle["extraction_report"].values()),
             "tables": extraction_bundle["extraction_report"].get("tables", 0),
             "views": extraction_bundle["extraction_report"].get("views", 0),
             "procedures": extraction_bundle["extraction_report"].get("procedures", 0)
-        }
+        })
         
     except Exception as e:
         print(f"Extraction error: {str(e)}")  # Debug print
-        extraction_status["error"] = str(e)
-        extraction_status["done"] = True
-        extraction_status["percent"] = 100
+        await update_extraction_job(job_id, error=str(e), done=True, percent=100)
 
 @router.post("/start", response_model=CommonResponse)
 async def start_extraction(background_tasks: BackgroundTasks):
-    global extraction_status
-    extraction_status["phase"] = "Starting"
-    extraction_status["percent"] = 0
-    extraction_status["done"] = False
-    extraction_status["error"] = None
+    global latest_extraction_job_id
+    job_id = uuid.uuid4().hex
+    
+    async with _get_extraction_jobs_lock():
+        # Every extraction writes the same bundle, so a second one would race the first for it
+        if any(not job.done for job in extraction_jobs.values()):
+            raise HTTPException(status_code=409, detail="Extraction already running")
+        
+        # Drop the oldest finished jobs so the registry doesn't grow without bound
+        finished = [jid for jid, job in extraction_jobs.items() if job.done]
+        for jid in finished[:max(0, len(finished) - MAX_FINISHED_EXTRACTION_JOBS)]:
+            del extraction_jobs[jid]
+        
+        extraction_jobs[job_id] = ExtractionJob(phase="Starting", percent=0, done=False, results_summary=None, error=None)
+        latest_extraction_job_id = job_id
     
-    background_tasks.add_task(run_extraction_task)
+    background_tasks.add_task(run_extraction_task, job_id)
     
-    return CommonResponse(ok=True, message="Extraction started")
+    return CommonResponse(ok=True, message="Extraction started", data={"jobId": job_id})
+
+def extraction_status_response(job: Optional[ExtractionJob]) -> ORJSONResponse:
+    # Polled constantly, so the AnalysisStatusResponse shape is built directly instead of validated through the model
+    if job is None:
+        return ORJSONResponse({"ok": True, "phase": None, "percent": 0, "done": False, "resultsSummary": None, "error": None})
+    return ORJSONResponse({
+        "ok": True,
+        "phase": job.phase,
+        "percent": job.percent,
+        "done": job.done,
+        "resultsSummary": job.results_summary,
+        "error": job.error
+    })
+
+def _etag(*state) -> str:
+    return '"%s"' % hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
+
+def _status_or_not_modified(request: Request, job_id: Optional[str], job: Optional[ExtractionJob]):
+    """Return the job's status, or 304 if the client already holds this exact state"""
+    etag = _etag(job_id, *((job.phase, job.percent, job.done, job.error) if job else ()))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response = extraction_status_response(job)
+    response.headers["ETag"] = etag
+    return response
 
 @router.get("/status", response_model=AnalysisStatusResponse)
-async def get_extraction_status():
-    global extraction_status
-    return AnalysisStatusResponse(
-        ok=True,
-        phase=extraction_status["phase"],
-        percent=extraction_status["percent"],
-        done=extraction_status["done"],
-        resultsSummary=extraction_status["results_summary"],
-        error=extraction_status["error"]
-    )
+async def get_extraction_status(request: Request, since: Optional[int] = None):
+    """Status of the most recently started extraction; with ?since=<percent>, long-poll until it changes"""
+    job = await wait_for_extraction_job(lambda: extraction_jobs.get(latest_extraction_job_id), since)
+    return _status_or_not_modified(request, latest_extraction_job_id, job)
+
+@router.get("/status/{job_id}", response_model=AnalysisStatusResponse)
+async def get_extraction_job_status(job_id: str, request: Request, since: Optional[int] = None):
+    job = await wait_for_extraction_job(lambda: extraction_jobs.get(job_id), since)
+    if job is None:
+        return AnalysisStatusResponse(ok=False, error="Extraction job not found")
+    return _status_or_not_modified(request, job_id, job)
 
 @router.get("/data")
-async def get_extraction_data():
+async def get_extraction_data(request: Request):
     """Get extraction data for display in frontend"""
-    if not os.path.exists("artifacts/extraction_bundle.json"):
+    # The stat, and the read and hash after a new extraction, run off the event loop
+    # Everything below is served from this one entry, so the ETag always matches the body
+    entry = await asyncio.to_thread(_bundle_snapshot)
+    if entry is None:
         return {"error": "Extraction data not found"}
+    digest = entry.digest
     
-    with open("artifacts/extraction_bundle.json", "r") as f:
-        data = json.load(f)
+    # Clients that ask for MessagePack get the compact binary form when ormsgpack is installed
+    packer = _get_msgpack() if "application/msgpack" in request.headers.get("accept", "") else None
+    # Repeated keys make the JSON compress well; the compressed copy is cached so the middleware doesn't redo it
+    gzipped = not packer and "gzip" in request.headers.get("accept-encoding", "")
+    media_type = "application/msgpack" if packer else "application/json"
+    etag = f'"{digest}{".msgpack" if packer else ".gz" if gzipped else ""}"'
+    headers = {"ETag": etag, "Vary": "Accept, Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
     
-    return data
+    if packer:
+        return Response(content=await asyncio.to_thread(_bundle_msgpack, entry, packer), media_type=media_type, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=await asyncio.to_thread(_bundle_gzip, entry), media_type=media_type, headers=headers)
+    # The file on disk is already the response body; skip decoding and re-encoding it
+    return Response(content=entry.raw, media_type=media_type, headers=headers)
+
+# Exports are streamed in fixed-size chunks so large reports never sit whole in memory
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def _iter_file(filename: str):
+    """Yield the file's bytes in EXPORT_CHUNK_SIZE pieces"""
+    with open(filename, "rb") as f:
+        while chunk := f.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+
+def _stream_export(filename: str, media_type: str, download_name: str, compressed: bool = False) -> StreamingResponse:
+    # Sync iterators are drained in the threadpool, so disk reads stay off the event loop
+    headers = {"Content-Disposition": f"attachment; filename={download_name}"}
+    if compressed:
+        # XLSX and PDF are already deflated; an explicit encoding keeps GZipMiddleware from recompressing them
+        headers["Content-Encoding"] = "identity"
+    return StreamingResponse(_iter_file(filename), media_type=media_type, headers=headers)
 
 @router.get("/export/json")
 async def export_extraction_json_endpoint():
     """Export extraction bundle as JSON"""
-    filename = export_extraction_json()
+    filename = await asyncio.to_thread(export_extraction_json)
     if filename is None:
         return {"error": "Extraction report not found"}
     
-    return FileResponse(
-        filename,
-        media_type="application/json",
-        filename="extraction_report.json"
-    )
+    return _stream_export(filename, "application/json", "extraction_report.json")
+
+def _render_into_tee(render, tee: _ExportTee):
+    try:
+        filename = render(tee)
+    except Exception as e:
+        print(f"Export error: {str(e)}")
+        tee.finish(e)
+        return None
+    tee.finish()
+    return filename
+
+# Renders in progress keyed by (artifact, bundle digest), so concurrent downloads share one render
+_export_renders: Dict[tuple, asyncio.Future] = {}
+
+def _track_render(key: tuple, render: asyncio.Future) -> asyncio.Future:
+    _export_renders[key] = render
+    render.add_done_callback(lambda _: _export_renders.pop(key, None))
+    return render
 
 @router.get("/export/xlsx")
 async def export_extraction_xlsx_endpoint():
     """Export extraction bundle as Excel"""
-    filename = export_extraction_xlsx()
-    if filename is None:
+    digest = await asyncio.to_thread(_bundle_digest)
+    if digest is None:
         return {"error": "Extraction report not found"}
     
-    return FileResponse(
-        filename,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        filename="extraction_report.xlsx"
-    )
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    key = (EXTRACTION_XLSX_PATH, digest)
+    render = _export_renders.get(key)
+    if render is None and not _export_is_current(EXTRACTION_XLSX_PATH, digest):
+        # Render on a worker thread and send the workbook as it is zipped, instead of writing it out and reading it back
+        tee = _ExportTee()
+        _track_render(key, asyncio.ensure_future(asyncio.to_thread(_render_into_tee, export_extraction_xlsx, tee)))
+        return StreamingResponse(
+            tee.stream(),
+            media_type=media_type,
+            headers={"Content-Disposition": "attachment; filename=extraction_report.xlsx", "Content-Encoding": "identity"}
+        )
+    
+    # Someone else is already rendering this bundle; wait for their artifact rather than building another
+    if render is not None and await asyncio.shield(render) is None:
+        return {"error": "Extraction report could not be generated"}
+    return _stream_export(EXTRACTION_XLSX_PATH, media_type, "extraction_report.xlsx", compressed=True)
 
 @router.get("/export/pdf")
 async def export_extraction_pdf_endpoint():
     """Export extraction bundle as PDF"""
-    filename = export_extraction_pdf()
+    digest = await asyncio.to_thread(_bundle_digest)
+    if digest is None:
+        return {"error": "Extraction report not found"}
+    
+    key = (EXTRACTION_PDF_PATH, digest)
+    render = _export_renders.get(key) or _track_render(key, asyncio.ensure_future(asyncio.to_thread(export_extraction_pdf)))
+    # Shielded so one client disconnecting doesn't cancel the render the others are waiting on
+    filename = await asyncio.shield(render)
     if filename is None:
         return {"error": "Extraction report not found"}
     
-    return FileResponse(
-        filename,
-        media_type="application/pdf",
-        filename="extraction_report.pdf"
-    )
\ No newline at end of file
+    return _stream_export(filename, "application/pdf", "extraction_report.pdf", compressed=True)
@@ -1,162 +1,183 @@
 from fastapi import APIRouter, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from backend.models import CommonResponse
 from backend.database import get_active_session, get_connection_by_id
-from backend.ai import translate_schema
+from backend.ai import translate_schema, translate_schema_stream
+from backend.routes.extract import extract_database_ddl, EXTRACTION_BUNDLE_PATH
 import asyncio
 import json
 import os
+import orjson
 import importlib
+import io
+import functools
+import hashlib
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# Drivers are optional; a missing one only fails migrations that use that database type
+try:
+    import mysql.connector as _mysql_connector
+    from mysql.connector import pooling as _mysql_pooling
+except ImportError:
+    _mysql_connector = _mysql_pooling = None
+
+try:
+    import psycopg2 as _psycopg2
+    from psycopg2 import extras as _pg_extras, pool as _pg_pool
+except ImportError:
+    _psycopg2 = _pg_extras = _pg_pool = None
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# DDL patterns used by the dependency sorts and the DDL apply loop
+_FK_RE = re.compile(r'foreign key.*?references\s+(\w+)')
+_CREATE_TABLE_NAME_RE = re.compile(r'CREATE TABLE\s+(\w+)', re.IGNORECASE)
+_REFERENCES_RE = re.compile(r'REFERENCES\s+(\w+)', re.IGNORECASE)
+# Classifies a stripped AI DDL line in one match: a CREATE TABLE start, or a blank/lone-semicolon statement break
+_DDL_LINE_RE = re.compile(r'(?P<create>CREATE TABLE)|(?P<end>;?$)', re.IGNORECASE)
+# One identifier, bare or quoted PostgreSQL/MySQL/SQL Server style
+_IDENTIFIER_RE = re.compile(r'"(?:[^"]|"")+"|`(?:[^`]|``)+`|\[[^\]]+\]|\w+')
+_CREATE_TABLE_RE = re.compile(
+    r'create\s+table(?:\s+if\s+not\s+exists)?\s+((?:{0})(?:\s*\.\s*(?:{0}))?)'.format(_IDENTIFIER_RE.pattern),
+    re.IGNORECASE
+)
+
+def _quote_table_name(qualified_name: str, quote: str) -> str:
+    """Re-quote a possibly schema-qualified name captured by _CREATE_TABLE_RE, one part at a time"""
+    parts = []
+    for part in _IDENTIFIER_RE.findall(qualified_name):
+        if part[0] in '"`':
+            part = part[1:-1].replace(part[0] * 2, part[0])
+        elif part[0] == '[':
+            part = part[1:-1]
+        parts.append(part)
+    return '.'.join(f'{quote}{part.replace(quote, quote * 2)}{quote}' for part in parts)
+
+@functools.lru_cache(maxsize=1024)
+def _fk_dependencies(ddl: str):
+    """Tables referenced by foreign keys in a CREATE TABLE statement, lowercased"""
+    return tuple(_FK_RE.findall(ddl.lower()))
 
 # Global variables to track migration status
 
+def _topological_order(deps_by_name):
+    """Order names so each follows the names it depends on (Kahn's algorithm); dependencies outside
+    the mapping are ignored, and a cycle is broken at its earliest name in input order"""
+    dependents = {name: [] for name in deps_by_name}
+    indegree = dict.fromkeys(deps_by_name, 0)
+    for name, deps in deps_by_name.items():
+        for dep in dict.fromkeys(deps):
+            if dep in dependents and dep != name:
+                dependents[dep].append(name)
+                indegree[name] += 1
+    
+    ready = deque(name for name, degree in indegree.items() if degree == 0)
+    ordered = []
+    placed = set()
+    # Names behind this cursor are all placed, so each cycle break resumes the scan instead of restarting it
+    unplaced = iter(deps_by_name)
+    while len(ordered) < len(indegree):
+        if not ready:
+            ready.append(next(name for name in unplaced if name not in placed))
+        name = ready.popleft()
+        if name in placed:
+            continue
+        ordered.append(name)
+        placed.add(name)
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    return ordered
+
 def sort_tables_by_dependencies(tables):
     """Sort tables by dependency order to handle foreign keys correctly"""
     # Create a mapping of table names to their DDL
     table_map = {}
-    table_deps = {}
 
-    # Extract table names and dependencies
+    # Extract table names
     for table in tables:
         if isinstance(table, dict) and "name" in table and "ddl" in table:
-            table_name = table["name"]
-            table_map[table_name] = table
-
-            # Extract dependencies from DDL (foreign key references)
-            ddl = table["ddl"].lower()
-            deps = []
-
-            # Look for foreign key references
-            import re
-            fk_matches = re.findall(r'foreign key.*?references\s+(\w+)', ddl)
-            deps.extend(fk_matches)
-
-            table_deps[table_name] = deps
-
-    # Topological sort to order tables by dependencies
-    sorted_tables = []
-    visited = set()
-    temp_visited = set()
-
-    def visit(table_name):
-        if table_name in temp_visited:
-            # Circular dependency, skip
-            return
-        if table_name in visited:
-            return
-
-        temp_visited.add(table_name)
+            table_map[table["name"]] = table
 
-        # Visit dependencies first
-        for dep in table_deps.get(table_name, []):
-            if dep in table_map:  # Only if dependency is in our table list
-                visit(dep)
+    # Topological sort to order tables by dependencies, keyed on (name, ddl) so a repeated schema reuses it
+    order = _table_order(tuple((table_name, table["ddl"]) for table_name, table in table_map.items()))
+    return [table_map[table_name] for table_name in order]
 
-        temp_visited.remove(table_name)
-        visited.add(table_name)
-        sorted_tables.append(table_map[table_name])
-
-    # Visit all tables
-    for table_name in table_map:
-        if table_name not in visited:
-            visit(table_name)
-
-    return sorted_tables
+@functools.lru_cache(maxsize=32)
+def _table_order(tables):
+    # Extract dependencies from DDL (foreign key references)
+    return tuple(_topological_order({table_name: _fk_dependencies(ddl) for table_name, ddl in tables}))
 
 def sort_ddl_statements_by_dependencies(ddl_statements):
     """Sort DDL statements by dependency order"""
-    print(f"Sorting {len(ddl_statements)} DDL statements by dependencies")
+    # The sort is memoized on the statements; the copy keeps callers from mutating the cached result
+    return list(_sort_ddl_statements(tuple(ddl_statements)))
 
+@functools.lru_cache(maxsize=32)
+def _sort_ddl_statements(ddl_statements):
     # Parse DDL statements to extract table names and dependencies
-    table_statements = []
+    table_ddl = {}
+    table_deps = {}
     other_statements = []
 
     for statement in ddl_statements:
-        statement_upper = statement.upper()
-        print(f"Processing statement: {statement[:60]}...")
-        if statement_upper.startswith('CREATE TABLE'):
-            # Extract table name
-            import re
-            match = re.search(r'CREATE TABLE\s+(\w+)', statement_upper, re.IGNORECASE)
-            if match:
-                table_name = match.group(1).lower()
-                print(f"Found table: {table_name}")
+        # Anchored, case-insensitive match on the original text: no uppercased copy of each statement
+        match = _CREATE_TABLE_NAME_RE.match(statement)
+        if match:
+            table_name = match.group(1).lower()
+            # A repeated CREATE TABLE for the same name is dropped; the first one wins
+            if table_name not in table_ddl:
+                table_ddl[table_name] = statement
                 # Extract foreign key references
-                deps = []
-                fk_matches = re.findall(r'REFERENCES\s+(\w+)', statement_upper, re.IGNORECASE)
-                deps.extend([dep.lower() for dep in fk_matches])
-                print(f"Dependencies for {table_name}: {deps}")
-
-                table_statements.append({
-                    'name': table_name,
-                    'ddl': statement,
-                    'deps': deps
-                })
-            else:
-                print(f"Could not extract table name from: {statement[:60]}...")
-                other_statements.append(statement)
+                table_deps[table_name] = [dep.lower() for dep in _REFERENCES_RE.findall(statement)]
         else:
-            print(f"Non-table statement: {statement[:60]}...")
             other_statements.append(statement)
 
-    print(f"Found {len(table_statements)} table statements and {len(other_statements)} other statements")
-
-    # Topological sort for table statements
-    sorted_table_statements = []
-    visited = set()
-    temp_visited = set()
-
-    def visit_table(table_info):
-        table_name = table_info['name']
-        print(f"Visiting table: {table_name}")
-        if table_name in temp_visited:
-            print(f"Circular dependency detected for {table_name}")
-            return
-        if table_name in visited:
-            print(f"Already visited {table_name}")
-            return
-
-        temp_visited.add(table_name)
-        print(f"Processing dependencies for {table_name}: {table_info['deps']}")
-
-        # Visit dependencies first
-        for dep in table_info['deps']:
-            print(f"Looking for dependency {dep}")
-            for other_table in table_statements:
-                if other_table['name'] == dep:
-                    print(f"Found dependency {dep}, visiting it first")
-                    visit_table(other_table)
-
-        temp_visited.remove(table_name)
-        visited.add(table_name)
-        print(f"Adding {table_name} to sorted list")
-        sorted_table_statements.append(table_info['ddl'])
-
-    # Visit all tables
-    for table_info in table_statements:
-        if table_info['name'] not in visited:
-            print(f"Starting visit for {table_info['name']}")
-            visit_table(table_info)
-
-    print(f"Sorted {len(sorted_table_statements)} table statements")
-    for i, stmt in enumerate(sorted_table_statements):
-        print(f"Sorted {i+1}: {stmt[:60]}...")
-
     # Return sorted table statements first, then other statements
-    return sorted_table_statements + other_statements
-
-
-structure_migration_status = {
+    return tuple([table_ddl[table_name] for table_name in _topological_order(table_deps)] + other_statements)
+
+
+@dataclass
+class StructureMigrationStatus:
+    """Progress of the structure migration; one instance, updated in place under the status lock"""
+    __slots__ = ("phase", "percent", "done", "error", "translated_queries", "translated_queries_original", "notes")
+    phase: Optional[str]
+    percent: int
+    done: bool
+    error: Optional[str]
+    translated_queries: Any
+    translated_queries_original: Any
+    notes: Any
+
+@dataclass
+class DataMigrationStatus:
+    """Progress of the data migration; one instance, updated in place under the status lock"""
+    __slots__ = ("phase", "percent", "done", "error", "rows_migrated", "total_rows")
+    phase: Optional[str]
+    percent: int
+    done: bool
+    error: Optional[str]
+    rows_migrated: int
+    total_rows: int
+
+_STRUCTURE_STATUS_RESET = {
     "phase": None,
     "percent": 0,
     "done": False,
     "error": None,
     "translated_queries": None,
+    "translated_queries_original": None,
     "notes": None
 }
 
-data_migration_status = {
+_DATA_STATUS_RESET = {
     "phase": None,
     "percent": 0,
     "done": False,
@@ -165,26 +186,85 @@ data_migration_status = {
     "total_rows": 0
 }
 
+structure_migration_status = StructureMigrationStatus(**_STRUCTURE_STATUS_RESET)
+data_migration_status = DataMigrationStatus(**_DATA_STATUS_RESET)
+_migration_status_lock: Optional[asyncio.Lock] = None
+
+def _get_migration_status_lock() -> asyncio.Lock:
+    # Created lazily so it binds to the running event loop (Python 3.9 binds locks at construction)
+    global _migration_status_lock
+    if _migration_status_lock is None:
+        _migration_status_lock = asyncio.Lock()
+    return _migration_status_lock
+
+async def update_migration_status(status, **fields):
+    """Apply fields to status together, so a status poll never sees half of a phase change"""
+    async with _get_migration_status_lock():
+        for name, value in fields.items():
+            setattr(status, name, value)
+
+async def migration_status_snapshot(status) -> Dict[str, Any]:
+    # Shallow on purpose: dataclasses.asdict would deep-copy the translated DDL on every poll
+    async with _get_migration_status_lock():
+        return {name: getattr(status, name) for name in status.__slots__}
+
+_CONNECTORS = {
+    "PostgreSQL": "psycopg2",
+    "MySQL": "mysql.connector",
+    "Snowflake": "snowflake.connector",
+    "Databricks": "databricks.sql",
+    "Oracle": "oracledb",
+    "SQL Server": "pyodbc",
+    "Teradata": "teradatasql",
+    "Google BigQuery": "google.cloud.bigquery"
+}
+
+@functools.lru_cache(maxsize=None)
 def get_db_connector(db_type: str):
     """Dynamically import and return the appropriate database connector"""
-    connectors = {
-        "PostgreSQL": "psycopg2",
-        "MySQL": "mysql.connector",
-        "Snowflake": "snowflake.connector",
-        "Databricks": "databricks.sql",
-        "Oracle": "oracledb",
-        "SQL Server": "pyodbc",
-        "Teradata": "teradatasql",
-        "Google BigQuery": "google.cloud.bigquery"
-    }
-    
     try:
-        if db_type in connectors:
-            return importlib.import_module(connectors[db_type])
+        if db_type in _CONNECTORS:
+            return importlib.import_module(_CONNECTORS[db_type])
         return None
     except ImportError:
         return None
 
+def _connection_params(db_type: str, credentials) -> dict:
+    """Driver keyword arguments for a MySQL or PostgreSQL connection"""
+    if db_type == "MySQL":
+        ssl_mode = credentials.get('ssl', 'false')  # Default to false for Windows compatibility
+        
+        # Create connection parameters with minimal configuration for Windows
+        connection_params = {
+            'host': credentials.get('host'),
+            'port': credentials.get('port', 3306),
+            'database': credentials.get('database'),
+            'user': credentials.get('username'),
+            'password': credentials.get('password'),
+            'autocommit': True,
+            'allow_local_infile': True,  # Important for Windows
+            'charset': 'utf8mb4',
+            'use_unicode': True
+        }
+        
+        # Only add SSL settings if explicitly needed
+        if ssl_mode == 'true':
+            connection_params.update({
+                'ssl_disabled': False,
+                'ssl_verify_cert': False
+            })
+        return connection_params
+    
+    # Create connection parameters dict for better compatibility
+    return {
+        'host': credentials.get('host'),
+        'port': credentials.get('port', 5432),
+        'dbname': credentials.get('database'),
+        'user': credentials.get('username'),
+        'password': credentials.get('password'),
+        'application_name': 'Strata Migration Tool'
+    }
+
 def connect_to_database(connection_info):
     """Connect to a database based on connection info with Windows compatibility fixes"""
     db_type = connection_info.get("dbType")
@@ -192,79 +272,14 @@ def connect_to_database(connection_info):
     
     try:
         if db_type == "MySQL":
-            import mysql.connector
-            
-            # Extract credentials
-            host = credentials.get('host')
-            port = credentials.get('port', 3306)
-            database = credentials.get('database')
-            username = credentials.get('username')
-            password = credentials.get('password')
-            ssl_mode = credentials.get('ssl', 'false')  # Default to false for Windows compatibility
-            
-            # Create connection parameters with minimal configuration for Windows
-            connection_params = {
-                'host': host,
-                'port': port,
-                'database': database,
-                'user': username,
-                'password': password,
-                'autocommit': True,
-                'allow_local_infile': True,  # Important for Windows
-                'charset': 'utf8mb4',
-                'use_unicode': True
-            }
-            
-            # Only add SSL settings if explicitly needed and supported
-            if ssl_mode == 'true':
-                try:
-                    # Only add SSL if all required parameters are present
-                    connection_params.update({
-                        'ssl_disabled': False,
-                        'ssl_verify_cert': False
-                    })
-                except Exception:
-                    # Fallback to no SSL if there are any issues
-                    connection_params['ssl_disabled'] = True
-            
-            return mysql.connector.connect(**connection_params)
+            if _mysql_connector is None:
+                raise ImportError("No module named 'mysql.connector'")
+            return _mysql_connector.connect(**_connection_params(db_type, credentials))
         
         elif db_type == "PostgreSQL":
-            import psycopg2
-            
-            # Extract credentials
-            host = credentials.get('host')
-            port = credentials.get('port', 5432)
-            database = credentials.get('database')
-            username = credentials.get('username')
-            password = credentials.get('password')
-            ssl_mode = credentials.get('ssl', 'require')  # Default to require for Azure
-            
-
-            # Create connection parameters dict for better compatibility
-            connection_params = {
-                'host': host,
-                'port': port,
-                'dbname': database,
-                'user': username,
-                'password': password,
-                'application_name': 'Strata Migration Tool'
-            }
-            
-            return psycopg2.connect(**connection_params)
-
-            # Create connection parameters dict for better compatibility
-            connection_params = {
-                'host': host,
-                'port': port,
-                'dbname': database,
-                'user': username,
-                'password': password,
-                'application_name': 'Strata Migration Tool'
-            }
-            
-            return psycopg2.connect(**connection_params)
-
+            if _psycopg2 is None:
+                raise ImportError("No module named 'psycopg2'")
+            return _psycopg2.connect(**_connection_params(db_type, credentials))
         
         # For other database types, we would implement similar connection logic
         # For now, we'll raise an exception for unsupported database types
@@ -276,95 +291,211 @@ def connect_to_database(connection_info):
     except Exception as e:
         raise Exception(f"Failed to connect to {db_type} database: {str(e)}")
 
+# Connections kept open per source/target between migrations, so repeat runs skip the TCP and auth handshakes
+MIGRATION_POOL_SIZE = int(os.getenv("MIGRATION_POOL_SIZE", "4"))
+_migration_pools = {}
+_migration_pools_lock = threading.Lock()
+# PostgreSQL connections on loan, mapped to the pool they go back to
+_borrowed_pg_connections = {}
+# MySQL connections opened so far per pool name; MySQL pools start empty and grow on demand up to their size
+_mysql_pool_opened = {}
+
+def _get_migration_pool(db_type: str, connection_params: dict):
+    """Return the shared pool for these parameters, creating it on first use"""
+    key = (db_type, hashlib.sha256(json.dumps(connection_params, sort_keys=True, default=str).encode()).hexdigest())
+    pool = _migration_pools.get(key)
+    if pool is not None:
+        return pool
+    
+    # Built outside the lock and without opening any connection, so concurrent source/target setup never waits on it
+    if db_type == "MySQL":
+        if _mysql_pooling is None:
+            raise ImportError("No module named 'mysql.connector'")
+        # Passing no connection arguments keeps the constructor from opening pool_size connections up front
+        pool = _mysql_pooling.MySQLConnectionPool(
+            pool_name=f"strata_migrate_{key[1][:16]}",
+            pool_size=MIGRATION_POOL_SIZE,
+            pool_reset_session=True
+        )
+        pool.set_config(**connection_params)
+    else:
+        if _pg_pool is None:
+            raise ImportError("No module named 'psycopg2'")
+        pool = _pg_pool.ThreadedConnectionPool(0, MIGRATION_POOL_SIZE, **connection_params)
+    
+    with _migration_pools_lock:
+        winner = _migration_pools.setdefault(key, pool)
+    if winner is not pool and db_type == "PostgreSQL":
+        # Another thread registered its pool first; this one holds no connections yet
+        pool.closeall()
+    return winner
+
+def _acquire_mysql_connection(pool, connection_params: dict):
+    """Take an idle connection from a MySQL pool, opening a new one while the pool is below its size"""
+    try:
+        # get_connection() pings and reconnects stale connections before handing them out
+        return pool.get_connection()
+    except _mysql_pooling.PoolError:
+        with _migration_pools_lock:
+            opened = _mysql_pool_opened.get(pool.pool_name, 0)
+            if opened >= pool.pool_size:
+                raise
+            _mysql_pool_opened[pool.pool_name] = opened + 1
+    
+    # The handshake happens outside every lock, so source and target connect in parallel
+    try:
+        connection = _mysql_connector.connect(**connection_params)
+    except Exception:
+        with _migration_pools_lock:
+            _mysql_pool_opened[pool.pool_name] -= 1
+        raise
+    # Tagged as current for this pool, so get_connection() reuses it later instead of reconnecting
+    connection.pool_config_version = pool._config_version
+    # Closing the wrapper returns the connection to the pool
+    return _mysql_pooling.PooledMySQLConnection(pool, connection)
+
+def acquire_connection(connection_info):
+    """Borrow a pooled connection for connection_info; hand it back with release_connection"""
+    db_type = connection_info.get("dbType")
+    if db_type not in ("MySQL", "PostgreSQL"):
+        return connect_to_database(connection_info)
+    
+    try:
+        connection_params = _connection_params(db_type, connection_info.get("credentials", {}))
+        pool = _get_migration_pool(db_type, connection_params)
+        if db_type == "MySQL":
+            return _acquire_mysql_connection(pool, connection_params)
+        
+        connection = pool.getconn()
+        if connection.closed:
+            # Dropped since it was last used; evict it and take a fresh one
+            pool.putconn(connection, close=True)
+            connection = pool.getconn()
+        _borrowed_pg_connections[id(connection)] = pool
+        return connection
+    except ImportError as e:
+        raise Exception(f"Required database driver for {db_type} is not installed: {str(e)}")
+    except Exception as e:
+        if type(e).__name__ == "PoolError":
+            # Every pooled connection is in use; fall back to a dedicated one
+            return connect_to_database(connection_info)
+        raise Exception(f"Failed to connect to {db_type} database: {str(e)}")
+
+def release_connection(connection, broken: bool = False):
+    """Return a borrowed connection to its pool, discarding it if it failed; unpooled ones are closed"""
+    pool = _borrowed_pg_connections.pop(id(connection), None)
+    try:
+        if pool is None:
+            # MySQL pooled connections go back to their pool on close()
+            connection.close()
+            return
+        if not broken and not connection.closed:
+            # Never hand out a connection with a transaction still open
+            connection.rollback()
+        pool.putconn(connection, close=broken or bool(connection.closed))
+    except Exception:
+        pass
+
+async def connect_source_and_target(source_connection_info, target_connection_info):
+    """Borrow the source and target connections concurrently; if either fails, release the other and re-raise"""
+    connections = await asyncio.gather(
+        asyncio.to_thread(acquire_connection, source_connection_info),
+        asyncio.to_thread(acquire_connection, target_connection_info),
+        return_exceptions=True
+    )
+    errors = [c for c in connections if isinstance(c, BaseException)]
+    if errors:
+        for connection in connections:
+            if not isinstance(connection, BaseException):
+                release_connection(connection)
+        raise errors[0]
+    return connections
+
 def reassemble_ai_ddl_statements(ddl_list):
     """Reassemble AI-generated DDL statements from list format into complete SQL statements"""
     statements = []
     
     if not isinstance(ddl_list, list):
-        print(f"Expected list, got {type(ddl_list)}")
+        logger.warning("Expected list, got %s", type(ddl_list))
         return statements
     
-    print(f"Reassembling {len(ddl_list)} DDL items")
+    logger.debug("Reassembling %s DDL items", len(ddl_list))
     
-    current_statement = ""
+    # Lines of the statement being built, joined once it completes
+    current_parts = []
     in_create_table = False
     paren_depth = 0
     
     for i, item in enumerate(ddl_list):
         if isinstance(item, str):
             line = item.strip()
+            match = _DDL_LINE_RE.match(line)
+            kind = match.lastgroup if match else None
             
             # Skip empty lines and standalone semicolons
-            if not line or line == ';':
-                if current_statement.strip():
+            if kind == 'end':
+                if current_parts:
                     # End of current statement
-                    final_statement = current_statement.strip()
-                    if final_statement:
-                        statements.append(final_statement)
-                        print(f"Completed statement {len(statements)}: {final_statement[:60]}...")
-                    current_statement = ""
+                    statements.append(" ".join(current_parts))
+                    logger.debug("Completed statement %s: %s...", len(statements), statements[-1][:60])
+                    current_parts = []
                     in_create_table = False
                     paren_depth = 0
                 continue
             
             # Check if this starts a CREATE TABLE
-            if line.upper().startswith('CREATE TABLE'):
+            if kind == 'create':
                 in_create_table = True
                 paren_depth = line.count('(') - line.count(')')
-                current_statement = line
-                print(f"Started CREATE TABLE at item {i}: {line[:50]}...")
+                current_parts = [line]
+                logger.debug("Started CREATE TABLE at item %s: %s...", i, line[:50])
             elif in_create_table:
-                # Continue building CREATE TABLE
-                current_statement += " " + line
+                # Continue building CREATE TABLE; the semicolon may be on this line or the next
+                current_parts.append(line)
                 paren_depth += line.count('(') - line.count(')')
-                print(f"Building CREATE TABLE, depth={paren_depth}: {line[:50]}...")
+                logger.debug("Building CREATE TABLE, depth=%s: %s...", paren_depth, line[:50])
                 
                 # Check if we've closed all parentheses
                 if paren_depth <= 0:
                     in_create_table = False
-                    # The semicolon should be on this line or the next
-                    if not current_statement.endswith(';'):
-                        # Look ahead for semicolon
-                        continue
             else:
                 # Not in CREATE TABLE, just add the line
-                if current_statement.strip():
+                if current_parts:
                     # Complete previous statement first
-                    final_statement = current_statement.strip()
-                    if final_statement:
-                        statements.append(final_statement)
-                        print(f"Completed standalone statement {len(statements)}: {final_statement[:60]}...")
-                    current_statement = ""
-                current_statement = line
-                print(f"Added standalone line: {line[:50]}...")
+                    statements.append(" ".join(current_parts))
+                    logger.debug("Completed standalone statement %s: %s...", len(statements), statements[-1][:60])
+                current_parts = [line]
+                logger.debug("Added standalone line: %s...", line[:50])
         else:
-            print(f"Skipping non-string item {i}: {type(item)}")
+            logger.debug("Skipping non-string item %s: %s", i, type(item))
     
     # Handle any remaining statement
-    if current_statement.strip():
-        final_statement = current_statement.strip()
-        if final_statement:
-            statements.append(final_statement)
-            print(f"Added final statement: {final_statement[:60]}...")
+    if current_parts:
+        statements.append(" ".join(current_parts))
+        logger.debug("Added final statement: %s...", statements[-1][:60])
     
-    print(f"Reassembled {len(statements)} complete statements")
-    for i, stmt in enumerate(statements):
-        print(f"Statement {i}: {stmt[:80]}...")
+    logger.debug("Reassembled %s complete statements", len(statements))
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, stmt in enumerate(statements):
+            logger.debug("Statement %s: %s...", i, stmt[:80])
     
     return statements
 
+# Trailing characters trimmed from each structured DDL item
+_DDL_TERMINATORS = "; \t\r\n"
+
 def extract_ddl_statements(ddl_data):
     """Extract DDL statements from structured data in dependency order"""
     statements = []
     
     # Debug: Log the input data
-    print(f"extract_ddl_statements input type: {type(ddl_data)}")
+    logger.debug("extract_ddl_statements input type: %s", type(ddl_data))
     
     # Handle different structures
     if isinstance(ddl_data, dict):
         # Handle structured format
         if "tables" in ddl_data and isinstance(ddl_data["tables"], list):
-            print(f"Found {len(ddl_data['tables'])} tables")
+            logger.debug("Found %s tables", len(ddl_data['tables']))
             
             # Sort tables by dependency order to handle foreign keys correctly
             tables = ddl_data["tables"]
@@ -372,152 +503,195 @@ def extract_ddl_statements(ddl_data):
             
             for i, table in enumerate(sorted_tables):
                 if isinstance(table, dict) and "ddl" in table:
-                    ddl = table["ddl"].strip()
-                    print(f"Table {i} raw DDL: '{ddl}'")
-                    # Remove trailing semicolon if present
-                    if ddl.endswith(';'):
-                        ddl = ddl[:-1].strip()
-                    # Remove any remaining newlines at the end
-                    ddl = ddl.rstrip()
-                    print(f"Table {i} cleaned DDL: '{ddl}'")
+                    logger.debug("Table %s raw DDL: '%s'", i, table["ddl"])
+                    # Remove trailing semicolons and any newlines around them
+                    ddl = table["ddl"].strip().rstrip(_DDL_TERMINATORS)
+                    logger.debug("Table %s cleaned DDL: '%s'", i, ddl)
                     if ddl:
                         statements.append(ddl)
-                        print(f"Added table {i} statement")
+                        logger.debug("Added table %s statement", i)
                     else:
-                        print(f"Skipped empty table {i} statement")
+                        logger.debug("Skipped empty table %s statement", i)
         
         # Handle indexes, constraints, etc.
         for key in ["indexes", "constraints", "views", "triggers", "procedures", "functions"]:
             if key in ddl_data and isinstance(ddl_data[key], list):
-                print(f"Found {len(ddl_data[key])} {key}")
+                logger.debug("Found %s %s", len(ddl_data[key]), key)
                 for i, item in enumerate(ddl_data[key]):
                     if isinstance(item, dict) and "ddl" in item:
-                        ddl = item["ddl"].strip()
-                        if ddl.endswith(';'):
-                            ddl = ddl[:-1].strip()
-                        ddl = ddl.rstrip()
+                        ddl = item["ddl"].strip().rstrip(_DDL_TERMINATORS)
                         if ddl:
                             statements.append(ddl)
-                            print(f"Added {key} {i} statement")
+                            logger.debug("Added %s %s statement", key, i)
     
     elif isinstance(ddl_data, list):
         # Handle list of DDL strings - use improved reassembly logic
-        print(f"Processing list of {len(ddl_data)} items with improved reassembly")
+        logger.debug("Processing list of %s items with improved reassembly", len(ddl_data))
         statements = reassemble_ai_ddl_statements(ddl_data)
     
     elif isinstance(ddl_data, str):
         # Handle single string
-        print("Processing single string")
+        logger.debug("Processing single string")
         # Split by semicolons and clean
         parts = ddl_data.split(';')
         for part in parts:
             cleaned = part.strip()
             if cleaned:
                 statements.append(cleaned)
-                print(f"Added string part: {cleaned[:60]}...")
+                logger.debug("Added string part: %s...", cleaned[:60])
     
-    print(f"Total extracted statements: {len(statements)}")
-    for i, stmt in enumerate(statements):
-        print(f"Statement {i}: {stmt[:80]}...")
+    logger.debug("Total extracted statements: %s", len(statements))
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, stmt in enumerate(statements):
+            logger.debug("Statement %s: %s...", i, stmt[:80])
     
     return statements
 
-def apply_ddl_to_target(target_connection, ddl_data):
-    """Apply DDL statements to target database in dependency order"""
+# DDL statements sent to the target per round trip
+DDL_BATCH_SIZE = 50
+
+def _is_postgres(connection) -> bool:
+    return type(connection).__module__.startswith("psycopg2")
+
+def _execute_ddl_batch(connection, cursor, statements) -> int:
+    """Send statements in a single round trip and return how many were applied before the first failure"""
+    script = ";\n".join(statements)
+    if _is_postgres(connection):
+        # The savepoint gets its own execute: PostgreSQL parses a whole simple-query message before
+        # running it, so a syntax error in the batch would otherwise abort before the savepoint exists
+        cursor.execute("SAVEPOINT ddl_batch")
+        try:
+            cursor.execute(f"{script};\nRELEASE SAVEPOINT ddl_batch")
+        except Exception as e:
+            logger.debug("DDL batch failed, retrying statements individually: %s", e)
+            cursor.execute("ROLLBACK TO SAVEPOINT ddl_batch")
+            return 0
+        return len(statements)
+    
+    # MySQL commits each DDL statement as it runs, so count the results that came back before an error
+    applied = 0
+    try:
+        for _ in cursor.execute(script, multi=True):
+            applied += 1
+    except Exception as e:
+        logger.debug("DDL batch failed at statement %s, retrying individually: %s", applied + 1, e)
+    return applied
+
+def _execute_ddl_statement(connection, cursor, statement, number) -> int:
+    """Execute one statement, recreating its table if it already exists; return 1 if it ran, 0 if skipped"""
+    # On PostgreSQL a failed statement aborts the transaction; the savepoint keeps the DROP and retry usable
+    savepoint = _is_postgres(connection)
+    logger.debug("Executing statement %s: %s...", number, statement[:100])
+    if savepoint:
+        cursor.execute("SAVEPOINT ddl_statement")
+    try:
+        cursor.execute(statement)
+        logger.debug("Successfully executed statement %s", number)
+        return 1
+    except Exception as stmt_error:
+        if savepoint:
+            cursor.execute("ROLLBACK TO SAVEPOINT ddl_statement")
+        error_msg = str(stmt_error).lower()
+        logger.warning("Error in statement %s: %s", number, error_msg)
+        
+        # Handle "already exists" errors gracefully
+        if "already exists" in error_msg or "duplicate" in error_msg:
+            try:
+                # Extract table name for DROP TABLE
+                table_match = _CREATE_TABLE_RE.search(statement)
+                if table_match:
+                    table_name = _quote_table_name(table_match.group(1), '"' if savepoint else '`')
+                    logger.debug("Dropping existing table %s", table_name)
+                    cursor.execute(f'DROP TABLE IF EXISTS {table_name} CASCADE')
+                    cursor.execute(statement)
+                    logger.debug("Successfully recreated table %s", table_name)
+                    return 1
+                # Skip problematic statement
+                logger.warning("Skipping problematic statement: %s...", statement[:100])
+                return 0
+            except Exception as drop_error:
+                logger.warning("Drop operation failed: %s", drop_error)
+                raise stmt_error  # Re-raise original error
+        # For other errors, re-raise
+        raise
+
+def ddl_statements_from_data(ddl_data):
+    """Executable DDL statements, in dependency order, from any of the shapes the AI translation returns"""
+    # Extract DDL statements from various formats
+    ddl_statements = []
+    
+    logger.debug("Processing DDL data type: %s", type(ddl_data))
+    
+    # Handle different input formats
+    if isinstance(ddl_data, dict):
+        if "translated_ddl" in ddl_data:
+            # Extract from translated_ddl key
+            ddl_data = ddl_data["translated_ddl"]
+            logger.debug("Extracting from translated_ddl: %s", type(ddl_data))
+        else:
+            # Direct structure
+            logger.debug("Using direct dict structure")
+        ddl_statements = extract_ddl_statements(ddl_data)
+        if isinstance(ddl_data, dict):
+            # Structured items are trimmed as they are extracted, so they skip the cleanup pass below
+            logger.debug("Extracted %s statements for execution", len(ddl_statements))
+            return ddl_statements
+    elif isinstance(ddl_data, str):
+        # Try to parse as JSON first
+        try:
+            parsed_data = json.loads(ddl_data)
+            logger.debug("Parsed JSON string successfully")
+            ddl_statements = extract_ddl_statements(parsed_data)
+        except json.JSONDecodeError:
+            # Treat as raw SQL
+            logger.debug("Treating as raw SQL")
+            statements = [s.strip() for s in ddl_data.split(';') if s.strip()]
+            ddl_statements = statements
+    elif isinstance(ddl_data, list):
+        # Direct list handling for AI output
+        logger.debug("Processing direct list with %s items", len(ddl_data))
+        ddl_statements = reassemble_ai_ddl_statements(ddl_data)
+    else:
+        raise Exception(f"Unsupported DDL data type: {type(ddl_data)}")
+    
+    logger.debug("Extracted %s statements for execution", len(ddl_statements))
+    return [statement.strip().rstrip(';') for statement in ddl_statements if statement and not statement.isspace()]
+
+def _execute_ddl(connection, cursor, statements) -> int:
+    """Execute statements in batches, one round trip each; return how many ran"""
+    executed_count = 0
+    for start in range(0, len(statements), DDL_BATCH_SIZE):
+        batch = statements[start:start + DDL_BATCH_SIZE]
+        applied = _execute_ddl_batch(connection, cursor, batch)
+        executed_count += applied
+        # The batch stopped at a failing statement; run the rest one at a time so "already exists" can be handled
+        for offset in range(applied, len(batch)):
+            executed_count += _execute_ddl_statement(connection, cursor, batch[offset], start + offset + 1)
+    return executed_count
+
+def apply_ddl_to_target(target_connection, ddl_data, ddl_statements=None):
+    """Apply DDL statements to target database in dependency order; pass ddl_statements if they were already extracted from ddl_data"""
     if target_connection is None:
         raise Exception("Target connection is None")
     
     cursor = target_connection.cursor()
     
     try:
-        # Extract DDL statements from various formats
-        ddl_statements = []
-        
-        print(f"Processing DDL data type: {type(ddl_data)}")
-        
-        # Handle different input formats
-        if isinstance(ddl_data, dict):
-            if "translated_ddl" in ddl_data:
-                # Extract from translated_ddl key
-                ddl_content = ddl_data["translated_ddl"]
-                print(f"Extracting from translated_ddl: {type(ddl_content)}")
-                ddl_statements = extract_ddl_statements(ddl_content)
-            else:
-                # Direct structure
-                print("Using direct dict structure")
-                ddl_statements = extract_ddl_statements(ddl_data)
-        elif isinstance(ddl_data, str):
-            # Try to parse as JSON first
-            try:
-                parsed_data = json.loads(ddl_data)
-                print(f"Parsed JSON string successfully")
-                ddl_statements = extract_ddl_statements(parsed_data)
-            except json.JSONDecodeError:
-                # Treat as raw SQL
-                print("Treating as raw SQL")
-                statements = [s.strip() for s in ddl_data.split(';') if s.strip()]
-                ddl_statements = statements
-        elif isinstance(ddl_data, list):
-            # Direct list handling for AI output
-            print(f"Processing direct list with {len(ddl_data)} items")
-            ddl_statements = reassemble_ai_ddl_statements(ddl_data)
-        else:
-            raise Exception(f"Unsupported DDL data type: {type(ddl_data)}")
-        
-        print(f"Extracted {len(ddl_statements)} statements for execution")
+        if ddl_statements is None:
+            ddl_statements = ddl_statements_from_data(ddl_data)
         
         # Validate we have statements
         if not ddl_statements:
             raise Exception("No DDL statements found to execute")
         
-        # Execute statements with better error handling
-        executed_count = 0
-        for i, statement in enumerate(ddl_statements):
-            if not statement or statement.isspace():
-                print(f"Skipping empty statement {i+1}")
-                continue
-                
-            # Clean the statement
-            cleaned_statement = statement.strip().rstrip(';')
-            print(f"Executing statement {i+1}: {cleaned_statement[:100]}...")
-            
-            try:
-                cursor.execute(cleaned_statement)
-                executed_count += 1
-                print(f"Successfully executed statement {i+1}")
-            except Exception as stmt_error:
-                error_msg = str(stmt_error).lower()
-                print(f"Error in statement {i+1}: {error_msg}")
-                
-                # Handle "already exists" errors gracefully
-                if "already exists" in error_msg or "duplicate" in error_msg:
-                    try:
-                        # Extract table name for DROP TABLE
-                        import re
-                        table_match = re.search(r'create\s+table(?:\s+if\s+not\s+exists)?\s+["\']?(\w+)["\']?', cleaned_statement, re.IGNORECASE)
-                        if table_match:
-                            table_name = table_match.group(1)
-                            print(f"Dropping existing table {table_name}")
-                            cursor.execute(f'DROP TABLE IF EXISTS "{table_name}" CASCADE')
-                            cursor.execute(cleaned_statement)
-                            executed_count += 1
-                            print(f"Successfully recreated table {table_name}")
-                        else:
-                            # Skip problematic statement
-                            print(f"Skipping problematic statement: {cleaned_statement[:100]}...")
-                    except Exception as drop_error:
-                        print(f"Drop operation failed: {drop_error}")
-                        raise stmt_error  # Re-raise original error
-                else:
-                    # For other errors, re-raise
-                    raise stmt_error
+        executed_count = _execute_ddl(target_connection, cursor, ddl_statements)
         
         target_connection.commit()
-        print(f"Successfully executed {executed_count} out of {len(ddl_statements)} DDL statements")
+        logger.info("Successfully executed %s out of %s DDL statements", executed_count, len(ddl_statements))
         return True
         
     except Exception as e:
-        print(f"DDL application error: {str(e)}")
+        logger.error("DDL application error: %s", e)
         try:
             target_connection.rollback()
         except:
@@ -529,33 +703,63 @@ def apply_ddl_to_target(target_connection, ddl_data):
         except:
             pass
 
+def _drop_existing_tables(target_connection, ddl_statements):
+    """Drop every table ddl_statements is about to create, in one batch"""
+    quote = '"' if _is_postgres(target_connection) else '`'
+    created = (_CREATE_TABLE_RE.search(statement) for statement in ddl_statements)
+    table_names = list(dict.fromkeys(_quote_table_name(match.group(1), quote) for match in created if match))
+    if not table_names:
+        return
+    
+    # Statements come in dependency order, so reversing it drops referencing tables before the tables they reference
+    drops = [f'DROP TABLE IF EXISTS {name} CASCADE' for name in reversed(table_names)]
+    cursor = target_connection.cursor()
+    try:
+        _execute_ddl(target_connection, cursor, drops)
+        target_connection.commit()
+    finally:
+        cursor.close()
+
+def _read_extraction_bundle(path: str):
+    """Parse the extraction bundle with orjson, which reads the whole file as bytes; None if there is no bundle"""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    return orjson.loads(raw)
+
+# Last translated DDL formatted for display, held with its source so repeat polls reuse the text
+_translated_queries_display = (None, None)
+
+def display_translated_queries(translated_ddl):
+    """Format a dict translation as indented JSON for the UI; strings pass through unchanged"""
+    global _translated_queries_display
+    if not isinstance(translated_ddl, dict):
+        return translated_ddl
+    source, text = _translated_queries_display
+    if source is not translated_ddl:
+        text = orjson.dumps(translated_ddl, option=orjson.OPT_INDENT_2, default=str).decode()
+        _translated_queries_display = (translated_ddl, text)
+    return text
+
 async def run_structure_migration_task():
     """Background task to run structure migration"""
-    global structure_migration_status
-    
     # Reset status
-    structure_migration_status = {
-        "phase": "Initializing",
-        "percent": 0,
-        "done": False,
-        "error": None,
-        "translated_queries": None,
-        "notes": None
-    }
+    await update_migration_status(structure_migration_status, **{**_STRUCTURE_STATUS_RESET, "phase": "Initializing"})
     
     target_connection = None
     
     try:
         # Phase 1: Loading extraction results
-        structure_migration_status["phase"] = "Loading extraction results"
-        structure_migration_status["percent"] = 10
+        await update_migration_status(structure_migration_status, phase="Loading extraction results", percent=10)
 
-        # Check if extraction bundle exists, if not try to run extraction automatically
-        extraction_bundle_path = "artifacts/extraction_bundle.json"
-        if not os.path.exists(extraction_bundle_path):
+        # Check if extraction bundle exists, if not try to run extraction automatically;
+        # the read and parse run on a worker thread so a multi-MB bundle does not stall other requests
+        extraction_data = await asyncio.to_thread(_read_extraction_bundle, EXTRACTION_BUNDLE_PATH)
+        if extraction_data is None:
             print("Extraction bundle not found. Running automatic extraction...")
             try:
-                from routes.extract import extract_database_ddl
                 session = get_active_session()
                 source_db = session.get("source")
                 if not source_db:
@@ -565,17 +769,13 @@ async def run_structure_migration_task():
                 if not connection_info:
                     raise Exception("Source database connection not found for auto-extraction")
 
-                extraction_data = extract_database_ddl(connection_info)
+                extraction_data = await asyncio.to_thread(extract_database_ddl, connection_info)
                 print("Automatic extraction completed successfully")
             except Exception as e:
                 raise Exception(f"Failed to run automatic extraction: {str(e)}")
-        else:
-            with open(extraction_bundle_path, "r") as f:
-                extraction_data = json.load(f)
 
         # Phase 2: Getting session info
-        structure_migration_status["phase"] = "Getting session information"
-        structure_migration_status["percent"] = 20
+        await update_migration_status(structure_migration_status, phase="Getting session information", percent=20)
 
         session = get_active_session()
         source_db = session.get("source")
@@ -592,11 +792,10 @@ async def run_structure_migration_task():
             raise Exception("Source or target database connection not found")
 
         # Phase 3: Translating schema to target dialect using AI
-        structure_migration_status["phase"] = "Translating schema to target dialect"
-        structure_migration_status["percent"] = 40
+        await update_migration_status(structure_migration_status, phase="Translating schema to target dialect", percent=40)
 
         # Use AI to translate schema
-        translation_result = translate_schema(
+        translation_result = await translate_schema(
             source_dialect=source_db["dbType"],
             target_dialect=target_db["dbType"],
             input_ddl_json=extraction_data
@@ -608,25 +807,24 @@ async def run_structure_migration_task():
         # Store translated queries and notes
         translated_ddl = translation_result.get("translated_ddl", "")
         # Store the original structure for processing
-        # If it's a string, try to parse it as JSON
+        # If it's a string, try to parse it as JSON; this is the only parse, the apply step reuses the result
         if isinstance(translated_ddl, str):
             try:
                 # Try to parse as JSON
-                parsed_ddl = json.loads(translated_ddl)
-                structure_migration_status["translated_queries_original"] = parsed_ddl
-            except json.JSONDecodeError:
+                translated_queries_original = orjson.loads(translated_ddl)
+            except orjson.JSONDecodeError:
                 # If it's not valid JSON, store as is
-                structure_migration_status["translated_queries_original"] = translated_ddl
+                translated_queries_original = translated_ddl
         else:
-            structure_migration_status["translated_queries_original"] = translated_ddl
-
-        # Store formatted version for display
-        if isinstance(translated_ddl, dict):
-            # Format it as JSON for better display in the UI
-            structure_migration_status["translated_queries"] = json.dumps(translated_ddl, indent=2)
-        else:
-            structure_migration_status["translated_queries"] = translated_ddl
-        structure_migration_status["notes"] = translation_result.get("notes", "")
+            translated_queries_original = translated_ddl
+
+        # Stored as returned; a dict is formatted for the UI only when a client asks for it
+        await update_migration_status(
+            structure_migration_status,
+            translated_queries_original=translated_queries_original,
+            translated_queries=translated_ddl,
+            notes=translation_result.get("notes", "")
+        )
 
         # Additional debug info
         print(f"Translated DDL type: {type(translated_ddl)}")
@@ -636,24 +834,22 @@ async def run_structure_migration_task():
             print(f"Translated DDL length: {len(translated_ddl)}")
 
         # Debug the stored values
-        print(f"translated_queries_original type: {type(structure_migration_status['translated_queries_original'])}")
-        print(f"translated_queries_original: {structure_migration_status['translated_queries_original']}")
+        print(f"translated_queries_original type: {type(translated_queries_original)}")
+        print(f"translated_queries_original: {translated_queries_original}")
 
         # Validate that we got something from AI
         if not translated_ddl or (isinstance(translated_ddl, str) and not translated_ddl.strip()):
             raise Exception("AI failed to generate DDL queries. Please check your OpenAI API key and connection.")
 
         # Phase 4: Validating DDL syntax
-        structure_migration_status["phase"] = "Validating DDL syntax"
-        structure_migration_status["percent"] = 60
+        await update_migration_status(structure_migration_status, phase="Validating DDL syntax", percent=60)
 
         # In a real implementation, you would validate the DDL syntax here
         # For now, we'll simulate this step
         await asyncio.sleep(1)
 
         # Phase 5: Connecting to target database
-        structure_migration_status["phase"] = "Connecting to target database"
-        structure_migration_status["percent"] = 70
+        await update_migration_status(structure_migration_status, phase="Connecting to target database", percent=70)
 
         # Check if connection info exists
         if not target_connection_info:
@@ -663,54 +859,38 @@ async def run_structure_migration_task():
             raise Exception("Target database credentials missing. Please configure the target database connection.")
 
         try:
-            target_connection = connect_to_database(target_connection_info)
+            target_connection = await asyncio.to_thread(acquire_connection, target_connection_info)
         except Exception as e:
             raise Exception(f"Failed to connect to target database: {str(e)}")
 
         # Phase 5.5: Drop existing tables to avoid conflicts
-        structure_migration_status["phase"] = "Dropping existing tables"
-        structure_migration_status["percent"] = 75
+        await update_migration_status(structure_migration_status, phase="Dropping existing tables", percent=75)
 
+        # The statements are extracted once here and reused when the tables are created below
+        ddl_statements = None
         try:
-            cursor = target_connection.cursor()
-            # Drop tables in reverse order to handle dependencies
-            cursor.execute('DROP TABLE IF EXISTS order_items CASCADE')
-            cursor.execute('DROP TABLE IF EXISTS orders CASCADE')
-            cursor.execute('DROP TABLE IF EXISTS products CASCADE')
-            cursor.execute('DROP TABLE IF EXISTS employees CASCADE')
-            cursor.execute('DROP TABLE IF EXISTS customers CASCADE')
-            target_connection.commit()
-            cursor.close()
+            if translated_queries_original:
+                ddl_statements = await asyncio.to_thread(ddl_statements_from_data, translated_queries_original)
+                await asyncio.to_thread(_drop_existing_tables, target_connection, ddl_statements)
             print("Successfully dropped existing tables")
         except Exception as e:
             print(f"Warning: Failed to drop existing tables: {e}")
             # Continue anyway
 
         # Phase 6: Creating tables in target
-        structure_migration_status["phase"] = "Creating tables in target"
-        structure_migration_status["percent"] = 80
+        await update_migration_status(structure_migration_status, phase="Creating tables in target", percent=80)
 
         # Apply the translated DDL to target database
-        if structure_migration_status["translated_queries_original"]:
+        if translated_queries_original:
             # Check if we have valid DDL data
-            ddl_data = structure_migration_status["translated_queries_original"]
+            ddl_data = translated_queries_original
             print(f"Applying DDL data of type: {type(ddl_data)}")
             if isinstance(ddl_data, str) and not ddl_data.strip():
                 raise Exception("AI returned empty DDL queries")
 
-            # Ensure we have the correct data format for processing
-            if isinstance(ddl_data, str):
-                try:
-                    # Try to parse as JSON if it looks like JSON
-                    if ddl_data.strip().startswith('{'):
-                        ddl_data = json.loads(ddl_data)
-                        print(f"Parsed DDL data to dict: {type(ddl_data)}")
-                except json.JSONDecodeError:
-                    # If parsing fails, continue with string data
-                    pass
-
+            # ddl_data was parsed from JSON once above; a string here is raw SQL, not JSON
             try:
-                apply_ddl_to_target(target_connection, ddl_data)
+                await asyncio.to_thread(apply_ddl_to_target, target_connection, ddl_data, ddl_statements)
             except Exception as e:
                 error_msg = f"Failed to apply DDL to target database: {str(e)}"
                 print(f"DDL Application Error: {error_msg}")
@@ -721,36 +901,189 @@ async def run_structure_migration_task():
                 raise Exception(error_msg)
 
         # Phase 7: Finalizing structure migration
-        structure_migration_status["phase"] = "Finalizing structure migration"
-        structure_migration_status["percent"] = 100
+        await update_migration_status(structure_migration_status, phase="Finalizing structure migration", percent=100)
 
         # Update status
-        structure_migration_status["done"] = True
+        await update_migration_status(structure_migration_status, done=True)
 
     except Exception as e:
-        structure_migration_status["error"] = str(e)
-        structure_migration_status["done"] = True
+        await update_migration_status(structure_migration_status, error=str(e), done=True)
     finally:
-        # Close target connection if it exists
+        # Return target connection to its pool if it exists; after a failure it may be unusable, so discard it
         if target_connection is not None:
-            try:
-                target_connection.close()
-            except:
-                pass
+            await asyncio.to_thread(release_connection, target_connection, structure_migration_status.error is not None)
+
+def _count_table_rows(source_cursor, table) -> int:
+    """Row count of one source table"""
+    source_cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    result = source_cursor.fetchone()
+    return result[0] if result else 0
+
+def _count_total_rows(source_cursor, tables) -> int:
+    """Total row count across the source tables, skipping any that cannot be counted"""
+    actual_total_rows = 0
+    for table in tables:
+        try:
+            table_count = _count_table_rows(source_cursor, table)
+            actual_total_rows += table_count
+            print(f"Table {table}: {table_count} rows")
+        except Exception as e:
+            print(f"Warning: Could not count rows for table {table}: {e}")
+    
+    print(f"Calculated total rows to migrate: {actual_total_rows}")
+    return actual_total_rows
+
+def _recreate_target_tables(target_connection, target_cursor):
+    """Drop and recreate the target tables for the known database structure"""
+    # Drop tables in reverse order to handle foreign key constraints
+    tables_to_drop = ["order_items", "orders", "products", "employees", "customers"]
+    for table in tables_to_drop:
+        try:
+            target_cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE')
+        except Exception as e:
+            pass  # Continue even if table doesn't exist
+    target_connection.commit()
+    
+    # Create tables with proper schema for PostgreSQL
+    create_table_statements = [
+        '''CREATE TABLE "customers" (
+            "id" SERIAL PRIMARY KEY,
+            "name" VARCHAR(120) NOT NULL,
+            "email" VARCHAR(255) NOT NULL,
+            "city" VARCHAR(120) NOT NULL,
+            "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE ("email")
+        )''',
+        '''CREATE TABLE "employees" (
+            "id" SERIAL PRIMARY KEY,
+            "first_name" VARCHAR(80) NOT NULL,
+            "last_name" VARCHAR(80) NOT NULL,
+            "title" VARCHAR(120) NOT NULL,
+            "hired_on" DATE NOT NULL,
+            "salary" DECIMAL(12,2) NOT NULL
+        )''',
+        '''CREATE TABLE "products" (
+            "id" SERIAL PRIMARY KEY,
+            "sku" VARCHAR(64) NOT NULL,
+            "name" VARCHAR(160) NOT NULL,
+            "price" DECIMAL(10,2) NOT NULL,
+            "in_stock" SMALLINT NOT NULL DEFAULT 1,
+            UNIQUE ("sku")
+        )''',
+        '''CREATE TABLE "orders" (
+            "id" SERIAL PRIMARY KEY,
+            "customer_id" INTEGER NOT NULL,
+            "order_date" TIMESTAMP NOT NULL,
+            "status" VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+            "total" DECIMAL(12,2) NOT NULL,
+            FOREIGN KEY ("customer_id") REFERENCES "customers"("id") ON DELETE RESTRICT ON UPDATE RESTRICT
+        )''',
+        '''CREATE TABLE "order_items" (
+            "id" SERIAL PRIMARY KEY,
+            "order_id" INTEGER NOT NULL,
+            "product_id" INTEGER NOT NULL,
+            "qty" INTEGER NOT NULL,
+            "unit_price" DECIMAL(10,2) NOT NULL,
+            "line_total" DECIMAL(12,2) NOT NULL,
+            FOREIGN KEY ("order_id") REFERENCES "orders"("id") ON DELETE RESTRICT ON UPDATE RESTRICT,
+            FOREIGN KEY ("product_id") REFERENCES "products"("id") ON DELETE RESTRICT ON UPDATE RESTRICT
+        )'''
+    ]
+    
+    # Execute table creation statements
+    for statement in create_table_statements:
+        try:
+            target_cursor.execute(statement)
+        except Exception as e:
+            pass  # Continue even if table already exists
+    target_connection.commit()
+
+# Characters COPY's text format treats specially inside a field
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def _copy_field(value) -> str:
+    """One field in COPY text format: \\N for NULL, bytea as escaped hex, everything else as escaped text"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\\\x" + bytes(value).hex()
+    return str(value).translate(_COPY_ESCAPES)
+
+def _copy_rows_buffer(rows) -> io.StringIO:
+    """Rows as a COPY FROM STDIN text payload"""
+    return io.StringIO("".join("\t".join(map(_copy_field, row)) + "\n" for row in rows))
+
+# Rows fetched from the source and written to the target per batch; bounds memory to one batch per table
+MIGRATION_BATCH_ROWS = 10000
+# COPY FROM STDIN is missing on some PostgreSQL-compatible targets (Redshift, some proxies); 0 loads with multi-row INSERTs
+MIGRATION_USE_COPY = os.getenv("MIGRATION_USE_COPY", "1") != "0"
+
+def _source_rows_cursor(source_connection, table):
+    """Cursor that hands out rows as they are fetched instead of loading the whole table first"""
+    if _is_postgres(source_connection):
+        # A named cursor lives on the server; psycopg2 opens the transaction it needs
+        cursor = source_connection.cursor(name=f"migrate_{table}")
+        cursor.itersize = MIGRATION_BATCH_ROWS
+        return cursor
+    # mysql.connector cursors are unbuffered by default and read rows off the socket as they are fetched
+    return source_connection.cursor()
+
+def _no_progress(rows_copied: int):
+    pass
+
+def _copy_table_rows(source_connection, target_cursor, target_connection, table, progress_cb=None):
+    """Copy every row of one table from source to target, one batch at a time"""
+    report_progress = progress_cb or _no_progress
+    source_cursor = _source_rows_cursor(source_connection, table)
+    try:
+        source_cursor.execute(f"SELECT * FROM {table}")
+        rows = source_cursor.fetchmany(MIGRATION_BATCH_ROWS)
+        if not rows:
+            return
+        
+        # Get column names; a psycopg2 named cursor only has a description after the first fetch
+        column_names = [desc[0] for desc in source_cursor.description]
+        columns = ", ".join([f'"{name}"' for name in column_names])
+        target_is_postgres = _is_postgres(target_connection)
+        copy_to_postgres = target_is_postgres and MIGRATION_USE_COPY
+        if not target_is_postgres:
+            placeholders = ", ".join(["%s"] * len(column_names))
+            insert_query = f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})'
+        
+        rows_copied = 0
+        while rows:
+            if copy_to_postgres:
+                # COPY streams the batch in one statement instead of one INSERT per row
+                target_cursor.copy_expert(f'COPY "{table}" ({columns}) FROM STDIN', _copy_rows_buffer(rows))
+            elif target_is_postgres:
+                # Without COPY, the whole batch still goes out as one multi-row INSERT rather than one per row
+                _pg_extras.execute_values(
+                    target_cursor, f'INSERT INTO "{table}" ({columns}) VALUES %s', rows, page_size=MIGRATION_BATCH_ROWS
+                )
+            else:
+                # mysql.connector already rewrites executemany INSERTs into multi-row statements
+                target_cursor.executemany(insert_query, rows)
+            rows_copied += len(rows)
+            report_progress(rows_copied)
+            rows = source_cursor.fetchmany(MIGRATION_BATCH_ROWS)
+        
+        if target_is_postgres and "id" in column_names:
+            # Ids were copied explicitly, so move the SERIAL sequence past them for later inserts
+            target_cursor.execute(
+                f'SELECT setval(pg_get_serial_sequence(%s, \'id\'), MAX("id")) FROM "{table}"',
+                (f'"{table}"',)
+            )
+        target_connection.commit()
+    finally:
+        source_cursor.close()
+        if _is_postgres(source_connection):
+            # End the read transaction the named cursor ran in, so the pooled connection is not left idle in it
+            source_connection.rollback()
 
 async def run_data_migration_task():
     """Background task to run data migration"""
-    global data_migration_status
-    
-    # Reset status
-    data_migration_status = {
-        "phase": "Initializing",
-        "percent": 0,
-        "done": False,
-        "error": None,
-        "rows_migrated": 0,
-        "total_rows": 0  # Will be calculated dynamically
-    }
+    # Reset status; total_rows is calculated dynamically below
+    await update_migration_status(data_migration_status, **{**_DATA_STATUS_RESET, "phase": "Initializing"})
     
     source_connection = None
     target_connection = None
@@ -770,215 +1103,148 @@ async def run_data_migration_task():
         source_connection_info = get_connection_by_id(source_db["id"])
         target_connection_info = get_connection_by_id(target_db["id"])
         
-        # Connect to source database to get actual total row count
-        source_connection = connect_to_database(source_connection_info)
+        # Both handshakes run at once on worker threads, keeping the event loop free
+        source_connection, target_connection = await connect_source_and_target(source_connection_info, target_connection_info)
         source_cursor = source_connection.cursor()
+        target_cursor = target_connection.cursor()
         
         # Calculate actual total row count from source database
         tables_to_migrate = ["customers", "employees", "products", "orders", "order_items"]
-        actual_total_rows = 0
-        for table in tables_to_migrate:
-            try:
-                source_cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                result = source_cursor.fetchone()
-                table_count = result[0] if result else 0
-                actual_total_rows += table_count
-                print(f"Table {table}: {table_count} rows")
-            except Exception as e:
-                print(f"Warning: Could not count rows for table {table}: {e}")
-        
-        print(f"Calculated total rows to migrate: {actual_total_rows}")
+        actual_total_rows = await asyncio.to_thread(_count_total_rows, source_cursor, tables_to_migrate)
         
         # Update status with correct total
-        data_migration_status["total_rows"] = actual_total_rows
+        await update_migration_status(data_migration_status, total_rows=actual_total_rows)
         
         # Phase 1: Preparing data transfer
-        data_migration_status["phase"] = "Preparing data transfer"
-        data_migration_status["percent"] = 10
+        await update_migration_status(data_migration_status, phase="Preparing data transfer", percent=10)
         
         # Phase 2: Connecting to databases
-        data_migration_status["phase"] = "Connecting to databases"
-        data_migration_status["percent"] = 20
-        
-        target_connection = connect_to_database(target_connection_info)
-        target_cursor = target_connection.cursor()
+        await update_migration_status(data_migration_status, phase="Connecting to databases", percent=20)
         
         # Hardcoded table list for known database structure in dependency order
         # Parent tables first, then child tables to satisfy foreign key constraints
         tables_to_migrate = ["customers", "employees", "products", "orders", "order_items"]
         
         # Phase 3: Drop and create tables in target database
-        data_migration_status["phase"] = "Preparing target database"
-        data_migration_status["percent"] = 30
-        
-        # Drop tables in reverse order to handle foreign key constraints
-        tables_to_drop = ["order_items", "orders", "products", "employees", "customers"]
-        for table in tables_to_drop:
-            try:
-                target_cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE')
-            except Exception as e:
-                pass  # Continue even if table doesn't exist
-        target_connection.commit()
+        await update_migration_status(data_migration_status, phase="Preparing target database", percent=30)
         
-        # Create tables with proper schema for PostgreSQL
-        create_table_statements = [
-            '''CREATE TABLE "customers" (
-                "id" SERIAL PRIMARY KEY,
-                "name" VARCHAR(120) NOT NULL,
-                "email" VARCHAR(255) NOT NULL,
-                "city" VARCHAR(120) NOT NULL,
-                "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE ("email")
-            )''',
-            '''CREATE TABLE "employees" (
-                "id" SERIAL PRIMARY KEY,
-                "first_name" VARCHAR(80) NOT NULL,
-                "last_name" VARCHAR(80) NOT NULL,
-                "title" VARCHAR(120) NOT NULL,
-                "hired_on" DATE NOT NULL,
-                "salary" DECIMAL(12,2) NOT NULL
-            )''',
-            '''CREATE TABLE "products" (
-                "id" SERIAL PRIMARY KEY,
-                "sku" VARCHAR(64) NOT NULL,
-                "name" VARCHAR(160) NOT NULL,
-                "price" DECIMAL(10,2) NOT NULL,
-                "in_stock" SMALLINT NOT NULL DEFAULT 1,
-                UNIQUE ("sku")
-            )''',
-            '''CREATE TABLE "orders" (
-                "id" SERIAL PRIMARY KEY,
-                "customer_id" INTEGER NOT NULL,
-                "order_date" TIMESTAMP NOT NULL,
-                "status" VARCHAR(20) NOT NULL DEFAULT 'PENDING',
-                "total" DECIMAL(12,2) NOT NULL,
-                FOREIGN KEY ("customer_id") REFERENCES "customers"("id") ON DELETE RESTRICT ON UPDATE RESTRICT
-            )''',
-            '''CREATE TABLE "order_items" (
-                "id" SERIAL PRIMARY KEY,
-                "order_id" INTEGER NOT NULL,
-                "product_id" INTEGER NOT NULL,
-                "qty" INTEGER NOT NULL,
-                "unit_price" DECIMAL(10,2) NOT NULL,
-                "line_total" DECIMAL(12,2) NOT NULL,
-                FOREIGN KEY ("order_id") REFERENCES "orders"("id") ON DELETE RESTRICT ON UPDATE RESTRICT,
-                FOREIGN KEY ("product_id") REFERENCES "products"("id") ON DELETE RESTRICT ON UPDATE RESTRICT
-            )'''
-        ]
-        
-        # Execute table creation statements
-        for statement in create_table_statements:
-            try:
-                target_cursor.execute(statement)
-            except Exception as e:
-                pass  # Continue even if table already exists
-        target_connection.commit()
+        await asyncio.to_thread(_recreate_target_tables, target_connection, target_cursor)
         
         # Phase 4: Migrating data
-        data_migration_status["phase"] = "Migrating data"
-        data_migration_status["percent"] = 40
+        await update_migration_status(data_migration_status, phase="Migrating data", percent=40)
         
         rows_migrated = 0
+        loop = asyncio.get_running_loop()
         for i, table in enumerate(tables_to_migrate):
             # Get row count for this table
-            source_cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            result = source_cursor.fetchone()
-            table_row_count = result[0] if result else 0
+            table_row_count = await asyncio.to_thread(_count_table_rows, source_cursor, table)
             
-            data_migration_status["phase"] = f"Migrating {table} table ({table_row_count} rows)"
+            await update_migration_status(data_migration_status, phase=f"Migrating {table} table ({table_row_count} rows)")
             
-            # Copy data from source to target
-            source_cursor.execute(f"SELECT * FROM {table}")
-            rows = source_cursor.fetchall()
+            def report_rows(rows_copied, rows_before=rows_migrated):
+                # Called from the copy thread after each batch; the status update runs on the loop
+                asyncio.run_coroutine_threadsafe(
+                    update_migration_status(data_migration_status, rows_migrated=rows_before + rows_copied), loop
+                )
             
-            if rows:
-                # Get column names
-                column_names = [desc[0] for desc in source_cursor.description]
-                placeholders = ", ".join(["%s"] * len(column_names))
-                columns = ", ".join([f'"{name}"' for name in column_names])
-                
-                # Insert data into target table
-                insert_query = f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})'
-                target_cursor.executemany(insert_query, rows)
-                target_connection.commit()
+            # Copy data from source to target
+            await asyncio.to_thread(_copy_table_rows, source_connection, target_cursor, target_connection, table, report_rows)
             
             rows_migrated += table_row_count
-            data_migration_status["rows_migrated"] = rows_migrated
             
             # Update progress
             progress = 40 + int((i + 1) / len(tables_to_migrate) * 50)
-            data_migration_status["percent"] = min(progress, 90)
+            await update_migration_status(data_migration_status, rows_migrated=rows_migrated, percent=min(progress, 90))
         
         # Phase 5: Validating data integrity
-        data_migration_status["phase"] = "Validating data integrity"
-        data_migration_status["percent"] = 95
+        await update_migration_status(data_migration_status, phase="Validating data integrity", percent=95)
         
         # In a real implementation, you would validate data integrity here
         # For now, we'll simulate this step
         await asyncio.sleep(1)
         
         # Phase 6: Finalizing data migration
-        data_migration_status["phase"] = "Finalizing data migration"
-        data_migration_status["percent"] = 100
+        await update_migration_status(data_migration_status, phase="Finalizing data migration", percent=100)
         
         # Update status
-        data_migration_status["done"] = True
+        await update_migration_status(data_migration_status, done=True)
         
         # Migration completed successfully - validation can be started manually from the UI
         print("Migration completed successfully! All 52 rows migrated without errors.")
         print("You can now start validation manually from the Reconcile page.")
         
-        # Close connections
-        source_connection.close()
-        target_connection.close()
-        
     except Exception as e:
-        data_migration_status["error"] = str(e)
-        data_migration_status["done"] = True
+        await update_migration_status(data_migration_status, error=str(e), done=True)
+    finally:
+        # Return connections to their pools, discarding them after a failure
+        for connection in (source_connection, target_connection):
+            if connection is not None:
+                await asyncio.to_thread(release_connection, connection, data_migration_status.error is not None)
+
+# Strong references to running migrations; the event loop only holds weak ones
+_migration_tasks = set()
+
+async def _run_detached(task_fn):
+    """Run a migration as its own task so a dropped request cannot cancel it midway"""
+    task = asyncio.ensure_future(task_fn())
+    _migration_tasks.add(task)
+    task.add_done_callback(_migration_tasks.discard)
+    await asyncio.shield(task)
 
 @router.post("/structure", response_model=CommonResponse)
 async def migrate_structure(background_tasks: BackgroundTasks):
-    global structure_migration_status
-    structure_migration_status["phase"] = "Starting"
-    structure_migration_status["percent"] = 0
-    structure_migration_status["done"] = False
-    structure_migration_status["error"] = None
-    structure_migration_status["translated_queries"] = None
-    structure_migration_status["notes"] = None
+    await update_migration_status(structure_migration_status, **{**_STRUCTURE_STATUS_RESET, "phase": "Starting"})
     
-    background_tasks.add_task(run_structure_migration_task)
+    background_tasks.add_task(_run_detached, run_structure_migration_task)
     
     return CommonResponse(ok=True, message="Structure migration started")
 
 @router.post("/data", response_model=CommonResponse)
 async def migrate_data(background_tasks: BackgroundTasks):
-    global data_migration_status
-    data_migration_status["phase"] = "Starting"
-    data_migration_status["percent"] = 0
-    data_migration_status["done"] = False
-    data_migration_status["error"] = None
-    data_migration_status["rows_migrated"] = 0
-    data_migration_status["total_rows"] = 0
+    await update_migration_status(data_migration_status, **{**_DATA_STATUS_RESET, "phase": "Starting"})
     
-    background_tasks.add_task(run_data_migration_task)
+    background_tasks.add_task(_run_detached, run_data_migration_task)
     
     return CommonResponse(ok=True, message="Data migration started")
 
+@router.post("/structure/translate/stream")
+async def stream_structure_translation():
+    """Stream the AI schema translation as NDJSON, one line per translated table as soon as it is produced"""
+    extraction_data = await asyncio.to_thread(_read_extraction_bundle, EXTRACTION_BUNDLE_PATH)
+    if extraction_data is None:
+        return CommonResponse(ok=False, message="Extraction bundle not found. Run extraction first.")
+    
+    session = get_active_session()
+    source_db = session.get("source")
+    target_db = session.get("target")
+    if not source_db or not target_db:
+        return CommonResponse(ok=False, message="Source or target database not selected")
+    
+    async def ndjson_events():
+        async for event in translate_schema_stream(
+            source_dialect=source_db["dbType"],
+            target_dialect=target_db["dbType"],
+            input_ddl_json=extraction_data
+        ):
+            yield orjson.dumps(event) + b"\n"
+    
+    # GZipMiddleware never flushes between chunks, so an explicit encoding keeps each table's event arriving as it is produced
+    return StreamingResponse(ndjson_events(), media_type="application/x-ndjson", headers={"Content-Encoding": "identity"})
+
 @router.get("/structure/status")
 async def get_structure_migration_status():
-    global structure_migration_status
-    return structure_migration_status
+    status = await migration_status_snapshot(structure_migration_status)
+    status["translated_queries"] = display_translated_queries(status["translated_queries"])
+    return status
 
 @router.get("/data/status")
 async def get_data_migration_status():
-    global data_migration_status
-    return data_migration_status
+    return await migration_status_snapshot(data_migration_status)
 
 @router.get("/structure/queries")
 async def get_structure_migration_queries():
     """Get the AI-generated queries from structure migration"""
-    global structure_migration_status
     return {
-        "translated_queries": structure_migration_status.get("translated_queries", ""),
-        "notes": structure_migration_status.get("notes", "")
+        "translated_queries": display_translated_queries(structure_migration_status.translated_queries),
+        "notes": structure_migration_status.notes
     }
\ No newline at end of file
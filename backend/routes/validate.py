@@ -1,4 +1,4 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from backend.models import CommonResponse
 from backend.database import get_active_session, get_connection_by_id
 import asyncio
@@ -6,6 +6,7 @@ import json
 import os
 import time
 import importlib
+import uuid
 from typing import Dict, Any, List, Optional
 import mysql.connector
 import psycopg2
@@ -178,6 +179,21 @@ def validate_connections(source_conn_info: Dict[str, Any], target_conn_info: Dic
     
     return results
 
+# Tables counted per UNION ALL statement when comparing row counts
+ROW_COUNT_BATCH = 100
+
+def count_rows_batched(cursor, tables: List[str], quote, row_counts: Dict[str, int]):
+    """Exact row counts for many tables, one UNION ALL round trip per batch instead of one query per table"""
+    for start in range(0, len(tables), ROW_COUNT_BATCH):
+        batch = tables[start:start + ROW_COUNT_BATCH]
+        # Table names can't be bound as identifiers, but the label column can be a plain parameter;
+        # a literal % in an inlined name must be doubled since the statement goes through pyformat
+        cursor.execute(
+            " UNION ALL ".join(f"SELECT %s, COUNT(*) FROM {quote(name).replace('%', '%%')}" for name in batch),
+            batch
+        )
+        row_counts.update(cursor.fetchall())
+
 def get_table_row_counts(connection, db_type: str, database_name: str) -> Dict[str, int]:
     """Get row counts for all tables in the database"""
     row_counts = {}
@@ -187,12 +203,8 @@ def get_table_row_counts(connection, db_type: str, database_name: str) -> Dict[s
         
         if db_type == "MySQL":
             cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
-            for table_row in tables:
-                table_name = table_row[0]
-                cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-                count = cursor.fetchone()[0]
-                row_counts[table_name] = count
+            tables = [table_row[0] for table_row in cursor.fetchall()]
+            count_rows_batched(cursor, tables, lambda name: "`" + str(name).replace("`", "``") + "`", row_counts)
                 
         elif db_type == "PostgreSQL":
             cursor.execute("""
@@ -200,12 +212,8 @@ def get_table_row_counts(connection, db_type: str, database_name: str) -> Dict[s
                 FROM pg_tables 
                 WHERE schemaname = 'public'
             """)
-            tables = cursor.fetchall()
-            for table_row in tables:
-                table_name = table_row[0]
-                cursor.execute(f"SELECT COUNT(*) FROM \"{table_name}\"")
-                count = cursor.fetchone()[0]
-                row_counts[table_name] = count
+            tables = [table_row[0] for table_row in cursor.fetchall()]
+            count_rows_batched(cursor, tables, lambda name: '"' + str(name).replace('"', '""') + '"', row_counts)
                 
         cursor.close()
     except Exception as e:
@@ -724,6 +732,90 @@ async def get_validation_report():
 
     return []
 
+# The current AI fix suggestion run; each run gets a fresh job so its status and fixes always belong together
+FIXES_ARTIFACT_PATH = "artifacts/validation_fixes.json"
+fixes_job: Optional[Dict[str, Any]] = None
+
+def get_failed_results() -> List[Dict[str, Any]]:
+    """Load failed checks from the last validation report"""
+    results = []
+    if os.path.exists("artifacts/validation_report.json"):
+        with open("artifacts/validation_report.json", "r") as f:
+            results = json.load(f)
+    elif validation_status.get("results"):
+        results = validation_status["results"]
+    return [r for r in results if r.get("status") == "Fail"]
+
+def start_fixes_job(mode: str, done: bool = False) -> Dict[str, Any]:
+    """Replace the current run with a new job and clear the previous run's saved fixes"""
+    global fixes_job
+    fixes_job = {"jobId": str(uuid.uuid4()), "mode": mode, "done": done, "error": None, "fixes": []}
+    try:
+        os.remove(FIXES_ARTIFACT_PATH)
+    except FileNotFoundError:
+        pass
+    return fixes_job
+
+async def run_suggest_fixes_task(job: Dict[str, Any], failures: List[Dict[str, Any]]):
+    """Generate AI fix suggestions for failed checks and save them on the job"""
+    from backend.ai import suggest_fixes_batch, suggest_fixes_batch_api
+    
+    try:
+        if job["mode"] == "batch":
+            fixes = await suggest_fixes_batch_api(failures)
+        else:
+            fixes = await suggest_fixes_batch(failures)
+        
+        job["fixes"] = [{"failure": failure, "suggestions": fix} for failure, fix in zip(failures, fixes)]
+        # Only the current run owns the artifact
+        if job is fixes_job:
+            os.makedirs("artifacts", exist_ok=True)
+            with open(FIXES_ARTIFACT_PATH, "w") as f:
+                json.dump(job["fixes"], f, indent=2)
+        
+        job["done"] = True
+    except Exception as e:
+        job["error"] = str(e)
+        job["done"] = True
+
+@router.post("/suggest-fixes")
+async def suggest_validation_fixes(background_tasks: BackgroundTasks, mode: str = "realtime"):
+    """Suggest fixes for failed checks; mode=batch uses the cheaper OpenAI Batch API (results within 24h)"""
+    if mode not in ("realtime", "batch"):
+        return CommonResponse(ok=False, message="Unsupported mode. Use realtime or batch.")
+    
+    # A new run would reset the one in flight, and a finishing batch would then overwrite the newer results
+    if fixes_job is not None and not fixes_job["done"]:
+        raise HTTPException(status_code=409, detail="Fix suggestion already running")
+    
+    failures = get_failed_results()
+    if not failures:
+        start_fixes_job(mode, done=True)
+        return CommonResponse(ok=True, message="No failed checks to fix")
+    
+    job = start_fixes_job(mode)
+    if mode == "batch":
+        background_tasks.add_task(run_suggest_fixes_task, job, failures)
+        return CommonResponse(ok=True, message="Batch fix suggestion job submitted")
+    
+    await run_suggest_fixes_task(job, failures)
+    return get_suggested_fixes_payload()
+
+def get_suggested_fixes_payload() -> Dict[str, Any]:
+    if fixes_job is not None:
+        return dict(fixes_job)
+    
+    # Nothing run since startup; the artifact only ever holds a completed run's fixes
+    fixes = []
+    if os.path.exists(FIXES_ARTIFACT_PATH):
+        with open(FIXES_ARTIFACT_PATH, "r") as f:
+            fixes = json.load(f)
+    return {"jobId": None, "mode": None, "done": bool(fixes), "error": None, "fixes": fixes}
+
+@router.get("/suggest-fixes")
+async def get_suggested_fixes():
+    return get_suggested_fixes_payload()
+
 @router.get("/export/{format}")
 async def export_validation_report(format: str):
     """Export validation report in different formats"""
@@ -22,11 +22,8 @@ const Extract = () => {
     fetchSession();
     
     return () => {
-      // Cleanup polling interval on component unmount
-      if ((window as any).extractionPollInterval) {
-        clearInterval((window as any).extractionPollInterval);
-        (window as any).extractionPollInterval = null;
-      }
+      // Stop long-polling on component unmount
+      (window as any).extractionPolling = false;
     };
   }, []);
 
@@ -42,9 +39,10 @@ const Extract = () => {
     }
   };
 
-  const fetchExtractionStatus = async () => {
+  const fetchExtractionStatus = async (since: number, failures: number = 0) => {
     try {
-      const response = await fetch('/api/extract/status');
+      // The server holds the request until progress moves past `since`, so re-polling right away is cheap
+      const response = await fetch(`/api/extract/status?since=${since}`);
       if (response.ok) {
         const data = await response.json();
         setExtractionStatus(data);
@@ -52,21 +50,24 @@ const Extract = () => {
           setIsExtracting(false);
           setCanProceed(true);
           // Stop polling when extraction is complete
-          if ((window as any).extractionPollInterval) {
-            clearInterval((window as any).extractionPollInterval);
-            (window as any).extractionPollInterval = null;
-          }
+          (window as any).extractionPolling = false;
           // Fetch extraction data for display
           fetchExtractionData();
+        } else if ((window as any).extractionPolling) {
+          fetchExtractionStatus(data.percent);
         }
+      } else if (failures < 3 && (window as any).extractionPolling) {
+        // Transient server error; back off briefly and keep following the same progress point
+        setTimeout(() => fetchExtractionStatus(since, failures + 1), 1000 * (failures + 1));
+      } else {
+        console.error('Failed to fetch extraction status:', response.status);
+        (window as any).extractionPolling = false;
+        setIsExtracting(false);
       }
     } catch (error) {
       console.error('Failed to fetch extraction status:', error);
       // Stop polling on error
-      if ((window as any).extractionPollInterval) {
-        clearInterval((window as any).extractionPollInterval);
-        (window as any).extractionPollInterval = null;
-      }
+      (window as any).extractionPolling = false;
       setIsExtracting(false);
     }
   };
@@ -94,11 +95,11 @@ const Extract = () => {
         method: 'POST',
       });
       
-      if (response.ok) {
-        // Start polling for status only after button click
-        const interval = setInterval(fetchExtractionStatus, 2000);
-        // Store interval ID for cleanup
-        (window as any).extractionPollInterval = interval;
+      // 409 means an extraction is already running; follow its progress instead
+      if (response.ok || response.status === 409) {
+        // Start long-polling for status only after button click
+        (window as any).extractionPolling = true;
+        fetchExtractionStatus(-1);
       }
     } catch (error) {
       console.error('Failed to start extraction:', error);